@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """Parse RMF Fund data from markdown file and output to CSV and Markdown."""
 
+import os
 import re
 import csv
+import sys
 from pathlib import Path
 
 def clean_text(text):
@@ -123,6 +125,14 @@ def write_markdown(funds, output_path):
 
     print(f"✓ Markdown file written: {output_path} ({len(funds)} funds)")
 
+def load_profiling(project_root):
+    """Import the profiling hooks of the SEC API client (Profile=1 or --profile to enable)."""
+    client_dir = project_root / 'utility' / 'sec-api-example'
+    os.environ.setdefault('ProfilePath', str(client_dir / 'data' / 'profile'))
+    sys.path.insert(0, str(client_dir))
+    from function.Profiling import Stage
+    return Stage
+
 def main():
     """Main execution function."""
     # Paths (navigate up to project root from scripts/data-parsing/rmf/)
@@ -131,9 +141,11 @@ def main():
     input_file = project_root / 'docs' / 'RMF-Fund-Comparison.md'
     csv_output = project_root / 'docs' / 'rmf-funds.csv'
     md_output = project_root / 'docs' / 'rmf-funds.md'
+    Stage = load_profiling(project_root)
 
     print(f"Parsing RMF funds from: {input_file}")
-    funds = parse_rmf_funds(input_file)
+    with Stage('parse'):
+        funds = parse_rmf_funds(input_file)
 
     print(f"\n✓ Extracted {len(funds)} funds")
 
@@ -141,8 +153,10 @@ def main():
         print(f"⚠ Warning: Expected ~417 funds, but only found {len(funds)}")
 
     # Write outputs
-    write_csv(funds, csv_output)
-    write_markdown(funds, md_output)
+    with Stage('write csv'):
+        write_csv(funds, csv_output)
+    with Stage('write markdown'):
+        write_markdown(funds, md_output)
 
     print(f"\n✓ All files created successfully!")
     print(f"  - CSV: {csv_output}")
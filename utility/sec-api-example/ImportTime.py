@@ -0,0 +1,45 @@
+# Import time of the client (run before commit : python ImportTime.py)
+# every statement is imported in a fresh interpreter, best of ROUNDS run must be within ImportBudget millisecond
+# and module in HEAVY_MODULES must not be loaded until first call
+from pathlib import Path
+import subprocess
+import json
+import sys
+import os
+
+# Declare variable
+ROUNDS = 5
+IMPORT_BUDGET_MS = float(os.getenv("ImportBudget", "150"))
+HEAVY_MODULES = ["pandas", "requests", "numpy", "pyarrow", "http.server", "cProfile"]
+STATEMENTS = [
+    "import function",
+    "from function import fund_factsheet_amc",
+    "from function.FundFactsheet import *",
+    "import function.FundFactsheet, function.FundDailyInfo, function.LicenseCheck, function.PVDFactSheet, function.DigitalAsset, function.Onereport, function.Common, function.Bond",
+]
+
+CHILD = """
+import time, json, sys
+Start = time.perf_counter()
+exec(sys.argv[1])
+print(json.dumps({"ms" : (time.perf_counter() - Start) * 1000, "heavy" : [Name for Name in sys.argv[2:] if Name in sys.modules]}))
+"""
+
+def MeasureImport(Statement):
+    Runs = []
+    for _ in range(ROUNDS):
+        Output = subprocess.run([sys.executable, "-c", CHILD, Statement] + HEAVY_MODULES, cwd=Path(__file__).parent,
+                                capture_output=True, text=True, check=True)
+        Runs.append(json.loads(Output.stdout.strip().splitlines()[-1]))
+    return min(Run["ms"] for Run in Runs), sorted(set(Name for Run in Runs for Name in Run["heavy"]))
+
+if __name__ == "__main__":
+    Failed = False
+    for Statement in STATEMENTS:
+        Millisecond, Heavy = MeasureImport(Statement)
+        Slow = Millisecond > IMPORT_BUDGET_MS
+        Failed = Failed or Slow or bool(Heavy)
+        print("{:>8.1f} ms  {}{}{}".format(Millisecond, Statement[:90], "  [over budget]" if Slow else "",
+                                           "  [load {}]".format(", ".join(Heavy)) if Heavy else ""))
+    print("budget {:.0f} ms : {}".format(IMPORT_BUDGET_MS, "FAIL" if Failed else "OK"))
+    sys.exit(1 if Failed else 0)
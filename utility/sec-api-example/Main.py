@@ -1,13 +1,6 @@
-# import function for call SEC-API
-from function.FundFactsheet import *
-from function.FundDailyInfo import *
-from function.LicenseCheck import *
-from function.PVDFactSheet import *
-from function.DigitalAsset import *
-from function.AllFunction import *
-from function.Onereport import *
-from function.Common import *
-from function.Bond import *
+# import function for call SEC-API (module of each API product is loaded at first use, see function/__init__.py)
+from function import fund_factsheet_amc, fund_factsheet_fund, fund_factsheet_asset
+from function.AllFunction import ExportExcel, PrintCacheStats, PrintMetricsSummary, Span, Stage
 
 from pandas import ExcelWriter
 import pandas as pd
@@ -15,34 +8,48 @@ import pandas as pd
 # Example
 # ==== [ข้อมูลกองทุนรวมที่จดทะเบียนในปี 2022 และยัง Active อยู่ในปัจจุบัน และดูสัดส่วนการลงทุนของกองนั้น ๆ] ====
 
-# ดึงรหัส บลจ.
-amc = pd.DataFrame(fund_factsheet_amc())
+# ทุกขั้นตอนอยู่ใน span ของ job (เขียน trace เมื่อตั้ง Trace=1 ใน .env , แยก profile ตามขั้นตอนเมื่อตั้ง Profile=1 หรือ python Main.py --profile)
+with Span("Main : RegisFund2022 asset"):
 
-# ดึงกองทุนทั้งหมดภายใต้ บลจ. นั้น ๆ
-AllFund = pd.DataFrame()
-for idx, row in amc.iterrows():
-    AllFund = pd.concat([AllFund, pd.DataFrame(fund_factsheet_fund(row["unique_id"]))] , ignore_index=True)
+    # ดึงรหัส บลจ.
+    with Span("amc listing"), Stage("amc listing"):
+        amc = pd.DataFrame(fund_factsheet_amc())
 
-# filter ให้เหลือเฉพาะกองทุนที่จดทะเบียนในปี 2022 และยังมีสถานะเป็น "จดทะเบียน" 
-RegisFund = AllFund[(AllFund['fund_status'] == 'RG') & (AllFund['regis_date'].str.startswith('2022'))]
+    # ดึงกองทุนทั้งหมดภายใต้ บลจ. นั้น ๆ
+    with Span("fund enumeration", amc=len(amc)), Stage("fund enumeration"):
+        AllFund = pd.DataFrame()
+        for idx, row in amc.iterrows():
+            AllFund = pd.concat([AllFund, pd.DataFrame(fund_factsheet_fund(row["unique_id"]))] , ignore_index=True)
 
-# ดึงข้อมูลสัดส่วนการลงทุน
-TempAsset = pd.DataFrame()
-FundAsset = pd.DataFrame()
-for idx, row in RegisFund.iterrows():
+    # filter ให้เหลือเฉพาะกองทุนที่จดทะเบียนในปี 2022 และยังมีสถานะเป็น "จดทะเบียน" 
+    RegisFund = AllFund[(AllFund['fund_status'] == 'RG') & (AllFund['regis_date'].str.startswith('2022'))]
 
-    TempAsset = pd.DataFrame(fund_factsheet_asset(row['proj_id']))
-    TempAsset['proj_id'] = row['proj_id']
-    FundAsset = pd.concat([FundAsset, TempAsset], ignore_index=True)
+    # ดึงข้อมูลสัดส่วนการลงทุน
+    with Span("fund asset", fund=len(RegisFund)), Stage("fund asset"):
+        TempAsset = pd.DataFrame()
+        FundAsset = pd.DataFrame()
+        for idx, row in RegisFund.iterrows():
 
-# print(FundAsset)
+            TempAsset = pd.DataFrame(fund_factsheet_asset(row['proj_id']))
+            TempAsset['proj_id'] = row['proj_id']
+            FundAsset = pd.concat([FundAsset, TempAsset], ignore_index=True)
 
-# Merge RegisFund & FundAsset
-MergeFundDetail = pd.merge(RegisFund,FundAsset,on='proj_id', how='right')
-MergeAMC = pd.merge(MergeFundDetail, amc, on='unique_id', how='right')
+    # print(FundAsset)
 
-# Format data frame before export
-ExportDF = MergeAMC[['unique_id' , 'name_th' , 'name_en' , 'proj_id' , 'regis_id' , 'regis_date' , 'cancel_date', 'proj_name_th' , 'proj_name_en' , 'proj_abbr_name' , 'fund_status' , 'asset_seq' , 'asset_name', 'asset_ratio']]
+    # Merge RegisFund & FundAsset
+    with Span("dataframe merge"), Stage("dataframe merge"):
+        MergeFundDetail = pd.merge(RegisFund,FundAsset,on='proj_id', how='right')
+        MergeAMC = pd.merge(MergeFundDetail, amc, on='unique_id', how='right')
 
-# Export data frame to excel file
-ExportExcel(Data=ExportDF, FileName=None, SheetName=None)
+        # Format data frame before export
+        ExportDF = MergeAMC[['unique_id' , 'name_th' , 'name_en' , 'proj_id' , 'regis_id' , 'regis_date' , 'cancel_date', 'proj_name_th' , 'proj_name_en' , 'proj_abbr_name' , 'fund_status' , 'asset_seq' , 'asset_name', 'asset_ratio']]
+
+    # Export data frame to excel file
+    with Span("excel export", row=len(ExportDF)), Stage("excel export"):
+        ExportExcel(Data=ExportDF, FileName=None, SheetName=None)
+
+# สรุปจำนวน call ที่ใช้ข้อมูลจาก cache และจำนวน byte ที่ไม่ต้องดาวน์โหลดซ้ำ
+PrintCacheStats()
+
+# สรุปเวลา / จำนวน call / error ของแต่ละ endpoint
+PrintMetricsSummary()
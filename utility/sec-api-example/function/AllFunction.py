@@ -1,21 +1,91 @@
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+from collections import deque
 from datetime import datetime
+from urllib.parse import urlparse
 from pathlib import Path
-from ratelimit import *
-import pandas as pd
-import requests
+import threading
+import atexit
+import queue
+import hashlib
 import json
+import time
 import os
 
+from function.Settings import Setting, LazyModule
 
+# pandas / requests are imported at first use (importing the client does not load them)
+pd = LazyModule("pandas")
+requests = LazyModule("requests")
 
-# Load dot env file
-load_dotenv(Path(".env"))
+# metrics / tracing / profiling
+from function.Metrics import Inc, Observe, RegisterCollector, RenderMetrics, WriteMetrics, StartMetricsServer, MetricsSummary, PrintMetricsSummary
+from function.Tracing import Span, Attach, Traced, CurrentSpan, ExportTrace, ReadTrace, CriticalPath
+from function.Profiling import Stage, StartProfile, StopProfile
+
+# Log : print message at Verbose level or higher, write JSON line to log/log_YYYYMMDD.jsonl at LogLevel or higher
+LOG_LEVELS = {"debug" : 10, "info" : 20, "warning" : 30, "error" : 40}
+VERBOSE = Setting.Get("Verbose", "info")
+LOG_LEVEL = Setting.Get("LogLevel", "info")
+LOG_PATH = "log"
+LOG_BATCH = 500
+LOG_FLUSH_SECONDS = 1.0
+
+# HTTP cache of GET response (revalidate with ETag / Last-Modified when older than CacheTTL second)
+HTTP_CACHE = Setting.Get("HttpCache", "1") != "0"
+HTTP_CACHE_PATH = "data/cache/http"
+HTTP_CACHE_TTL = int(Setting.Get("CacheTTL", "0"))
+CacheStats = {"request" : 0, "fresh" : 0, "not_modified" : 0, "downloaded_bytes" : 0, "saved_bytes" : 0}
+CacheLock = threading.Lock()
+
+# Timeout of every call (connect, read) second : call that hang is failed, free its in-flight slot and count as error of breaker
+REQUEST_TIMEOUT = (float(Setting.Get("ConnectTimeout", "5")), float(Setting.Get("ReadTimeout", "30")))
+
+# 204 : API has no data for the request, wrapper return [] (None is kept for failed call : 4xx / 5xx / timeout / connection error)
+NO_CONTENT = 204
+
+# Adaptive concurrency per API product (AIMD : limit +1 per round of healthy call, x0.5 on 429 / 5xx / latency spike)
+AIMD_START_LIMIT = 4
+AIMD_MIN_LIMIT = 1
+AIMD_MAX_LIMIT = int(Setting.Get("MaxConcurrency", "32"))
+AIMD_DECREASE = 0.5
+AIMD_LATENCY_SPIKE = 3.0
+AIMD_RECENT = 10
+
+# Hedged GET : send duplicate when no response within p95 latency of endpoint (extra call at most HedgeBudget of GET)
+HEDGE_REQUEST = Setting.Get("Hedge", "0") == "1"
+HEDGE_BUDGET = float(Setting.Get("HedgeBudget", "0.05"))
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLE = 20
+LATENCY_WINDOW = 200
+HedgeStats = {"request" : 0, "hedged" : 0, "won" : 0}
+
+# Circuit breaker per API product (open when error rate of recent call is too high, probe again after BreakerOpenSecond)
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 10
+BREAKER_ERROR_RATE = float(Setting.Get("BreakerErrorRate", "0.5"))
+BREAKER_SLOW_CALL = float(Setting.Get("BreakerSlowCall", "30"))
+BREAKER_OPEN_SECONDS = float(Setting.Get("BreakerOpenSecond", "60"))
+BREAKER_PROBES = 3
+
+# Quota of subscription key (3000 call per 300 second) shared by priority class
+QUOTA_CALLS = 3000
+QUOTA_PERIOD = 300
+# weight of fair share when class wait together, reserve : part of quota other class cannot use
+PRIORITY_WEIGHT = {"interactive" : 8, "refresh" : 3, "backfill" : 1}
+PRIORITY_RESERVE = {"interactive" : float(Setting.Get("InteractiveReserve", "0.1"))}
+DEFAULT_PRIORITY = "interactive"
+
+## Raise when API product is failing (call is not sent while circuit is open)
+class CircuitOpenError(Exception):
+    def __init__(self, Product, RetryAfter):
+        self.Product = Product
+        self.RetryAfter = RetryAfter
+        super().__init__("API product [{}] is not available, retry after {:.0f} second".format(Product, RetryAfter))
   
 def ExportExcel(Data, FileName, SheetName):
 
     if Data.empty:
-        print("Can't export excel file : Dataset is empty")
+        Log("warning", "Can't export excel file : Dataset is empty")
     else:
         # Declare variable and set value
         now = datetime.now()
@@ -25,27 +95,451 @@ def ExportExcel(Data, FileName, SheetName):
         ExportDF = pd.DataFrame(Data)
 
         # Export data to excel
-        print("Exporting to folder [data]")
+        Log("info", "Exporting to folder [data]")
         ExportDF.to_excel(excel_writer="data/{}".format(FileName), sheet_name=SheetName , header=True , engine="xlsxwriter")
 
-        print("Export to Excel file Complete! file name [{}]".format(FileName))
+        Log("info", "Export to Excel file Complete! file name [{}]".format(FileName))
 
+LogQueue = queue.Queue(maxsize=10000)
+LogWriterThread = []
+LogLock = threading.Lock()
+
+## Log message (Fields are kept in JSON line : endpoint, status, latency_ms, attempt, bytes, ...)
+def Log(Level, Message, Print=True, **Fields):
+    Rank = LOG_LEVELS[Level]
+    if Print and Rank >= LOG_LEVELS.get(VERBOSE, 20):
+        print(Message)
+    if Rank >= LOG_LEVELS.get(LOG_LEVEL, 20):
+        StartLogWriter()
+        LogQueue.put(dict({"time" : datetime.now().isoformat(), "level" : Level, "message" : Message}, **Fields))
+
+## Background writer : write queued log in batch (one file open per batch instead of per call)
+def LogWriter():
+    while True:
+        Batch = [LogQueue.get()]
+        Deadline = time.time() + LOG_FLUSH_SECONDS
+        while len(Batch) < LOG_BATCH and Batch[-1] is not None:
+            try:
+                Batch.append(LogQueue.get(timeout=max(0.0, Deadline - time.time())))
+            except queue.Empty:
+                break
+        Records = [Record for Record in Batch if Record is not None]
+        try:
+            os.makedirs(LOG_PATH, exist_ok=True)
+            Files = {}
+            for Record in Records:
+                Files.setdefault("log_{}.jsonl".format(Record["time"][:10].replace("-", "")), []).append(
+                    json.dumps(Record, ensure_ascii=False, default=str))
+            for FileName, Lines in Files.items():
+                with open(os.path.join(LOG_PATH, FileName), "a", encoding="utf-8") as file:
+                    file.write("\n".join(Lines) + "\n")
+        except OSError as e:
+            print("Cannot write log : {}".format(e))
+        for _ in Batch:
+            LogQueue.task_done()
+        if Batch[-1] is None:
+            return
+
+def StartLogWriter():
+    if not LogWriterThread:
+        with LogLock:
+            if not LogWriterThread:
+                Thread = threading.Thread(target=LogWriter, name="log-writer", daemon=True)
+                Thread.start()
+                LogWriterThread.append(Thread)
+
+## Wait until every queued log is written (called at exit)
+def FlushLog():
+    if LogWriterThread:
+        LogQueue.join()
+
+atexit.register(FlushLog)
+
+## Keep for old script : write error log without print
 def WriteResponseLog(Message,ErrorCode):
-    
-    now = datetime.now()
-    FileName = "log_{}.txt".format(now.strftime("%Y%m%d"))
+    Log("error", "{}".format(Message), Print=False, status=ErrorCode)
 
-    # Check if the file exists.
-    if os.path.isfile("log/{}".format(FileName)):
-        # File exists, write data to file
-        file = open('log/{}'.format(FileName), 'a')
-    else:
-        # file does not exists, create new text file
-        file = open('log/{}'.format(FileName), 'w')
-    
-    # Write text to file
-    file.write('{}|{}|{}\n'.format(datetime.now(),ErrorCode,Message))
-    file.close()
+## Call function concurrently (result keep the same order as ArgsList)
+## PriorityClass : priority class of call (default is priority of caller, "refresh" when caller has no priority)
+def RunConcurrent(Function, ArgsList, MaxWorkers=8, PriorityClass=None):
+
+    Class = PriorityClass or getattr(PriorityState, "Class", None) or "refresh"
+    Parent = None
+
+    def CallFunction(Args):
+        try:
+            with Priority(Class), Attach(Parent):
+                return Function(*Args)
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            Log("error", 'Cannot call function {}{}: {}'.format(Function.__name__, Args, e), function=Function.__name__, error=type(e).__name__)
+            return None
+
+    ArgsList = [Args if isinstance(Args, tuple) else (Args,) for Args in ArgsList]
+    with Span("RunConcurrent {}".format(Function.__name__), task=len(ArgsList), max_workers=MaxWorkers, priority=Class):
+        Parent = CurrentSpan()
+        with ThreadPoolExecutor(max_workers=MaxWorkers) as executor:
+            return list(executor.map(CallFunction, ArgsList))
+
+## In-flight limit of one API product
+class AdaptiveLimit:
+    def __init__(self, Product):
+        self.Product = Product
+        self.Limit = float(AIMD_START_LIMIT)
+        self.InFlight = 0
+        self.Latency = None
+        self.Recent = deque(maxlen=AIMD_RECENT)
+        self.LastDecrease = 0.0
+        self.Condition = threading.Condition()
+
+    def Acquire(self):
+        with self.Condition:
+            while self.InFlight >= int(self.Limit):
+                self.Condition.wait()
+            self.InFlight += 1
+        return time.time()
+
+    ## StatusCode is None when request is failed (timeout / connection error)
+    def Release(self, Start, StatusCode):
+        Latency = time.time() - Start
+        with self.Condition:
+            self.InFlight -= 1
+            Overload = StatusCode is None or StatusCode == 429 or StatusCode >= 500
+            # spike : median of recent call is slow (one slow call is not overload)
+            self.Recent.append(Latency)
+            Median = sorted(self.Recent)[len(self.Recent) // 2]
+            Spike = self.Latency is not None and Median > self.Latency * AIMD_LATENCY_SPIKE
+            if Overload or Spike:
+                # call of the same burst fail together, decrease once per round trip
+                if time.time() - self.LastDecrease > (self.Latency or Latency):
+                    self.Limit = max(AIMD_MIN_LIMIT, self.Limit * AIMD_DECREASE)
+                    self.LastDecrease = time.time()
+            else:
+                self.Limit = min(AIMD_MAX_LIMIT, self.Limit + 1.0 / self.Limit)
+            # slow call is not part of normal latency (otherwise slow down that come gradually is never a spike)
+            ## still slow at minimum limit : slow latency is the new normal
+            if Spike and self.Limit <= AIMD_MIN_LIMIT:
+                self.Latency = Median
+            elif not Overload and not Spike and (self.Latency is None or Latency <= self.Latency * AIMD_LATENCY_SPIKE):
+                self.Latency = Latency if self.Latency is None else 0.9 * self.Latency + 0.1 * Latency
+            self.Condition.notify_all()
+
+Limiters = {}
+LimiterLock = threading.Lock()
+
+## API product of url (https://api.sec.or.th/FundFactsheet/fund/amc -> FundFactsheet)
+def ProductOf(url):
+    return (urlparse(url).path.strip("/").split("/") or [""])[0]
+
+def GetLimiter(url):
+    Product = ProductOf(url)
+    with LimiterLock:
+        if Product not in Limiters:
+            Limiters[Product] = AdaptiveLimit(Product)
+        return Limiters[Product]
+
+## Current in-flight limit of each API product
+def ConcurrencyStats():
+    with LimiterLock:
+        return {Product : {"limit" : int(Limiter.Limit), "in_flight" : Limiter.InFlight,
+                           "latency_ms" : round(Limiter.Latency * 1000) if Limiter.Latency else None}
+                for Product, Limiter in Limiters.items()}
+
+## Circuit breaker of one API product (closed -> open -> half_open -> closed)
+class CircuitBreaker:
+    def __init__(self, Product):
+        self.Product = Product
+        self.State = "closed"
+        self.Calls = deque(maxlen=BREAKER_WINDOW)
+        self.OpenedAt = 0.0
+        self.Probing = False
+        self.Probes = 0
+        self.Rejected = 0
+        self.Lock = threading.Lock()
+
+    ## raise CircuitOpenError when call is not allowed (half open allow one probe call at a time)
+    def Allow(self):
+        with self.Lock:
+            if self.State == "open" and time.time() - self.OpenedAt >= BREAKER_OPEN_SECONDS:
+                self.State, self.Probes = "half_open", 0
+            if self.State == "closed" or (self.State == "half_open" and not self.Probing):
+                self.Probing = self.State == "half_open"
+                return
+            self.Rejected += 1
+            Inc("sec_api_circuit_rejected_total", product=self.Product)
+            raise CircuitOpenError(self.Product, max(0.0, BREAKER_OPEN_SECONDS - (time.time() - self.OpenedAt)))
+
+    ## error : no response / 5xx / slower than BreakerSlowCall (4xx and 429 are not outage)
+    def Record(self, StatusCode, Latency):
+        Failed = StatusCode is None or StatusCode >= 500 or Latency > BREAKER_SLOW_CALL
+        with self.Lock:
+            if self.State == "half_open":
+                self.Probing = False
+                self.Probes += 1
+                if Failed:
+                    self.Open()
+                elif self.Probes >= BREAKER_PROBES:
+                    self.State = "closed"
+                    self.Calls.clear()
+                    Log("info", "API product [{}] is available again".format(self.Product), product=self.Product, breaker="closed")
+                return
+            self.Calls.append(Failed)
+            if self.State == "closed" and len(self.Calls) >= BREAKER_MIN_CALLS and sum(self.Calls) / len(self.Calls) >= BREAKER_ERROR_RATE:
+                self.Open()
+
+    def Open(self):
+        self.State = "open"
+        self.OpenedAt = time.time()
+        Log("warning", "API product [{}] is failing, stop calling for {:.0f} second".format(self.Product, BREAKER_OPEN_SECONDS), product=self.Product, breaker="open")
+
+Breakers = {}
+
+def GetBreaker(url):
+    Product = ProductOf(url)
+    with LimiterLock:
+        if Product not in Breakers:
+            Breakers[Product] = CircuitBreaker(Product)
+        return Breakers[Product]
+
+## Circuit state of each API product
+def BreakerStats():
+    with LimiterLock:
+        return {Product : {"state" : Breaker.State, "error_rate" : round(sum(Breaker.Calls) / len(Breaker.Calls), 2) if Breaker.Calls else 0.0,
+                           "rejected" : Breaker.Rejected}
+                for Product, Breaker in Breakers.items()}
+
+## Token bucket of quota, token is given to waiting class by weighted fair share
+class QuotaScheduler:
+    def __init__(self, Calls, Period):
+        self.Capacity = float(Calls)
+        self.Rate = Calls / Period
+        self.Tokens = float(Calls)
+        self.Updated = time.monotonic()
+        self.Waiting = {Class : deque() for Class in PRIORITY_WEIGHT}
+        self.Served = {Class : 0.0 for Class in PRIORITY_WEIGHT}
+        self.Granted = {Class : 0 for Class in PRIORITY_WEIGHT}
+        self.Condition = threading.Condition()
+
+    def Refill(self):
+        Now = time.monotonic()
+        self.Tokens = min(self.Capacity, self.Tokens + (Now - self.Updated) * self.Rate)
+        self.Updated = Now
+
+    ## class that get next token : lowest served / weight among waiting class that can use the token
+    def NextClass(self):
+        Candidate = None
+        for Class, Queue in self.Waiting.items():
+            Reserve = sum(Part for Other, Part in PRIORITY_RESERVE.items() if Other != Class) * self.Capacity
+            if Queue and self.Tokens - 1.0 >= Reserve and (Candidate is None or self.Served[Class] < self.Served[Candidate]):
+                Candidate = Class
+        return Candidate
+
+    def Acquire(self, Class):
+        Ticket = object()
+        with self.Condition:
+            # class that was idle start from current served level (no burst from credit while idle)
+            if not self.Waiting[Class]:
+                Active = [self.Served[Other] for Other, Queue in self.Waiting.items() if Queue]
+                self.Served[Class] = max([self.Served[Class]] + ([min(Active)] if Active else []))
+            self.Waiting[Class].append(Ticket)
+            while True:
+                self.Refill()
+                Next = self.NextClass()
+                if Next == Class and self.Waiting[Class][0] is Ticket:
+                    self.Waiting[Class].popleft()
+                    self.Tokens -= 1.0
+                    self.Served[Class] += 1.0 / PRIORITY_WEIGHT[Class]
+                    self.Granted[Class] += 1
+                    self.Condition.notify_all()
+                    return
+                self.Condition.wait(max(0.01, 1.0 / self.Rate))
+
+Scheduler = QuotaScheduler(QUOTA_CALLS, QUOTA_PERIOD)
+PriorityState = threading.local()
+
+## Set priority class of API call in this block : with Priority("backfill"): ...
+class Priority:
+    def __init__(self, Class):
+        if Class not in PRIORITY_WEIGHT:
+            raise ValueError("Priority class must be one of {}".format(list(PRIORITY_WEIGHT)))
+        self.Class = Class
+
+    def __enter__(self):
+        self.Previous = getattr(PriorityState, "Class", None)
+        PriorityState.Class = self.Class
+        return self
+
+    def __exit__(self, *Error):
+        PriorityState.Class = self.Previous
+
+def WaitRateLimit():
+    Class = getattr(PriorityState, "Class", None) or DEFAULT_PRIORITY
+    Start = time.time()
+    Scheduler.Acquire(Class)
+    Observe("sec_api_rate_limit_wait_seconds", time.time() - Start, priority=Class)
+
+## Quota used and waiting call of each priority class
+def SchedulerStats():
+    with Scheduler.Condition:
+        Scheduler.Refill()
+        return {"tokens" : int(Scheduler.Tokens),
+                "class" : {Class : {"granted" : Scheduler.Granted[Class], "waiting" : len(Scheduler.Waiting[Class])} for Class in PRIORITY_WEIGHT}}
+
+## Send request within circuit breaker, rate limit and in-flight limit of API product
+## Attempt : 1 for first call, 2 for hedged call
+## Endpoint : endpoint template from registry (FundFactsheet/fund/{proj_id}/FundTop5/{period}), guessed from url when not given
+def SendRequest(Method, url, Attempt=1, Endpoint=None, **Args):
+    Product, Endpoint = ProductOf(url), Endpoint or EndpointOf(url)
+    with Span("{} {}".format(Method, Endpoint), Kind="client", **{"http.request.method" : Method, "url.full" : url,
+              "sec.product" : Product, "sec.endpoint" : Endpoint, "sec.attempt" : Attempt}) as CallSpan:
+        Breaker = GetBreaker(url)
+        Breaker.Allow()
+        Wait = time.time()
+        WaitRateLimit()
+        Limiter = GetLimiter(url)
+        Queued = time.time()
+        Start = Limiter.Acquire()
+        Observe("sec_api_concurrency_wait_seconds", Start - Queued, product=Product)
+        CallSpan.SetAttribute("sec.quota_wait_ms", round((Queued - Wait) * 1000, 1))
+        CallSpan.SetAttribute("sec.slot_wait_ms", round((Start - Queued) * 1000, 1))
+        StatusCode, Size, Error = None, 0, None
+        try:
+            response = requests.request(Method, url, **dict({"timeout" : REQUEST_TIMEOUT}, **Args))
+            StatusCode, Size = response.status_code, len(response.content)
+            return response
+        except Exception as e:
+            Error = type(e).__name__
+            raise
+        finally:
+            Latency = time.time() - Start
+            Limiter.Release(Start, StatusCode)
+            Breaker.Record(StatusCode, Latency)
+            if StatusCode in (200, 304):
+                RecordLatency(Endpoint, Latency)
+            Inc("sec_api_requests_total", product=Product, endpoint=Endpoint, method=Method, status=StatusCode or Error)
+            Observe("sec_api_request_duration_seconds", Latency, product=Product, endpoint=Endpoint)
+            Inc("sec_api_response_bytes_total", Size, product=Product, endpoint=Endpoint)
+            CallSpan.SetAttribute("http.response.status_code", StatusCode)
+            CallSpan.SetAttribute("sec.bytes", Size)
+            Log("debug" if StatusCode in (200, 304) else "warning",
+                "Cannot call API: {} [{}]".format(StatusCode or Error, url) if StatusCode not in (200, 304) else "{} {} [{}]".format(Method, StatusCode, url),
+                url=url, product=Product, endpoint=Endpoint, method=Method, status=StatusCode, error=Error,
+                latency_ms=round(Latency * 1000, 1), attempt=Attempt, bytes=Size)
+
+## Endpoint of url without registry template (segment with digit is replaced : FundFactsheet/fund/{}/policy)
+def EndpointOf(url):
+    return "/".join("{}" if any(Char.isdigit() for Char in Part) else Part for Part in urlparse(url).path.strip("/").split("/"))
+
+EndpointLatency = {}
+LatencyLock = threading.Lock()
+
+def RecordLatency(Endpoint, Latency):
+    with LatencyLock:
+        EndpointLatency.setdefault(Endpoint, deque(maxlen=LATENCY_WINDOW)).append(Latency)
+
+def LatencyPercentile(Endpoint, Percent=HEDGE_PERCENTILE):
+    with LatencyLock:
+        Latency = sorted(EndpointLatency.get(Endpoint, []))
+    if len(Latency) < HEDGE_MIN_SAMPLE:
+        return None
+    return Latency[min(len(Latency) - 1, int(len(Latency) * Percent / 100))]
+
+HedgeTokens = [0.0]
+HedgeExecutor = []
+
+## Take one hedge from budget (every GET add HedgeBudget to budget)
+def TakeHedge():
+    with LatencyLock:
+        if HedgeTokens[0] < 1.0:
+            return False
+        HedgeTokens[0] -= 1.0
+        HedgeStats["hedged"] += 1
+        return True
+
+## GET with hedge : duplicate call when first call is slower than p95 of endpoint, use the first response
+def HedgedGet(url, Endpoint=None, **Args):
+    Endpoint = Endpoint or EndpointOf(url)
+    Delay = LatencyPercentile(Endpoint) if HEDGE_REQUEST else None
+    if Delay is None:
+        return SendRequest("GET", url, Endpoint=Endpoint, **Args)
+
+    with LatencyLock:
+        HedgeStats["request"] += 1
+        HedgeTokens[0] = min(10.0, HedgeTokens[0] + HEDGE_BUDGET)
+        if not HedgeExecutor:
+            HedgeExecutor.append(ThreadPoolExecutor(max_workers=AIMD_MAX_LIMIT * 4, thread_name_prefix="hedge"))
+    # hedge thread use priority class of caller
+    Class = getattr(PriorityState, "Class", None) or DEFAULT_PRIORITY
+    Parent = CurrentSpan()
+    def Send(Attempt):
+        with Priority(Class), Attach(Parent):
+            return SendRequest("GET", url, Attempt, Endpoint, **Args)
+
+    Primary = HedgeExecutor[0].submit(Send, 1)
+    try:
+        return Primary.result(timeout=Delay)
+    except FutureTimeout:
+        if not TakeHedge():
+            return Primary.result()
+
+    Hedge = HedgeExecutor[0].submit(Send, 2)
+    Inc("sec_api_retries_total", product=ProductOf(url), endpoint=Endpoint, reason="hedge")
+    Done, Pending = wait([Primary, Hedge], return_when=FIRST_COMPLETED)
+    First = Hedge if Hedge in Done and Primary not in Done else Primary
+    if First.exception() is not None:
+        First = Primary if First is Hedge else Hedge
+    elif First is Hedge:
+        with LatencyLock:
+            HedgeStats["won"] += 1
+    return First.result()
+
+def HttpCachePath(url):
+    return os.path.join(HTTP_CACHE_PATH, "{}.json".format(hashlib.sha1(url.encode("utf-8")).hexdigest()))
+
+def ReadHttpCache(url):
+    try:
+        with open(HttpCachePath(url), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def WriteHttpCache(url, Cached):
+    Cached = dict(Cached, url=url, fetched_at=time.time())
+    os.makedirs(HTTP_CACHE_PATH, exist_ok=True)
+    TempPath = "{}.{}.tmp".format(HttpCachePath(url), threading.get_ident())
+    with open(TempPath, "w", encoding="utf-8") as file:
+        json.dump(Cached, file, ensure_ascii=False)
+    os.replace(TempPath, HttpCachePath(url))
+
+def CountCache(Event, SavedBytes, DownloadedBytes=0):
+    Inc("sec_api_cache_total", result="miss" if Event == "request" else Event)
+    Inc("sec_api_cache_saved_bytes_total", SavedBytes)
+    with CacheLock:
+        CacheStats[Event] += 1
+        CacheStats["saved_bytes"] += SavedBytes
+        CacheStats["downloaded_bytes"] += DownloadedBytes
+
+## Current state of circuit / in-flight limit / quota for metrics
+def CollectState():
+    State = {"closed" : 0, "half_open" : 1, "open" : 2}
+    with LimiterLock:
+        Samples = [("sec_api_circuit_state", {"product" : Product}, State[Breaker.State]) for Product, Breaker in Breakers.items()]
+        for Product, Limiter in Limiters.items():
+            Samples += [("sec_api_concurrency_limit", {"product" : Product}, int(Limiter.Limit)),
+                        ("sec_api_in_flight", {"product" : Product}, Limiter.InFlight)]
+    Samples.append(("sec_api_quota_tokens", {}, int(Scheduler.Tokens)))
+    return Samples
+
+RegisterCollector(CollectState)
+
+## Summary of HTTP cache (call served from cache and byte not downloaded)
+def PrintCacheStats():
+    with CacheLock:
+        Stats = dict(CacheStats)
+    print("HTTP cache : {} downloaded ({:,} byte), {} fresh, {} not modified ({:,} byte saved)".format(
+        Stats["request"], Stats["downloaded_bytes"], Stats["fresh"], Stats["not_modified"], Stats["saved_bytes"]))
+    return Stats
 
 # rate limit class
 ## call 10 time in 1 second
@@ -54,24 +548,57 @@ class RateLimiter:
         headers = headers
         return
     
-    @rate_limited(3000, 300)
-    def CallGetAPI(self, headers, url):
-        response = requests.get(url, headers=headers)
+    ## TTL : second that cached response is used without calling API (default CacheTTL)
+    ## Immutable : cached non-empty response is always used (published data that never change)
+    ## Endpoint : endpoint template of metrics / latency (given by wrapper of endpoint registry)
+    def CallGetAPI(self, headers, url, TTL=None, Immutable=False, Endpoint=None):
+        TTL = HTTP_CACHE_TTL if TTL is None else TTL
+        Cached = ReadHttpCache(url) if HTTP_CACHE else None
+        if Cached is not None and ((Immutable and Cached["body"]) or time.time() - Cached["fetched_at"] < TTL):
+            CountCache("fresh", Cached["size"])
+            return Cached["body"]
+
+        # revalidate cached response (304 = not modified, use cached body)
+        RequestHeaders = dict(headers)
+        if Cached is not None and Cached.get("etag"):
+            RequestHeaders["If-None-Match"] = Cached["etag"]
+        if Cached is not None and Cached.get("last_modified"):
+            RequestHeaders["If-Modified-Since"] = Cached["last_modified"]
+
+        # timeout / connection error is logged by SendRequest, caller get None like other failed call
+        try:
+            response = HedgedGet(url, Endpoint, headers=RequestHeaders)
+        except requests.RequestException:
+            return None
+        if response.status_code == 304 and Cached is not None:
+            CountCache("not_modified", Cached["size"], len(response.content))
+            WriteHttpCache(url, Cached)
+            return Cached["body"]
+        if response.status_code == NO_CONTENT:
+            return []
         if response.status_code != 200 :
-            print('Cannot call API: {}'.format(response.status_code))
-            WriteResponseLog(url,response.status_code)
             return None
-        else:
-            return response.json()
+
+        with Span("json.decode", bytes=len(response.content)):
+            body = response.json()
+        Size = int(response.headers.get("Content-Length") or len(response.content))
+        CountCache("request", 0, Size)
+        if HTTP_CACHE and (response.headers.get("ETag") or response.headers.get("Last-Modified") or TTL > 0 or Immutable):
+            WriteHttpCache(url, {"etag" : response.headers.get("ETag"), "last_modified" : response.headers.get("Last-Modified"),
+                                 "size" : Size, "body" : body})
+        return body
         
-    @rate_limited(3000 , 300)
-    def CallPostAPI(self, headers, data, url):
+    def CallPostAPI(self, headers, data, url, Endpoint=None):
         DataJson = json.dumps(data , ensure_ascii=False)
-        response = requests.post(url=url, data=DataJson, headers=headers)
+        try:
+            response = SendRequest("POST", url, Endpoint=Endpoint, data=DataJson, headers=headers)
+        except requests.RequestException:
+            return None
+        if response.status_code == NO_CONTENT:
+            return []
         if response.status_code != 200 :
-            print('Cannot call API: {}'.format(response.status_code))
-            WriteResponseLog(url,response.status_code)
             return None
         else:
-            return response.json()
+            with Span("json.decode", bytes=len(response.content)):
+                return response.json()
       
\ No newline at end of file
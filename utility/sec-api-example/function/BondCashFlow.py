@@ -0,0 +1,136 @@
+from function.AllFunction import *
+from function.Store import AppendTable, ReadTable, DropPartition, LoadManifest, SaveManifest
+import numpy as np
+
+# Declare variable
+TABLE_NAME = "bond/{}"
+
+# field name in bond_outs_coupon / bond_outs_redemption payload
+COUPON_FIELDS = {
+    "rate" : "coupon_rate",
+    "frequency" : "coupon_frequency",
+    "issue_date" : "issue_date",
+    "maturity_date" : "maturity_date",
+    "par" : "par_value",
+}
+REDEMPTION_FIELDS = {
+    "maturity_date" : "redemption_date",
+}
+DEFAULT_FREQUENCY = 2
+DEFAULT_PAR = 1000.0
+
+## Add month to datetime64[D] array (day is clipped to the last day of month)
+def AddMonths(Dates, Months):
+    Month = Dates.astype("datetime64[M]") + Months.astype("timedelta64[M]")
+    Day = (Dates - Dates.astype("datetime64[M]")).astype("int64")
+    MonthLength = ((Month + 1).astype("datetime64[D]") - Month.astype("datetime64[D]")).astype("int64")
+    return Month.astype("datetime64[D]") + np.minimum(Day, MonthLength - 1).astype("timedelta64[D]")
+
+def MonthsBetween(Start, End):
+    return (End.astype("datetime64[M]") - Start.astype("datetime64[M]")).astype("int64")
+
+## Issue term (one row per issue) from coupon and redemption table
+def LoadIssueTerm():
+
+    Coupon = ReadTable(TABLE_NAME.format("coupon"))
+    if Coupon.empty:
+        return pd.DataFrame()
+    Coupon = Coupon.drop_duplicates("issued_ref_id", keep="last").set_index("issued_ref_id")
+
+    Term = pd.DataFrame(index=Coupon.index)
+    for Key, Field in COUPON_FIELDS.items():
+        Term[Key] = Coupon[Field] if Field in Coupon else np.nan
+
+    # maturity from redemption when coupon has no maturity date
+    Redemption = ReadTable(TABLE_NAME.format("redemption"))
+    if not Redemption.empty and REDEMPTION_FIELDS["maturity_date"] in Redemption:
+        Maturity = Redemption.drop_duplicates("issued_ref_id", keep="last").set_index("issued_ref_id")[REDEMPTION_FIELDS["maturity_date"]]
+        Term["maturity_date"] = Term["maturity_date"].fillna(Maturity.reindex(Term.index))
+
+    Term["rate"] = pd.to_numeric(Term["rate"], errors="coerce").fillna(0.0)
+    Term["frequency"] = pd.to_numeric(Term["frequency"], errors="coerce").fillna(DEFAULT_FREQUENCY).clip(1, 12).astype("int64")
+    Term["par"] = pd.to_numeric(Term["par"], errors="coerce").fillna(DEFAULT_PAR)
+    Term["issue_date"] = pd.to_datetime(Term["issue_date"], errors="coerce")
+    Term["maturity_date"] = pd.to_datetime(Term["maturity_date"], errors="coerce")
+    return Term.dropna(subset=["issue_date", "maturity_date"])
+
+## Coupon and principal schedule of every issue at once
+def CouponSchedule(Term):
+
+    if Term.empty:
+        return pd.DataFrame()
+
+    Issue = Term["issue_date"].values.astype("datetime64[D]")
+    Maturity = Term["maturity_date"].values.astype("datetime64[D]")
+    Step = (12 // Term["frequency"].values).astype("int64")
+    Periods = np.maximum(-(-MonthsBetween(Issue, Maturity) // Step), 1)
+
+    # row k of issue i : maturity - k * step month
+    Row = np.repeat(np.arange(len(Term)), Periods)
+    K = np.arange(Periods.sum()) - np.repeat(np.cumsum(Periods) - Periods, Periods)
+    PayDate = AddMonths(Maturity[Row], -K * Step[Row])
+    StartDate = np.maximum(AddMonths(Maturity[Row], -(K + 1) * Step[Row]), Issue[Row])
+
+    Coupon = Term["par"].values * Term["rate"].values / 100.0 / Term["frequency"].values
+    Principal = np.where(K == 0, Term["par"].values[Row], 0.0)
+
+    Schedule = pd.DataFrame({
+        "issued_ref_id" : Term.index.values[Row],
+        "period_start" : StartDate,
+        "payment_date" : PayDate,
+        "coupon" : Coupon[Row],
+        "principal" : Principal,
+    })
+    Schedule["cash_flow"] = Schedule["coupon"] + Schedule["principal"]
+    return Schedule.sort_values(["issued_ref_id", "payment_date"], ignore_index=True)
+
+## Accrued interest and remaining life of every issue on ValueDate
+def AccruedInterest(Term, ValueDate):
+
+    Value = np.datetime64(pd.Timestamp(ValueDate).date(), "D")
+    Issue = Term["issue_date"].values.astype("datetime64[D]")
+    Maturity = Term["maturity_date"].values.astype("datetime64[D]")
+    Step = (12 // Term["frequency"].values).astype("int64")
+
+    # next coupon = maturity - (remaining period - 1) * step
+    ## month count ignore day of month, move by one period when needed
+    Remaining = np.maximum(-(-MonthsBetween(np.full(len(Term), Value), Maturity) // Step), 1)
+    NextCoupon = AddMonths(Maturity, -(Remaining - 1) * Step)
+    Previous = AddMonths(NextCoupon, -Step)
+    NextCoupon = np.where(Previous > Value, Previous, NextCoupon)
+    NextCoupon = np.where(NextCoupon <= Value, AddMonths(NextCoupon, Step), NextCoupon)
+    LastCoupon = np.maximum(AddMonths(NextCoupon, -Step), Issue)
+
+    PeriodDays = np.maximum((NextCoupon - LastCoupon).astype("int64"), 1)
+    AccruedDays = np.clip((Value - LastCoupon).astype("int64"), 0, None)
+    Live = (Value >= Issue) & (Value < Maturity)
+
+    Coupon = Term["par"].values * Term["rate"].values / 100.0 / Term["frequency"].values
+    return pd.DataFrame({
+        "issued_ref_id" : Term.index.values,
+        "value_date" : str(Value),
+        "last_coupon_date" : LastCoupon,
+        "next_coupon_date" : NextCoupon,
+        "accrued_interest" : np.where(Live, Coupon * AccruedDays / PeriodDays, 0.0),
+        "remaining_life_year" : np.where(Live, (Maturity - Value).astype("int64") / 365.0, 0.0),
+    })
+
+## Daily precompute : schedule only for new issue, accrued interest for all issue
+@Traced()
+def BuildBondCashFlow(ValueDate=None):
+
+    Term = LoadIssueTerm()
+    if Term.empty:
+        Log("warning", "Bond cash flow : no coupon data")
+        return
+
+    Done = LoadManifest("bond_cashflow")
+    New = Term[~Term.index.isin(list(Done))]
+    AppendTable(CouponSchedule(New), TABLE_NAME.format("cashflow_schedule"))
+    SaveManifest("bond_cashflow", Done | set(New.index))
+
+    Accrued = AccruedInterest(Term, ValueDate or datetime.now())
+    DropPartition(TABLE_NAME.format("accrued_interest"), "value_date", Accrued["value_date"].iloc[0])
+    AppendTable(Accrued, TABLE_NAME.format("accrued_interest"), PartitionCols=["value_date"])
+    Log("info", "Bond cash flow : {} new schedule, {} accrued interest".format(len(New), len(Accrued)))
+    return Accrued
@@ -0,0 +1,124 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, ReadTable, LoadManifest, SaveManifest
+import function.Bond as Bond
+
+# Declare variable
+DATE_FORMAT = "%Y-%m-%d"
+TABLE_NAME = "bond/{}"
+MANIFEST_NAME = "bond_detail"
+VALUE_FIELD = "outstanding_value"
+
+# detail section name -> function(issued_ref_id)
+SECTIONS = {
+    Name[len("bond_outs_"):] : getattr(Bond, Name)
+    for Name in ("bond_outs_offer_type", "bond_outs_coupon", "bond_outs_issue_age", "bond_outs_offering_unit", "bond_outs_issue_rating",
+                 "bond_outs_redemption", "bond_outs_involve_party", "bond_outs_investor_type", "bond_outs_sector_type")
+}
+
+## Discover issue universe from issuer name / security code search
+@Traced()
+def DiscoverBondIssue(IssuerNames=(), SecurityCodes=(), MaxWorkers=8):
+
+    Found = []
+    Found += RunConcurrent(Bond.bond_outs_issuer, list(IssuerNames), MaxWorkers)
+    Found += RunConcurrent(Bond.bond_outs_issue, list(SecurityCodes), MaxWorkers)
+
+    Issue = pd.concat([FlattenResponse(resp) for resp in Found if resp], ignore_index=True) if any(Found) else pd.DataFrame()
+    if Issue.empty or "issued_ref_id" not in Issue:
+        return pd.DataFrame()
+
+    Issue["issued_ref_id"] = Issue["issued_ref_id"].astype(str)
+    Issue = Issue.drop_duplicates("issued_ref_id", keep="last")
+
+    # keep only new issue in universe table
+    Known = ReadTable(TABLE_NAME.format("issue"), Columns=["issued_ref_id"])
+    New = Issue[~Issue["issued_ref_id"].isin(Known["issued_ref_id"] if not Known.empty else [])]
+    AppendTable(New, TABLE_NAME.format("issue"))
+    Log("info", "Bond universe : {} issue found ({} new)".format(len(Issue), len(New)))
+    return Issue
+
+def IssueUniverse():
+    Issue = ReadTable(TABLE_NAME.format("issue"), Columns=["issued_ref_id"])
+    return sorted(Issue["issued_ref_id"].unique()) if not Issue.empty else []
+
+def FetchSection(Section, issued_ref_id):
+    return SECTIONS[Section](issued_ref_id)
+
+## Manifest key : one key per (issue, section), section that failed is fetched again on resume
+def SectionKey(issued_ref_id, Section):
+    return "{}|{}".format(issued_ref_id, Section)
+
+## Manifest of old version has issued_ref_id when any section was stored : keep only section with stored row of issue
+def UpgradeManifest(Done):
+    Legacy = {Key for Key in Done if "|" not in Key}
+    if not Legacy:
+        return Done
+    Done = Done - Legacy
+    for Section in SECTIONS:
+        Stored = ReadTable(TABLE_NAME.format(Section))
+        if Stored.empty or "issued_ref_id" not in Stored:
+            continue
+        Done |= {SectionKey(Key, Section) for Key in Legacy & set(Stored["issued_ref_id"].astype(str))}
+    Log("info", "Bond manifest upgraded : {} issue key to per section key".format(len(Legacy)))
+    return Done
+
+## Pull every detail section of each issue concurrently
+@Traced()
+def CrawlBondDetail(IssuedRefIds=None, Sections=None, MaxWorkers=8, Refresh=False):
+
+    Sections = Sections or sorted(SECTIONS)
+    Done = set() if Refresh else UpgradeManifest(LoadManifest(MANIFEST_NAME))
+    Tasks = [(Section, issued_ref_id) for issued_ref_id in (IssuedRefIds or IssueUniverse()) for Section in Sections
+             if SectionKey(issued_ref_id, Section) not in Done]
+    Log("info", "Bond detail : {} (issue, section) to fetch".format(len(Tasks)))
+
+    Frames = {Section : [] for Section in Sections}
+    for (Section, issued_ref_id), resp in zip(Tasks, RunConcurrent(FetchSection, Tasks, MaxWorkers)):
+        if resp is not None:
+            Frames[Section].append(FlattenResponse(resp, issued_ref_id=issued_ref_id))
+            Done.add(SectionKey(issued_ref_id, Section))
+
+    for Section, Frame in Frames.items():
+        Frame = [df for df in Frame if not df.empty]
+        if Frame:
+            AppendTable(pd.concat(Frame, ignore_index=True), TABLE_NAME.format(Section))
+    SaveManifest(MANIFEST_NAME, Done)
+
+## Backfill outstanding value between Start and End (call only missing date)
+@Traced()
+def BackfillOutstanding(Start, End, IssuedRefIds=None, Freq="B", MaxWorkers=8):
+
+    Dates = [Date.strftime(DATE_FORMAT) for Date in pd.date_range(Start, End, freq=Freq)]
+    Done = LoadManifest("bond_outstanding")
+    Tasks = [(issued_ref_id, Date) for issued_ref_id in (IssuedRefIds or IssueUniverse()) for Date in Dates
+             if "{}|{}".format(issued_ref_id, Date) not in Done]
+    Log("info", "Bond outstanding value : {} (issue, date) to fetch".format(len(Tasks)))
+
+    Frames = []
+    for (issued_ref_id, Date), resp in zip(Tasks, RunConcurrent(Bond.bond_outs_outstanding_value, Tasks, MaxWorkers, "backfill")):
+        if resp is not None:
+            Frames.append(FlattenResponse(resp, issued_ref_id=issued_ref_id, outstanding_date=Date))
+            Done.add("{}|{}".format(issued_ref_id, Date))
+
+    Frames = [df for df in Frames if not df.empty]
+    if Frames:
+        df = pd.concat(Frames, ignore_index=True)
+        df["outstanding_month"] = df["outstanding_date"].str[:7]
+        AppendTable(df, TABLE_NAME.format("outstanding_value"), PartitionCols=["outstanding_month"])
+    SaveManifest("bond_outstanding", Done)
+
+## Outstanding value time series (date x issue)
+def OutstandingSeries(IssuedRefIds=None, ValueField=VALUE_FIELD):
+    Filters = [("issued_ref_id", "in", list(IssuedRefIds))] if IssuedRefIds else None
+    df = ReadTable(TABLE_NAME.format("outstanding_value"), Columns=["issued_ref_id", "outstanding_date", ValueField], Filters=Filters)
+    if df.empty:
+        return df
+    return df.pivot_table(index="outstanding_date", columns="issued_ref_id", values=ValueField, aggfunc="last").sort_index()
+
+## Portfolio outstanding value per date (Holdings : issued_ref_id -> weight / unit)
+def PortfolioOutstanding(Holdings, ValueField=VALUE_FIELD):
+    Series = OutstandingSeries(list(Holdings), ValueField)
+    if Series.empty:
+        return pd.Series(dtype="float64")
+    Weight = pd.Series(Holdings, dtype="float64").reindex(Series.columns).fillna(0)
+    return Series.fillna(0).dot(Weight)
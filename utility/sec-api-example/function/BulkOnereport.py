@@ -0,0 +1,90 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, ReadTable, LoadManifest, SaveManifest
+from function.Endpoints import EndpointFunctions
+import function.Onereport as Onereport
+
+# Declare variable
+MANIFEST_NAME = "onereport"
+TABLE_NAME = "onereport/{}"
+
+# section name -> function(report_year, unique_id)
+SECTIONS = {Section : Function for Section, Function in EndpointFunctions("Onereport", "onereport_").items() if Section != "sbo_info"}
+
+## Company list of report year (from onereport_sbo_info)
+def OnereportCompany(report_year, language="th"):
+    return CompanyIds(Onereport.onereport_sbo_info(report_year, language))
+
+def CompanyIds(resp):
+    return sorted({"{}".format(row["unique_id"]) for row in (resp or []) if isinstance(row, dict) and row.get("unique_id")})
+
+def FetchSection(Section, report_year, unique_id):
+    return SECTIONS[Section](report_year, unique_id)
+
+## Manifest key : one key per (year, company, section), section that failed is fetched again on resume
+def SectionKey(report_year, unique_id, Section):
+    return "{}|{}|{}".format(report_year, unique_id, Section)
+
+## Manifest of old version has "year|company" when any section was stored : keep only section with stored row of company
+def UpgradeManifest(Done):
+    Legacy = {Key for Key in Done if Key.count("|") == 1 and not Key.endswith("|sbo_info")}
+    if not Legacy:
+        return Done
+    Done = Done - Legacy
+    for Section in SECTIONS:
+        Stored = ReadTable(TABLE_NAME.format(Section))
+        if Stored.empty or "unique_id" not in Stored:
+            continue
+        Keys = set(Stored["report_year"].astype(str) + "|" + Stored["unique_id"].astype(str))
+        Done |= {"{}|{}".format(Key, Section) for Key in Legacy & Keys}
+    Log("info", "Onereport manifest upgraded : {} company key to per section key".format(len(Legacy)))
+    return Done
+
+## Fetch every section of (year x company) concurrently, skip (year, company, section) already stored
+@Traced()
+def BulkOnereport(Years, Companies=None, Sections=None, MaxWorkers=8, Refresh=False):
+
+    Sections = Sections or sorted(SECTIONS)
+    Done = set() if Refresh else UpgradeManifest(LoadManifest(MANIFEST_NAME))
+
+    for report_year in Years:
+
+        # sbo info is already a table of every company (stored once per year, failed call is fetched again next run)
+        # one call give both the table and company list of the year
+        InfoKey = "{}|sbo_info".format(report_year)
+        Info = None
+        if Refresh or InfoKey not in Done or not Companies:
+            Info = Onereport.onereport_sbo_info(report_year, "th")
+        if (Refresh or InfoKey not in Done) and Info is not None:
+            AppendTable(FlattenResponse(Info, report_year=report_year), TABLE_NAME.format("sbo_info"), PartitionCols=["report_year"])
+            Done.add(InfoKey)
+        if not Companies and Info is None:
+            Log("warning", "Onereport {} : cannot get company list, retry next run".format(report_year))
+
+        # fan out every (section, company) of the year not stored yet
+        YearCompanies = ["{}".format(unique_id) for unique_id in Companies] if Companies else CompanyIds(Info)
+        Tasks = [(Section, report_year, unique_id) for unique_id in YearCompanies for Section in Sections
+                 if SectionKey(report_year, unique_id, Section) not in Done]
+        Log("info", "Onereport {} : {} (company, section) to fetch ({} already stored)".format(
+            report_year, len(Tasks), len(YearCompanies) * len(Sections) - len(Tasks)))
+
+        Frames = {Section : [] for Section in Sections}
+        Fetched = set()
+        for (Section, Year, unique_id), resp in zip(Tasks, RunConcurrent(FetchSection, Tasks, MaxWorkers, "backfill")):
+            if resp is not None:
+                Frames[Section].append(FlattenResponse(resp, report_year=Year, unique_id=unique_id))
+                Fetched.add(SectionKey(Year, unique_id, Section))
+
+        # one columnar table per section partitioned by year
+        for Section, Frame in Frames.items():
+            Frame = [df for df in Frame if not df.empty]
+            if Frame:
+                AppendTable(pd.concat(Frame, ignore_index=True), TABLE_NAME.format(Section), PartitionCols=["report_year"])
+
+        Done |= Fetched
+        SaveManifest(MANIFEST_NAME, Done)
+
+    return Done
+
+def ReadOnereport(Section, Years=None):
+    Filters = [("report_year", "in", [int(Year) for Year in Years])] if Years else None
+    return ReadTable(TABLE_NAME.format(Section), Filters=Filters)
@@ -0,0 +1,77 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, ReadTable, LoadManifest, SaveManifest
+from function.Endpoints import EndpointFunctions
+
+# Declare variable
+DATE_FORMAT = "%Y-%m-%d"
+TABLE_NAME = "digitalasset/{}"
+
+# daily summary name -> function(trade_date)
+DAILY = EndpointFunctions("DigitalAsset", "digitalasset_daily_")
+
+# rollup of price column (other number column is summed)
+PRICE_AGGREGATION = {"open" : "first", "high" : "max", "low" : "min", "close" : "last"}
+
+def FetchDaily(Summary, trade_date):
+    return DAILY[Summary](trade_date)
+
+## Sync daily summary between Start and End (only missing date, historical date is never fetched again)
+@Traced()
+def SyncDigitalAssetDaily(Start, End=None, Summaries=None, MaxWorkers=8):
+
+    # today is not final yet, keep only historical date
+    Yesterday = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=1)
+    End = min(pd.Timestamp(End), Yesterday) if End else Yesterday
+    Dates = [Date.strftime(DATE_FORMAT) for Date in pd.date_range(Start, End, freq="D")]
+
+    for Summary in (Summaries or sorted(DAILY)):
+        Done = LoadManifest("digitalasset_{}".format(Summary))
+        Pending = [(Summary, Date) for Date in Dates if Date not in Done]
+        Log("info", "Digital asset {} : {} date to fetch".format(Summary, len(Pending)))
+
+        Frames = []
+        for (Summary, Date), resp in zip(Pending, RunConcurrent(FetchDaily, Pending, MaxWorkers, "backfill")):
+            if resp is not None:
+                Frames.append(FlattenResponse(resp, trade_date=Date))
+                Done.add(Date)
+
+        Frames = [df for df in Frames if not df.empty]
+        if Frames:
+            df = pd.concat(Frames, ignore_index=True)
+            df["trade_month"] = df["trade_date"].str[:7]
+            AppendTable(df, TABLE_NAME.format(Summary), PartitionCols=["trade_month"])
+        SaveManifest("digitalasset_{}".format(Summary), Done)
+
+def ReadDigitalAssetDaily(Summary, Start=None, End=None):
+    Filters = []
+    if Start:
+        Filters.append(("trade_month", ">=", pd.Timestamp(Start).strftime("%Y-%m")))
+    if End:
+        Filters.append(("trade_month", "<=", pd.Timestamp(End).strftime("%Y-%m")))
+    df = ReadTable(TABLE_NAME.format(Summary), Filters=Filters or None)
+    if df.empty:
+        return df
+
+    df["trade_date"] = pd.to_datetime(df["trade_date"])
+    if Start:
+        df = df[df["trade_date"] >= pd.Timestamp(Start)]
+    if End:
+        df = df[df["trade_date"] <= pd.Timestamp(End)]
+    return df.drop(columns=["trade_month"]).sort_values("trade_date", ignore_index=True)
+
+## Weekly / monthly rollup from local daily data (Freq : "W" or "M")
+def RollupDigitalAsset(Summary, Freq="W", Start=None, End=None, Keys=None):
+
+    df = ReadDigitalAssetDaily(Summary, Start, End)
+    if df.empty:
+        return df
+
+    # group by period and every text column (asset, currency, investor type, ...)
+    Numbers = [Column for Column in df.columns if pd.api.types.is_numeric_dtype(df[Column])]
+    Keys = Keys or [Column for Column in df.columns if Column not in Numbers and Column != "trade_date"]
+    Aggregation = {Column : PRICE_AGGREGATION.get(Column.lower(), "sum") for Column in Numbers}
+
+    df["period"] = df["trade_date"].dt.to_period(Freq).dt.start_time
+    Rollup = df.groupby(["period"] + Keys, dropna=False, sort=True).agg(Aggregation)
+    Rollup["trade_days"] = df.groupby(["period"] + Keys, dropna=False, sort=True)["trade_date"].nunique()
+    return Rollup.reset_index()
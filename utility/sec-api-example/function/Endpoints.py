@@ -0,0 +1,275 @@
+from function.AllFunction import *
+from function.SearchIndex import SearchLocal, RememberRemote
+import importlib
+import inspect
+import re
+
+# asyncio is imported only when _async wrapper is called
+asyncio = LazyModule("asyncio")
+
+# Declare variable
+DAY = 86400
+
+# API product : (path of product, subscription key in .env)
+PRODUCTS = {
+    "FundFactsheet" : ("/FundFactsheet", "FundFactsheetKey"),
+    "FundDailyInfo" : ("/FundDailyInfo", "FundDailyInfoKey"),
+    "LicenseCheck" : ("/LicenseCheck/licensee", "LicenseCheckKey"),
+    "PVDFactSheet" : ("/pvd/factsheet", "PVDFactsheetKey"),
+    "DigitalAsset" : ("/DigitalAsset", "DigitalAssetKey"),
+    "Onereport" : ("/onereport", "OnereportKey"),
+    "Common" : ("/common/ref", "CommonKey"),
+    "Bond" : ("/bond", "BondKey"),
+}
+
+## One API endpoint : wrapper function <Name> (and <Name>_batch / <Name>_async) is generated from it
+##   Path      : path template after product path, {param} is filled from parameter
+##   Params    : parameter of wrapper (default : {param} of path and parameter of Body, in order)
+##   Defaults  : default of optional parameter (/{param} of optional parameter is dropped when value is None)
+##   Body      : POST body {api field : parameter}
+##   TTL       : second that cached GET is used without calling API (default : CacheTTL in .env)
+##   Immutable : published response never change (cached non-empty response is used without calling API)
+##   Search    : kind of local name index, searched before POST and updated from POST result
+##   SearchIf  : use local index only when SearchIf(parameter) is true
+##   GetIf     : call GET GetPath instead of Path when GetIf(parameter) is true (lookup by id of search endpoint)
+class Endpoint:
+    def __init__(self, Name, Product, Path, Method="GET", Params=None, Defaults=None, Body=None, TTL=None, Immutable=False,
+                 Search=None, SearchIf=None, GetIf=None, GetPath=None):
+        self.Name = Name
+        self.Product = Product
+        self.Path = Path
+        self.Method = Method
+        self.Body = Body or {}
+        self.Defaults = Defaults or {}
+        self.TTL = TTL
+        self.Immutable = Immutable
+        self.Search = Search
+        self.SearchIf = SearchIf
+        self.GetIf = GetIf
+        self.GetPath = GetPath
+        Found = re.findall(r"\{(\w+)\}", (GetPath or "") + Path) + list(self.Body.values())
+        self.Params = Params or list(dict.fromkeys(Found))
+
+    def __repr__(self):
+        return "Endpoint({} {}{})".format(self.Method, PRODUCTS[self.Product][0], self.Path)
+
+def IsUniqueId(Value):
+    return len(Value) == 11 or Value.startswith("C0")
+
+## proj_id of mutual fund (M0001_2565 , M1094_2557)
+def IsProjId(Value):
+    return re.match(r"M\d+_\d+$", "{}".format(Value).strip()) is not None
+
+ENDPOINTS = [
+    # FundFactsheet
+    Endpoint("fund_factsheet_amc", "FundFactsheet", "/fund/amc", TTL=DAY),
+    Endpoint("fund_factsheet_fund", "FundFactsheet", "/fund", "POST", Body={"name" : "FundParam"}, Search="fund",
+             GetIf=lambda Args: IsUniqueId(Args["FundParam"]), GetPath="/fund/amc/{FundParam}"),
+    Endpoint("fund_factsheet_urls", "FundFactsheet", "/fund/{proj_fund}/URLs"),
+    Endpoint("fund_factsheet_ipo", "FundFactsheet", "/fund/{proj_fund}/IPO"),
+    Endpoint("fund_factsheet_investment", "FundFactsheet", "/fund/{proj_fund}/investment"),
+    Endpoint("fund_factsheet_project_type", "FundFactsheet", "/fund/{proj_id}/project_type"),
+    Endpoint("fund_factsheet_policy", "FundFactsheet", "/fund/{proj_id}/policy"),
+    Endpoint("fund_factsheet_specification", "FundFactsheet", "/fund/{proj_id}/specification"),
+    Endpoint("fund_factsheet_feeder_fund", "FundFactsheet", "/fund/{proj_id}/feeder_fund"),
+    Endpoint("fund_factsheet_redemption", "FundFactsheet", "/fund/{proj_id}/redemption"),
+    Endpoint("fund_factsheet_suitability", "FundFactsheet", "/fund/{proj_id}/suitability"),
+    Endpoint("fund_factsheet_risk", "FundFactsheet", "/fund/{proj_id}/risk"),
+    Endpoint("fund_factsheet_asset", "FundFactsheet", "/fund/{proj_id}/asset"),
+    Endpoint("fund_factsheet_turnover_ratio", "FundFactsheet", "/fund/{proj_id}/turnover_ratio"),
+    Endpoint("fund_factsheet_return", "FundFactsheet", "/fund/{proj_id}/return"),
+    Endpoint("fund_factsheet_buy_and_hold", "FundFactsheet", "/fund/{proj_id}/buy_and_hold"),
+    Endpoint("fund_factsheet_benchmark", "FundFactsheet", "/fund/{proj_id}/benchmark"),
+    Endpoint("fund_factsheet_fund_compare", "FundFactsheet", "/fund/{proj_id}/fund_compare"),
+    Endpoint("fund_factsheet_class_fund", "FundFactsheet", "/fund/class_fund", "POST", Body={"name" : "ClassParam"}, Search="class_fund",
+             GetIf=lambda Args: IsProjId(Args["ClassParam"]), GetPath="/fund/{ClassParam}/class_fund"),
+    Endpoint("fund_factsheet_performance", "FundFactsheet", "/fund/{proj_id}/performance"),
+    Endpoint("fund_factsheet_5YearLost", "FundFactsheet", "/fund/{proj_id}/5YearLost"),
+    Endpoint("fund_factsheet_dividend", "FundFactsheet", "/fund/{proj_id}/dividend"),
+    Endpoint("fund_factsheet_fee", "FundFactsheet", "/fund/{proj_id}/fee"),
+    Endpoint("fund_factsheet_InvolveParty", "FundFactsheet", "/fund/{proj_id}/InvolveParty"),
+    Endpoint("fund_factsheet_FundPort", "FundFactsheet", "/fund/{proj_id}/FundPort/{period}", Immutable=True),
+    Endpoint("fund_factsheet_FundFullPort", "FundFactsheet", "/fund/{proj_id}/FundFullPort/{period}", Immutable=True),
+    Endpoint("fund_factsheet_FundTop5", "FundFactsheet", "/fund/{proj_id}/FundTop5/{period}", Immutable=True),
+    Endpoint("fund_factsheet_FundHist", "FundFactsheet", "/fund/{proj_id}/FundHist"),
+    Endpoint("fund_factsheet_FundTrackingError", "FundFactsheet", "/fund/{proj_id}/FundTrackingError"),
+
+    # FundDailyInfo
+    Endpoint("fund_dailyinfo_dailynav", "FundDailyInfo", "/{proj_fund}/dailynav/{nav_date}", Immutable=True),
+    Endpoint("fund_dailyinfo_dividend", "FundDailyInfo", "/{proj_fund}/dividend"),
+    Endpoint("fund_dailyinfo_amc", "FundDailyInfo", "/amc", TTL=DAY),
+
+    # LicenseCheck
+    Endpoint("licensecheck_lcs_person", "LicenseCheck", "/person", "POST", Body={"Name" : "person_name", "regis_sale_no" : "regis_sale_no"},
+             Search="person", SearchIf=lambda Args: not Args["regis_sale_no"]),
+    Endpoint("licensecheck_lcs_company", "LicenseCheck", "/company", "POST", Body={"Name" : "CompName"}, Search="company",
+             GetIf=lambda Args: Args["CompName"] is None, GetPath="/company"),
+    Endpoint("licensecheck_lcs_person_license", "LicenseCheck", "/person/{unique_id}/license"),
+    Endpoint("licensecheck_lcs_company_personnel", "LicenseCheck", "/company/{unique_id}/personnel"),
+    Endpoint("licensecheck_lcs_person_workinfo", "LicenseCheck", "/person/{unique_id}/work_info"),
+    Endpoint("licensecheck_lcs_company_license", "LicenseCheck", "/company/{unique_id}/license"),
+    Endpoint("licensecheck_lcs_company_business_act", "LicenseCheck", "/company/{unique_id}/business_act"),
+    Endpoint("licensecheck_lcs_enforcement", "LicenseCheck", "/{unique_id}/enforcement/{case_id}", Defaults={"case_id" : None}),
+    Endpoint("licensecheck_lcs_alertdetail", "LicenseCheck", "/investoralert/alertdetail"),
+    Endpoint("licensecheck_lcs_alertaction", "LicenseCheck", "/investoralert/{case_id}/alertaction"),
+
+    # PVDFactSheet
+    Endpoint("pvd_factsheet_amc", "PVDFactSheet", "/amc", TTL=DAY),
+    Endpoint("pvd_factsheet_fund", "PVDFactSheet", "/fund", "POST", Body={"FundName" : "unique_id"}, Search="pvd_fund",
+             GetIf=lambda Args: IsUniqueId(Args["unique_id"]), GetPath="/{unique_id}/fund"),
+    Endpoint("pvd_factsheet_policy", "PVDFactSheet", "/{proj_id}/policy"),
+    Endpoint("pvd_factsheet_return", "PVDFactSheet", "/{proj_id}/return"),
+    Endpoint("pvd_factsheet_fee", "PVDFactSheet", "/{proj_id}/fee"),
+    Endpoint("pvd_factsheet_pvdFullPort", "PVDFactSheet", "/{proj_id}/PVDFullPort/{period}", Immutable=True),
+
+    # DigitalAsset
+    Endpoint("digitalasset_profile_intermediary", "DigitalAsset", "/profile/intermediary", "POST", Body={"IntermediaryName" : "IntermediaryName"}),
+    Endpoint("digitalasset_monthly_customer", "DigitalAsset", "/monthly/{trade_date}/customer", Immutable=True),
+    Endpoint("digitalasset_monthly_asset", "DigitalAsset", "/monthly/{trade_date}/asset", Immutable=True),
+    Endpoint("digitalasset_monthly_active_account", "DigitalAsset", "/monthly/{trade_date}/active_account", Immutable=True),
+    Endpoint("digitalasset_weekly_asset", "DigitalAsset", "/weekly/{trade_date}/asset", Immutable=True),
+    Endpoint("digitalasset_daily_surv_trade_summary", "DigitalAsset", "/daily/{trade_date}/surv_trade_summary", Immutable=True),
+    Endpoint("digitalasset_daily_investor_type_summary", "DigitalAsset", "/daily/{trade_date}/investor_type_summary", Immutable=True),
+    Endpoint("digitalasset_daily_dtw_daily_summary", "DigitalAsset", "/daily/{trade_date}/dtw_daily_summary", Immutable=True),
+
+    # Onereport
+    Endpoint("onereport_sbo_info", "Onereport", "/sbo/{report_year}/info/{language}"),
+    Endpoint("onereport_sbo_product_income", "Onereport", "/sbo/{report_year}/product_income/{unique_id}"),
+    Endpoint("onereport_sbo_risk", "Onereport", "/sbo/{report_year}/risk/{unique_id}"),
+    Endpoint("onereport_sustainability_detail", "Onereport", "/sustainability/{report_year}/detail/{unique_id}"),
+    Endpoint("onereport_sustainability_humanrights_issue", "Onereport", "/sustainability/{report_year}/humanrights_issue/{unique_id}"),
+    Endpoint("onereport_scp_labor_dispute", "Onereport", "/scp/{report_year}/labor_dispute/{unique_id}"),
+    Endpoint("onereport_scp_csr_activity", "Onereport", "/scp/{report_year}/csr_activity/{unique_id}"),
+    Endpoint("onereport_cgp_governance", "Onereport", "/cgp/{report_year}/governance/{unique_id}"),
+    Endpoint("onereport_cgp_director", "Onereport", "/cgp/{report_year}/director/{unique_id}"),
+    Endpoint("onereport_cgp_code_of_conduct", "Onereport", "/cgp/{report_year}/code_of_conduct/{unique_id}"),
+    Endpoint("onereport_cgs_board", "Onereport", "/cgs/{report_year}/board/{unique_id}"),
+    Endpoint("onereport_cgs_auditor_company", "Onereport", "/cgs/{report_year}/auditor_company/{unique_id}"),
+    Endpoint("onereport_cgs_director_performance", "Onereport", "/cgs/{report_year}/director_performance/{unique_id}"),
+
+    # Common (reference table change rarely)
+    Endpoint("ref_license_type_company", "Common", "/license_type/company", TTL=DAY),
+    Endpoint("ref_business_act_company", "Common", "/business_act/company", TTL=DAY),
+    Endpoint("ref_license_type_person", "Common", "/license_type/person", TTL=DAY),
+    Endpoint("ref_role_person", "Common", "/role/person", TTL=DAY),
+    Endpoint("ref_fund_portfolio_asset_type", "Common", "/fund/portfolio/asset_type", TTL=DAY),
+    Endpoint("ref_product_secu_type", "Common", "/product/secu_type", TTL=DAY),
+    Endpoint("ref_product_offering_type", "Common", "/product/offering_type", TTL=DAY),
+    Endpoint("ref_product_currency_code", "Common", "/product/currency_code", TTL=DAY),
+    Endpoint("ref_product_debenture_coupon_code", "Common", "/product/debenture/coupon_code", TTL=DAY),
+    Endpoint("ref_product_debenture_redemption_code", "Common", "/product/debenture/redemption_code", TTL=DAY),
+    Endpoint("ref_product_debenture_embedded_code", "Common", "/product/debenture/embedded_code", TTL=DAY),
+    Endpoint("ref_product_debenture_secured_code", "Common", "/product/debenture/secured_code", TTL=DAY),
+    Endpoint("ref_investoralert_action_type", "Common", "/investoralert/action_type", TTL=DAY),
+    Endpoint("ref_bond_function_type", "Common", "/bond/function_type", TTL=DAY),
+    Endpoint("ref_bond_corporation_type", "Common", "/bond/corporation_type", TTL=DAY),
+    Endpoint("ref_digitalasset_customer_type", "Common", "/digitalasset/customer_type", TTL=DAY),
+    Endpoint("ref_digitalasset_asset_type", "Common", "/digitalasset/asset_type", TTL=DAY),
+    Endpoint("ref_pvd_policy_code", "Common", "/pvd/policy_code", TTL=DAY),
+    Endpoint("ref_onereport_financial_statement", "Common", "/onereport/financial_statement", TTL=DAY),
+    Endpoint("ref_onereport_social_performance_code", "Common", "/onereport/social_performance_code", TTL=DAY),
+    Endpoint("ref_onereport_risk_code", "Common", "/onereport/risk_code", TTL=DAY),
+    Endpoint("ref_onereport_export_code", "Common", "/onereport/export_code", TTL=DAY),
+    Endpoint("ref_onereport_environment_code", "Common", "/onereport/environment_code", TTL=DAY),
+
+    # Bond
+    Endpoint("bond_outs_issuer", "Bond", "/outstanding/issuer", "POST", Body={"IssuerName" : "IssuerName"}, Search="issuer"),
+    Endpoint("bond_outs_issue", "Bond", "/outstanding/issue", "POST", Body={"SecurityCode" : "SecurityCode"}),
+    Endpoint("bond_outs_offer_type", "Bond", "/outstanding/{issued_ref_id}/offer_type"),
+    Endpoint("bond_outs_coupon", "Bond", "/outstanding/{issued_ref_id}/coupon"),
+    Endpoint("bond_outs_issue_age", "Bond", "/outstanding/{issued_ref_id}/issue_age"),
+    Endpoint("bond_outs_offering_unit", "Bond", "/outstanding/{issued_ref_id}/offering_unit"),
+    Endpoint("bond_outs_issue_rating", "Bond", "/outstanding/{issued_ref_id}/issue_rating"),
+    Endpoint("bond_outs_redemption", "Bond", "/outstanding/{issued_ref_id}/redemption"),
+    Endpoint("bond_outs_involve_party", "Bond", "/outstanding/{issued_ref_id}/involve_party"),
+    Endpoint("bond_outs_investor_type", "Bond", "/outstanding/{issued_ref_id}/investor_type"),
+    Endpoint("bond_outs_sector_type", "Bond", "/outstanding/{issued_ref_id}/sector_type"),
+    Endpoint("bond_outs_outstanding_value", "Bond", "/outstanding/{issued_ref_id}/outstanding_value/{outstanding_date}", Immutable=True),
+]
+REGISTRY = {Item.Name : Item for Item in ENDPOINTS}
+
+## Fill path template (segment of optional parameter that is None is dropped)
+def FormatPath(Path, Args, Optional=()):
+    Path = re.sub(r"/\{(\w+)\}", lambda Match: "" if Match.group(1) in Optional and Args[Match.group(1)] is None else Match.group(0), Path)
+    return Path.format(**Args)
+
+## Endpoint label of metrics / trace / hedge latency : product path + path template (LicenseCheck/licensee/person/{unique_id}/license)
+def EndpointTemplate(Spec, Path):
+    return PRODUCTS[Spec.Product][0].lstrip("/") + Path
+
+## Call endpoint with parameter of wrapper
+def CallEndpoint(Spec, Args):
+    ApiUrl = Setting.ApiUrl(PRODUCTS[Spec.Product][0])
+    Headers = Setting.Headers(PRODUCTS[Spec.Product][1])
+
+    UseGetPath = Spec.GetIf is not None and Spec.GetIf(Args)
+    if Spec.Method == "GET" or UseGetPath:
+        CallUrl = ApiUrl + FormatPath(Spec.GetPath if UseGetPath else Spec.Path, Args, Spec.Defaults)
+        Log("debug", "preparing to call the API [{}]".format(CallUrl))
+        return RateLimiter.CallGetAPI(self=None, headers=Headers, url=CallUrl, TTL=Spec.TTL, Immutable=Spec.Immutable,
+                                      Endpoint=EndpointTemplate(Spec, Spec.GetPath if UseGetPath else Spec.Path))
+
+    # Search from local index first, call remote search only when not found
+    UseIndex = Spec.Search is not None and (Spec.SearchIf is None or Spec.SearchIf(Args))
+    if UseIndex:
+        resp = SearchLocal(Spec.Search, Args[Spec.Params[0]])
+        if resp is not None:
+            return resp
+
+    CallUrl = ApiUrl + FormatPath(Spec.Path, Args, Spec.Defaults)
+    Data = {Field : "{}".format(Args[Param]) for Field, Param in Spec.Body.items()}
+    Log("debug", "preparing to call the API [{}]".format(CallUrl))
+    resp = RateLimiter.CallPostAPI(self=None, headers=Headers, data=Data, url=CallUrl, Endpoint=EndpointTemplate(Spec, Spec.Path))
+    if UseIndex:
+        RememberRemote(Spec.Search, resp)
+    return resp
+
+## Wrapper function of endpoint (signature is parameter of endpoint : help(fund_factsheet_asset) show proj_id)
+def MakeWrapper(Spec, Module):
+    Signature = inspect.Signature([inspect.Parameter(Param, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                                     default=Spec.Defaults.get(Param, inspect.Parameter.empty)) for Param in Spec.Params])
+
+    def Wrapper(*Args, **Kwargs):
+        Bound = Signature.bind(*Args, **Kwargs)
+        Bound.apply_defaults()
+        return CallEndpoint(Spec, Bound.arguments)
+
+    # call wrapper concurrently : fund_factsheet_asset_batch(["M0001_2565", ...]) (result keep the same order)
+    def Batch(ArgsList, MaxWorkers=8, PriorityClass=None):
+        return RunConcurrent(Wrapper, ArgsList, MaxWorkers, PriorityClass)
+
+    # call wrapper from asyncio : await fund_factsheet_asset_async("M0001_2565") (priority / trace of caller is kept)
+    async def Async(*Args, **Kwargs):
+        Class, Parent = getattr(PriorityState, "Class", None) or DEFAULT_PRIORITY, CurrentSpan()
+        def Call():
+            with Priority(Class), Attach(Parent):
+                return Wrapper(*Args, **Kwargs)
+        return await asyncio.get_running_loop().run_in_executor(None, Call)
+
+    Doc = "{} {}{}".format(Spec.Method, PRODUCTS[Spec.Product][0].lstrip("/"), Spec.Path)
+    if Spec.GetPath is not None:
+        Doc += " (GET {}{} by id)".format(PRODUCTS[Spec.Product][0].lstrip("/"), Spec.GetPath)
+    Functions = {}
+    for Suffix, Function in (("", Wrapper), ("_batch", Batch), ("_async", Async)):
+        Function.__name__ = Function.__qualname__ = Spec.Name + Suffix
+        Function.__module__ = Module
+        Function.__doc__ = Doc
+        Functions[Function.__name__] = Function
+    Wrapper.__signature__ = Signature
+    Wrapper.Endpoint = Spec
+    return Functions
+
+## Every wrapper of API product (product module : globals().update(Generate("FundFactsheet", __name__)))
+def Generate(Product, Module=None):
+    Functions = {}
+    for Spec in ENDPOINTS:
+        if Spec.Product == Product:
+            Functions.update(MakeWrapper(Spec, Module or "function.{}".format(Product)))
+    return Functions
+
+## Wrapper of every endpoint of API product by name (Prefix removed from name), without generated _batch / _async
+##   EndpointFunctions("Common", "ref_") -> {"role_person" : ref_role_person, ...}
+def EndpointFunctions(Product, Prefix=""):
+    Module = importlib.import_module("function.{}".format(Product))
+    return {Spec.Name[len(Prefix):] : getattr(Module, Spec.Name) for Spec in ENDPOINTS
+            if Spec.Product == Product and Spec.Name.startswith(Prefix)}
@@ -0,0 +1,138 @@
+from function.AllFunction import *
+from function.Store import WriteTable, ReadTable, LoadManifest, SaveManifest
+from function.SearchIndex import GetIndex
+from function.FundUniverse import MutualFundUniverse
+from function.FundFactsheet import fund_factsheet_feeder_fund
+
+# Declare variable
+GRAPH_TABLE = "fund/feeder_graph"
+FAILED_MANIFEST = "feeder_graph_failed"
+MAX_DEPTH = 5
+
+# field in fund_factsheet_feeder_fund response
+MASTER_ID_FIELDS = ["master_proj_id", "master_fund_id"]
+MASTER_NAME_FIELDS = ["master_fund_name", "fund_name_master", "feeder_fund_name"]
+WEIGHT_FIELD = "invest_ratio"
+
+# feeder fund invest almost all in master fund (use when weight is not in response)
+DEFAULT_WEIGHT = 1.0
+
+# asset name of master fund unit in allocation of feeder fund
+MASTER_ASSET_PATTERN = r"unit trust|investment unit|หน่วยลงทุน|master fund|กองทุนหลัก"
+
+## Master fund id : local proj_id when master is a Thai fund, "EXT:<name>" for foreign fund
+def ResolveMaster(Record):
+    for Field in MASTER_ID_FIELDS:
+        if Record.get(Field):
+            return "{}".format(Record[Field]), Record.get(Field)
+    Name = next((Record[Field] for Field in MASTER_NAME_FIELDS if Record.get(Field)), None)
+    if not Name:
+        return None, None
+    Found = GetIndex("fund").Lookup(Name, Fuzzy=False)
+    return (Found[0]["proj_id"], Name) if len(Found) == 1 else ("EXT:{}".format(Name.strip()), Name)
+
+## Build feeder -> master graph in one concurrent pass over every fund
+## fund whose call failed is kept in manifest and checked again by next FeederGraph() (Graph : graph of other fund to keep)
+@Traced()
+def BuildFeederGraph(ProjIds=None, MaxWorkers=8, Graph=None):
+
+    if ProjIds is None:
+        Fund = MutualFundUniverse(MaxWorkers=MaxWorkers)
+        ProjIds = list(Fund["proj_id"].dropna().unique()) if not Fund.empty else []
+    Log("info", "Feeder graph : checking {} fund".format(len(ProjIds)))
+
+    Edges, Failed = [], []
+    for proj_id, resp in zip(ProjIds, RunConcurrent(fund_factsheet_feeder_fund, ProjIds, MaxWorkers)):
+        if resp is None:
+            Failed.append(proj_id)
+            continue
+        for Record in (resp if isinstance(resp, list) else [resp] if resp else []):
+            MasterId, MasterName = ResolveMaster(Record)
+            if MasterId and MasterId != proj_id:
+                Weight = pd.to_numeric(Record.get(WEIGHT_FIELD), errors="coerce")
+                Edges.append({
+                    "feeder_id" : proj_id,
+                    "master_id" : MasterId,
+                    "master_name" : MasterName,
+                    "weight" : DEFAULT_WEIGHT if pd.isna(Weight) else (Weight / 100.0 if Weight > 1 else Weight),
+                })
+
+    Built = pd.DataFrame(Edges, columns=["feeder_id", "master_id", "master_name", "weight"])
+    if Graph is not None and not Graph.empty:
+        Built = pd.concat([Graph[~Graph["feeder_id"].isin(ProjIds)], Built], ignore_index=True)
+    WriteTable(Built, GRAPH_TABLE)
+    SaveManifest(FAILED_MANIFEST, Failed)
+    Log("info", "Feeder graph : {} feeder fund".format(Built["feeder_id"].nunique()))
+    if Failed:
+        Log("warning", "Feeder graph : {} fund failed, checked again at next call".format(len(Failed)))
+    return Built
+
+## Stored graph (built when not stored, fund that failed last time is checked again)
+def FeederGraph(Refresh=False, MaxWorkers=8):
+    Graph = pd.DataFrame() if Refresh else ReadTable(GRAPH_TABLE)
+    if Graph.empty:
+        return BuildFeederGraph(MaxWorkers=MaxWorkers)
+    Failed = LoadManifest(FAILED_MANIFEST)
+    return BuildFeederGraph(sorted(Failed), MaxWorkers, Graph) if Failed else Graph
+
+## Master chain of each fund (fund -> every master with weight product)
+def ExpandFeeder(ProjIds=None, Graph=None):
+    Graph = FeederGraph() if Graph is None else Graph
+    Chain = pd.DataFrame({"proj_id" : list(ProjIds) if ProjIds is not None else list(Graph["feeder_id"].unique())})
+    Chain["master_id"] = Chain["proj_id"]
+    Chain["weight"] = 1.0
+    Chain["depth"] = 0
+
+    Result = [Chain]
+    for Depth in range(1, MAX_DEPTH + 1):
+        Chain = Chain.merge(Graph[["feeder_id", "master_id", "weight"]], left_on="master_id", right_on="feeder_id", suffixes=("", "_edge"))
+        if Chain.empty:
+            break
+        Chain = pd.DataFrame({"proj_id" : Chain["proj_id"], "master_id" : Chain["master_id_edge"], "weight" : Chain["weight"] * Chain["weight_edge"], "depth" : Depth})
+        Result.append(Chain)
+    return pd.concat(Result, ignore_index=True)
+
+## Own allocation of each fund with master fund unit removed (look-through replace it by allocation of master)
+##   master unit row : asset name match MASTER_ASSET_PATTERN or name of master fund in graph
+##   weight x 100 of master is removed from master unit row (in row order), other unit trust held by feeder is kept
+##   feeder without master unit row in its allocation : own allocation is scaled by (1 - weight) instead
+##   master without allocation (foreign fund "EXT:<name>" / not in Allocation) is not looked through, its unit row is kept as holding
+def OwnAllocation(Allocation, Graph, Asset="asset_name", Ratio="asset_ratio"):
+    Graph = Graph[Graph["master_id"].isin(Allocation["proj_id"])]
+    Own = Allocation[["proj_id", Asset, Ratio]].copy()
+    Own[Ratio] = Own[Ratio].astype("float64")
+    Own["passed"] = Own["proj_id"].map(Graph.groupby("feeder_id")["weight"].sum().clip(upper=1.0) * 100.0).fillna(0.0)
+
+    Name = Own[Asset].fillna("").astype(str).str.strip().str.casefold()
+    MasterNames = set(zip(Graph["feeder_id"], Graph["master_name"].fillna("").astype(str).str.strip().str.casefold()))
+    IsUnit = (Own["passed"] > 0) & (Name.str.contains(MASTER_ASSET_PATTERN, regex=True) |
+                                    pd.Series([Pair in MasterNames for Pair in zip(Own["proj_id"], Name)], index=Own.index))
+
+    Unit = Own[IsUnit]
+    Before = Unit.groupby("proj_id")[Ratio].cumsum() - Unit[Ratio]
+    Own.loc[IsUnit, Ratio] = Unit[Ratio] - (Unit["passed"] - Before).clip(lower=0.0).clip(upper=Unit[Ratio])
+
+    NoUnit = (Own["passed"] > 0) & ~Own["proj_id"].isin(Unit["proj_id"])
+    Own.loc[NoUnit, Ratio] = Own.loc[NoUnit, Ratio] * (1.0 - Own.loc[NoUnit, "passed"] / 100.0)
+    return Own[Own[Ratio] > 0].drop(columns=["passed"])
+
+## Effective asset allocation (look through every master fund at once)
+## Allocation : proj_id, asset_name, asset_ratio (own allocation of each fund, % of NAV)
+## effective = own allocation without master unit + allocation of each master x weight (for every level of master)
+def EffectiveAllocation(Allocation, ProjIds=None, Graph=None, Asset="asset_name", Ratio="asset_ratio"):
+
+    Graph = FeederGraph() if Graph is None else Graph
+    Chain = ExpandFeeder(ProjIds if ProjIds is not None else Allocation["proj_id"].unique(), Graph)
+
+    Own = OwnAllocation(Allocation, Graph, Asset, Ratio).rename(columns={"proj_id" : "master_id"})
+    Effective = Chain.merge(Own, on="master_id")
+    Effective[Ratio] = Effective[Ratio] * Effective["weight"]
+    return Effective.groupby(["proj_id", Asset], as_index=False)[Ratio].sum()
+
+## Effective fee (own fee + fee of every master weighted by investment)
+## Fee : Series proj_id -> fee (% per year)
+def EffectiveFee(Fee, ProjIds=None, Graph=None):
+    Chain = ExpandFeeder(ProjIds if ProjIds is not None else Fee.index, Graph)
+    Chain["fee"] = Chain["master_id"].map(Fee.astype("float64")).fillna(0.0).values * Chain["weight"].values
+    Chain["unknown_master"] = Chain["master_id"].map(Fee).isna() & (Chain["depth"] > 0)
+    return Chain.groupby("proj_id").agg(effective_fee=("fee", "sum"), unknown_master=("unknown_master", "any"))
@@ -0,0 +1,139 @@
+from function.AllFunction import *
+from function.FundFactsheet import fund_factsheet_amc, fund_factsheet_fund, fund_factsheet_class_fund
+from datetime import timezone
+import hashlib
+
+# Declare variable (mapping is written to data folder of repository, the same file as phase-0-build-mapping.ts)
+REPO_ROOT = Path(__file__).resolve().parents[3]
+MAPPING_PATH = str(REPO_ROOT / "data" / "fund-mapping.json")
+STATE_PATH = "data/fund-mapping.state.json"
+CLASS_BATCH_SIZE = 50
+
+def IsRMF(fund):
+    return any("RMF" in "{}".format(fund.get(Field) or "") for Field in ("proj_id", "proj_name_th", "proj_name_en", "proj_abbr_name"))
+
+def HashFundList(funds):
+    return hashlib.sha1(json.dumps(funds, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def MappingEntry(fund, amc):
+    return {
+        "proj_id" : fund.get("proj_id"),
+        "fund_name_th" : fund.get("proj_name_th") or "",
+        "fund_name_en" : fund.get("proj_name_en") or "",
+        "amc_id" : amc["unique_id"],
+        "amc_name" : amc.get("name_en") or amc.get("name_th"),
+        "fund_status" : fund.get("fund_status") or "Unknown",
+        "regis_date" : fund.get("regis_date") or "",
+        "cancel_date" : fund.get("cancel_date") or None,
+    }
+
+## Resolve class fund of RMF funds in batch (proj_id -> class list, None when call failed)
+## fund_factsheet_class_fund call GET /fund/{proj_id}/class_fund for proj_id
+def ResolveClassFund(ProjIds, MaxWorkers=8):
+
+    ClassFund = {}
+    for idx in range(0, len(ProjIds), CLASS_BATCH_SIZE):
+        Batch = ProjIds[idx:idx + CLASS_BATCH_SIZE]
+        Log("info", "Resolving class fund [{}-{}/{}]".format(idx + 1, idx + len(Batch), len(ProjIds)))
+        for proj_id, resp in zip(Batch, RunConcurrent(fund_factsheet_class_fund, Batch, MaxWorkers)):
+            ClassFund[proj_id] = resp
+    return ClassFund
+
+## Build RMF symbol mapping of one AMC (Complete is False when class fund of some fund cannot be fetched)
+##   mapped_symbols : fund symbol (same meaning as phase-0-build-mapping.ts) , class_symbols : share class symbol added
+def BuildAMCMapping(amc, funds, MaxWorkers=8):
+
+    Mapping = {}
+    Stats = {"total_funds" : len(funds), "rmf_funds" : 0, "active_funds" : 0, "cancelled_funds" : 0, "mapped_symbols" : 0,
+             "class_symbols" : 0, "unmapped_funds" : 0}
+
+    RMFFunds = [fund for fund in funds if IsRMF(fund)]
+    Stats["rmf_funds"] = len(RMFFunds)
+    ClassFund = ResolveClassFund([fund["proj_id"] for fund in RMFFunds if fund.get("proj_id")], MaxWorkers)
+
+    for fund in RMFFunds:
+        Symbol = (fund.get("proj_abbr_name") or "").strip()
+        if not Symbol:
+            Stats["unmapped_funds"] += 1
+            Log("debug", "  No symbol for fund : {}".format(fund.get("proj_name_en") or fund.get("proj_id")))
+            continue
+
+        if fund.get("fund_status") in ("CA", "LI"):
+            Stats["cancelled_funds"] += 1
+        else:
+            Stats["active_funds"] += 1
+
+        Entry = MappingEntry(fund, amc)
+        Mapping[Symbol] = Entry
+        Stats["mapped_symbols"] += 1
+
+        # share class symbol point to the same fund
+        for FundClass in ClassFund.get(fund["proj_id"]) or []:
+            ClassSymbol = (FundClass.get("class_abbr_name") or "").strip()
+            if ClassSymbol and ClassSymbol not in Mapping:
+                Mapping[ClassSymbol] = Entry
+                Stats["class_symbols"] += 1
+
+    Complete = all(ClassFund[proj_id] is not None for proj_id in ClassFund)
+    if not Complete:
+        Log("warning", "Class fund of {} is incomplete, rebuild next run".format(amc.get("name_en") or amc["unique_id"]))
+    return Mapping, Stats, Complete
+
+## Build data/fund-mapping.json (rebuild only AMC that fund list changed)
+@Traced()
+def BuildFundMapping(OutputPath=MAPPING_PATH, StatePath=STATE_PATH, MaxWorkers=8, Full=False):
+
+    State = {}
+    if not Full and os.path.isfile(StatePath):
+        with open(StatePath, "r", encoding="utf-8") as file:
+            State = json.load(file)
+
+    # Fetch all AMC and fund list concurrently
+    amc = fund_factsheet_amc() or []
+    Log("info", "Found {} AMC".format(len(amc)))
+    FundList = RunConcurrent(fund_factsheet_fund, [row["unique_id"] for row in amc], MaxWorkers)
+
+    NewState = {}
+    Rebuilt = 0
+    for row, funds in zip(amc, FundList):
+        if funds is None and row["unique_id"] in State:
+            # keep last result when AMC can't be fetched
+            NewState[row["unique_id"]] = State[row["unique_id"]]
+            continue
+
+        funds = funds or []
+        FundHash = HashFundList(funds)
+        Previous = State.get(row["unique_id"])
+        if Previous and Previous["hash"] == FundHash:
+            NewState[row["unique_id"]] = Previous
+            continue
+
+        Log("info", "Rebuilding mapping : {}".format(row.get("name_en") or row["unique_id"]))
+        Mapping, Stats, Complete = BuildAMCMapping(row, funds, MaxWorkers)
+        NewState[row["unique_id"]] = {"hash" : FundHash if Complete else None, "mapping" : Mapping, "statistics" : Stats}
+        Rebuilt += 1
+
+    # Merge mapping and statistics of every AMC
+    Mapping = {}
+    Stats = {"total_amcs" : len(amc), "total_funds" : 0, "rmf_funds" : 0, "active_funds" : 0, "cancelled_funds" : 0, "mapped_symbols" : 0,
+             "class_symbols" : 0, "unmapped_funds" : 0}
+    for AMCState in NewState.values():
+        Mapping.update(AMCState["mapping"])
+        for Key, Value in AMCState["statistics"].items():
+            Stats[Key] = Stats.get(Key, 0) + Value
+
+    MappingData = {
+        "generated_at" : datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "version" : "1.0",
+        "statistics" : Stats,
+        "mapping" : Mapping,
+    }
+
+    os.makedirs(os.path.dirname(OutputPath) or ".", exist_ok=True)
+    with open(OutputPath, "w", encoding="utf-8") as file:
+        json.dump(MappingData, file, ensure_ascii=False, indent=2)
+    with open(StatePath, "w", encoding="utf-8") as file:
+        json.dump(NewState, file, ensure_ascii=False)
+
+    Log("info", "Mapping saved to [{}] : {} symbols ({} of {} AMC rebuilt)".format(OutputPath, len(Mapping), Rebuilt, len(amc)))
+    return MappingData
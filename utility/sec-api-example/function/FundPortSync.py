@@ -0,0 +1,104 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, ReadTable, LoadManifest, SaveManifest
+from function.FundSchema import HOLDING_TABLE, ToHoldingTable, PortfolioPeriods
+from function.FundUniverse import MutualFundUniverse
+import function.FundFactsheet as FundFactsheet
+
+# Declare variable
+TABLE_NAME = "fund/{}"
+
+# section : (function, period frequency, table)
+SECTIONS = {
+    "port" : (FundFactsheet.fund_factsheet_FundPort, "ME", TABLE_NAME.format("port")),
+    "full_port" : (FundFactsheet.fund_factsheet_FundFullPort, "QE", HOLDING_TABLE),
+    "top5" : (FundFactsheet.fund_factsheet_FundTop5, "ME", TABLE_NAME.format("top5")),
+}
+
+# field of fund start date in fund table (period before fund start is not checked)
+START_FIELDS = ["regis_date", "inception_date"]
+
+# period not published within this day is checked again next run (published period never change)
+MISS_RETRY_DAYS = 120
+
+def FetchSection(Section, proj_id, period):
+    return SECTIONS[Section][0](proj_id, period)
+
+def PeriodKey(proj_id, period):
+    return "{}|{}".format(proj_id, period)
+
+## First period to check of each fund (Start or fund start date, whichever is later)
+def FundStart(Fund, Start):
+    Start = pd.Timestamp(Start)
+    Field = next((Field for Field in START_FIELDS if Field in Fund), None)
+    if Field is None:
+        return {proj_id : Start for proj_id in Fund["proj_id"]}
+    FundStartDate = pd.to_datetime(Fund[Field], errors="coerce").fillna(Start).clip(lower=Start)
+    return dict(zip(Fund["proj_id"], FundStartDate))
+
+## (proj_id, period) of each section not stored yet
+def PendingPeriods(ProjIds, Starts, End=None, Sections=None, Full=False):
+    Pending = {}
+    for Section in (Sections or SECTIONS):
+        Done = LoadManifest("fund_{}".format(Section))
+        Missing = set() if Full else LoadManifest("fund_{}_miss".format(Section))
+        Periods = PortfolioPeriods(min(Starts.values()), End, Freq=SECTIONS[Section][1]) if Starts else []
+        Pending[Section] = [(proj_id, period) for proj_id in ProjIds for period in Periods
+                            if period >= Starts[proj_id].strftime("%Y%m%d")
+                            and PeriodKey(proj_id, period) not in Done and PeriodKey(proj_id, period) not in Missing]
+    return Pending
+
+## Sync portfolio of every mutual fund : fetch only period not stored yet (concurrent)
+@Traced()
+def SyncFundPort(Start="2020-01-01", End=None, ProjIds=None, Sections=None, MaxWorkers=8, Full=False):
+
+    Fund = MutualFundUniverse(MaxWorkers=MaxWorkers)
+    if ProjIds is not None:
+        Fund = Fund[Fund["proj_id"].isin(ProjIds)]
+    Starts = FundStart(Fund, Start)
+    Pending = PendingPeriods(list(Starts), Starts, End, Sections, Full)
+
+    Tasks = [(Section, proj_id, period) for Section, Pairs in Pending.items() for proj_id, period in Pairs]
+    Log("info", "Fund portfolio : {} (section, fund, period) to fetch".format(len(Tasks)))
+
+    Frames = {Section : [] for Section in Pending}
+    Found = {Section : set() for Section in Pending}
+    Missed = {Section : set() for Section in Pending}
+    RetryFrom = (datetime.now() - pd.Timedelta(days=MISS_RETRY_DAYS)).strftime("%Y%m%d")
+    for (Section, proj_id, period), resp in zip(Tasks, RunConcurrent(FetchSection, Tasks, MaxWorkers, "backfill")):
+        if resp:
+            Frames[Section].append(FlattenResponse(resp, proj_id=proj_id, period=period))
+            Found[Section].add(PeriodKey(proj_id, period))
+        elif resp is not None and period < RetryFrom:
+            # API answered without data ([]), failed call (None) is fetched again next run
+            Missed[Section].add(PeriodKey(proj_id, period))
+
+    # append only, stored period is never rewritten
+    for Section, Frame in Frames.items():
+        if Frame:
+            df = pd.concat(Frame, ignore_index=True)
+            if SECTIONS[Section][2] == HOLDING_TABLE:
+                AppendTable(ToHoldingTable(df, "MF"), HOLDING_TABLE, PartitionCols=["fund_type"])
+            else:
+                AppendTable(df, SECTIONS[Section][2])
+        SaveManifest("fund_{}".format(Section), LoadManifest("fund_{}".format(Section)) | Found[Section])
+        SaveManifest("fund_{}_miss".format(Section), (set() if Full else LoadManifest("fund_{}_miss".format(Section))) | Missed[Section])
+        Log("info", "Fund portfolio [{}] : {} new period, {} not published".format(Section, len(Found[Section]), len(Missed[Section])))
+
+    return {Section : len(Keys) for Section, Keys in Found.items()}
+
+## Available period of each fund from manifest (no API call)
+def AvailablePeriods(Section="full_port", ProjIds=None):
+    Pairs = [Key.split("|", 1) for Key in LoadManifest("fund_{}".format(Section))]
+    df = pd.DataFrame(Pairs, columns=["proj_id", "period"])
+    if ProjIds is not None:
+        df = df[df["proj_id"].isin(ProjIds)]
+    return df.groupby("proj_id")["period"].apply(sorted).to_dict()
+
+## Stored portfolio of section (optionally filter fund / period)
+def ReadFundPort(Section="full_port", ProjIds=None, Periods=None):
+    Filters = [("fund_type", "=", "MF")] if SECTIONS[Section][2] == HOLDING_TABLE else []
+    if ProjIds is not None:
+        Filters.append(("proj_id", "in", list(ProjIds)))
+    if Periods is not None:
+        Filters.append(("period", "in", list(Periods)))
+    return ReadTable(SECTIONS[Section][2], Filters=Filters or None)
@@ -0,0 +1,49 @@
+from function.AllFunction import *
+
+# Shared table schema of mutual fund (MF) and provident fund (PVD)
+## data/fund/fund    : one row per fund, partition by fund_type
+## data/fund/holding : one row per holding of (fund, period), partition by fund_type
+
+FUND_TABLE = "fund/fund"
+HOLDING_TABLE = "fund/holding"
+
+FUND_COLUMNS = ["fund_type", "amc_id", "proj_id", "fund_name_th", "fund_name_en", "fund_abbr_name", "fund_status"]
+HOLDING_COLUMNS = ["fund_type", "proj_id", "period", "holding_name", "asset_type", "holding_ratio", "holding_value"]
+NUMBER_COLUMNS = ["holding_ratio", "holding_value"]
+
+# API field -> shared column
+FUND_RENAME = {
+    "MF" : {"unique_id" : "amc_id", "proj_name_th" : "fund_name_th", "proj_name_en" : "fund_name_en", "proj_abbr_name" : "fund_abbr_name"},
+    "PVD" : {"unique_id" : "amc_id", "fund_id" : "proj_id", "proj_name_th" : "fund_name_th", "proj_name_en" : "fund_name_en", "proj_abbr_name" : "fund_abbr_name"},
+}
+HOLDING_RENAME = {
+    "MF" : {"secur_name" : "holding_name", "asset_name" : "holding_name", "asset_type_code" : "asset_type", "percent_nav" : "holding_ratio", "asset_ratio" : "holding_ratio", "market_value" : "holding_value"},
+    "PVD" : {"secur_name" : "holding_name", "asset_name" : "holding_name", "asset_type_code" : "asset_type", "percent_nav" : "holding_ratio", "asset_ratio" : "holding_ratio", "market_value" : "holding_value"},
+}
+
+## Rename API column to shared column (extra column is kept after shared column)
+def ToSharedTable(df, FundType, Columns, Rename):
+    if df is None or df.empty:
+        return pd.DataFrame(columns=Columns)
+    df = df.copy()
+    for Key, Value in Rename[FundType].items():
+        if Key in df and Value not in df:
+            df = df.rename(columns={Key : Value})
+    df["fund_type"] = FundType
+    for Column in Columns:
+        if Column not in df:
+            df[Column] = None
+        if Column in NUMBER_COLUMNS:
+            df[Column] = pd.to_numeric(df[Column], errors="coerce").astype("float64")
+    return df[Columns + [Column for Column in df.columns if Column not in Columns]]
+
+def ToFundTable(df, FundType):
+    return ToSharedTable(df, FundType, FUND_COLUMNS, FUND_RENAME)
+
+def ToHoldingTable(df, FundType):
+    return ToSharedTable(df, FundType, HOLDING_COLUMNS, HOLDING_RENAME)
+
+## Candidate portfolio period (YYYYMMDD, end of quarter / month) between Start and End
+def PortfolioPeriods(Start, End=None, Freq="QE"):
+    End = End or datetime.now()
+    return [Date.strftime("%Y%m%d") for Date in pd.date_range(pd.Timestamp(Start), pd.Timestamp(End), freq=Freq)]
@@ -0,0 +1,28 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, ReadTable, DropPartition
+from function.FundSchema import FUND_TABLE, ToFundTable
+from function.FundFactsheet import fund_factsheet_amc, fund_factsheet_fund
+
+## Crawl mutual fund universe (every AMC concurrently) to shared fund table
+@Traced()
+def CrawlMutualFund(MaxWorkers=8):
+
+    amc = fund_factsheet_amc() or []
+    Frames = [FlattenResponse(resp) for resp in RunConcurrent(fund_factsheet_fund, [row["unique_id"] for row in amc], MaxWorkers) if resp]
+    Fund = pd.concat(Frames, ignore_index=True) if Frames else pd.DataFrame()
+    if Fund.empty:
+        return Fund
+
+    DropPartition(FUND_TABLE, "fund_type", "MF")
+    AppendTable(ToFundTable(Fund, "MF"), FUND_TABLE, PartitionCols=["fund_type"])
+    Log("info", "Mutual fund universe : {} AMC, {} fund".format(len(amc), len(Fund)))
+    return ReadMutualFund()
+
+def ReadMutualFund():
+    return ReadTable(FUND_TABLE, Filters=[("fund_type", "=", "MF")])
+
+## Mutual fund universe from shared fund table (crawl when not stored yet or Refresh=True)
+@Traced()
+def MutualFundUniverse(Refresh=False, MaxWorkers=8):
+    Fund = pd.DataFrame() if Refresh else ReadMutualFund()
+    return CrawlMutualFund(MaxWorkers) if Fund.empty else Fund
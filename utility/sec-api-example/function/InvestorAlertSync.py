@@ -0,0 +1,86 @@
+from function.AllFunction import *
+import function.LicenseCheck as LicenseCheck
+import hashlib
+
+# Declare variable
+ALERT_PATH = "data/investoralert"
+CASE_FIELD = "case_id"
+
+def HashAlert(Record):
+    return hashlib.sha1(json.dumps(Record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def LoadAlertState():
+    Path = os.path.join(ALERT_PATH, "state.json")
+    if os.path.isfile(Path):
+        with open(Path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    return {}
+
+## Sync investor alert : call alertaction only for new / changed case, write change feed
+@Traced()
+def SyncInvestorAlert(MaxWorkers=8):
+
+    resp = LicenseCheck.licensecheck_lcs_alertdetail()
+    if resp is None:
+        Log("warning", "Cannot sync investor alert : alert detail is not available")
+        return []
+
+    State = LoadAlertState()
+    Alerts = {"{}".format(Record.get(CASE_FIELD)) : Record for Record in resp if isinstance(Record, dict)}
+
+    # diff by case_id and content hash
+    Added = [case_id for case_id in Alerts if case_id not in State]
+    Modified = [case_id for case_id in Alerts if case_id in State and State[case_id]["hash"] != HashAlert(Alerts[case_id])]
+    Removed = [case_id for case_id in State if case_id not in Alerts]
+    Log("info", "Investor alert : {} case ({} added, {} modified, {} removed)".format(len(Alerts), len(Added), len(Modified), len(Removed)))
+
+    Fetch = Added + Modified
+    Actions = dict(zip(Fetch, RunConcurrent(LicenseCheck.licensecheck_lcs_alertaction, Fetch, MaxWorkers)))
+
+    # case with failed action call (None) is not recorded, it is detected again as added / modified next run
+    Failed = {case_id for case_id in Fetch if Actions[case_id] is None}
+    if Failed:
+        Log("warning", "Investor alert : cannot fetch action of {} case, retry next run".format(len(Failed)))
+    Added = [case_id for case_id in Added if case_id not in Failed]
+    Modified = [case_id for case_id in Modified if case_id not in Failed]
+    Fetch = Added + Modified
+
+    Now = datetime.now().isoformat()
+    Events = []
+    for Event, CaseIds in (("added", Added), ("modified", Modified), ("removed", Removed)):
+        for case_id in CaseIds:
+            Change = {"event" : Event, "case_id" : case_id, "detected_at" : Now}
+            if Event == "removed":
+                Change["alert"] = State[case_id].get("alert")
+            else:
+                Change["alert"] = Alerts[case_id]
+                Change["actions"] = Actions.get(case_id)
+                if Event == "modified":
+                    Old = State[case_id].get("alert") or {}
+                    Change["fields"] = sorted(Key for Key in set(Old) | set(Alerts[case_id]) if Old.get(Key) != Alerts[case_id].get(Key))
+            Events.append(Change)
+
+    # keep last state (action of unchanged case is kept from last run)
+    for case_id in Removed:
+        del State[case_id]
+    for case_id in Fetch:
+        State[case_id] = {"hash" : HashAlert(Alerts[case_id]), "alert" : Alerts[case_id], "actions" : Actions.get(case_id)}
+
+    os.makedirs(ALERT_PATH, exist_ok=True)
+    with open(os.path.join(ALERT_PATH, "state.json"), "w", encoding="utf-8") as file:
+        json.dump(State, file, ensure_ascii=False)
+    with open(os.path.join(ALERT_PATH, "changes.jsonl"), "a", encoding="utf-8") as file:
+        for Change in Events:
+            file.write(json.dumps(Change, ensure_ascii=False) + "\n")
+
+    return Events
+
+## Read change feed (optionally only change after Since)
+def ReadAlertChanges(Since=None):
+    Path = os.path.join(ALERT_PATH, "changes.jsonl")
+    if not os.path.isfile(Path):
+        return []
+    with open(Path, "r", encoding="utf-8") as file:
+        Events = [json.loads(Line) for Line in file if Line.strip()]
+    Since = Since.isoformat() if isinstance(Since, datetime) else Since
+    return [Change for Change in Events if Since is None or Change["detected_at"] > Since]
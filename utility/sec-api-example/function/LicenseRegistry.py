@@ -0,0 +1,138 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, WriteTable, UpsertTable, ReadTable
+from function.SearchIndex import NameIndex, Indexes, GetIndex, SearchLocal
+import function.LicenseCheck as LicenseCheck
+import hashlib
+
+# Declare variable
+TABLE_NAME = "license/{}"
+STATE_PATH = "data/license/state.json"
+MAX_AGE_DAYS = 30
+
+# field of person id in company personnel response
+PERSON_ID_FIELD = "unique_id"
+
+COMPANY_SECTIONS = {
+    "company_license" : LicenseCheck.licensecheck_lcs_company_license,
+    "company_business_act" : LicenseCheck.licensecheck_lcs_company_business_act,
+    "company_personnel" : LicenseCheck.licensecheck_lcs_company_personnel,
+}
+PERSON_SECTIONS = {
+    "person_license" : LicenseCheck.licensecheck_lcs_person_license,
+    "person_workinfo" : LicenseCheck.licensecheck_lcs_person_workinfo,
+}
+
+def HashRecord(Record):
+    return hashlib.sha1(json.dumps(Record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def FetchSections(Sections, unique_id):
+    return {Name : Function(unique_id) for Name, Function in Sections.items()}
+
+## Fetch section of every id concurrently and replace rows of those id in table
+## id with any failed section call (None) keep its old rows and is not in Synced (sync again next run)
+def SyncSections(Sections, Ids, KeyName, MaxWorkers):
+    Frames = {Name : [] for Name in Sections}
+    Synced = []
+    for unique_id, Result in zip(Ids, RunConcurrent(FetchSections, [(Sections, unique_id) for unique_id in Ids], MaxWorkers)):
+        if Result is None or any(resp is None for resp in Result.values()):
+            continue
+        Synced.append(unique_id)
+        for Name, resp in Result.items():
+            Frames[Name].append(FlattenResponse(resp, **{KeyName : unique_id}))
+    if len(Synced) < len(Ids):
+        Log("warning", "License registry [{}] : {} of {} id failed, retry next run".format(KeyName, len(Ids) - len(Synced), len(Ids)))
+
+    for Name, Frame in Frames.items():
+        Frame = [df for df in Frame if not df.empty]
+        UpsertTable(pd.concat(Frame, ignore_index=True) if Frame else pd.DataFrame(), TABLE_NAME.format(Name), KeyName, Synced)
+    return Frames, Synced
+
+## Mirror license registry (company detail only for new / changed / old company)
+@Traced()
+def SyncLicenseRegistry(MaxWorkers=8, Full=False):
+
+    State = {}
+    if not Full and os.path.isfile(STATE_PATH):
+        with open(STATE_PATH, "r", encoding="utf-8") as file:
+            State = json.load(file)
+
+    Company = LicenseCheck.licensecheck_lcs_company(None) or []
+    Now = datetime.now()
+    Changed = []
+    for Record in Company:
+        unique_id = "{}".format(Record.get("unique_id"))
+        Previous = State.get(unique_id)
+        if Full or not Previous or Previous["hash"] != HashRecord(Record) or \
+                (Now - datetime.fromisoformat(Previous["synced_at"])).days >= MAX_AGE_DAYS:
+            Changed.append(unique_id)
+    Log("info", "License registry : {} company, {} to sync".format(len(Company), len(Changed)))
+
+    WriteTable(FlattenResponse(Company), TABLE_NAME.format("company"))
+    Frames, Synced = SyncSections(COMPANY_SECTIONS, Changed, "company_id", MaxWorkers)
+
+    # person under changed company (new person and person of changed company)
+    Personnel = [df for df in Frames["company_personnel"] if not df.empty and PERSON_ID_FIELD in df]
+    Personnel = pd.concat(Personnel, ignore_index=True) if Personnel else pd.DataFrame()
+    Synced = set(Synced)
+    if not Personnel.empty:
+        Personnel[PERSON_ID_FIELD] = Personnel[PERSON_ID_FIELD].astype(str)
+        Person = Personnel.drop_duplicates(PERSON_ID_FIELD, keep="last")
+        UpsertTable(Person.drop(columns=["company_id"]), TABLE_NAME.format("person"), PERSON_ID_FIELD, Person[PERSON_ID_FIELD])
+        _, PersonSynced = SyncSections(PERSON_SECTIONS, list(Person[PERSON_ID_FIELD]), "person_id", MaxWorkers)
+
+        # company with any person not synced is synced again next run
+        Failed = Personnel[~Personnel[PERSON_ID_FIELD].isin(PersonSynced)]
+        Synced -= set(Failed["company_id"].astype(str))
+
+    # state move forward only for company with every section (and every person) synced
+    for Record in Company:
+        unique_id = "{}".format(Record.get("unique_id"))
+        if unique_id in Synced:
+            State[unique_id] = {"hash" : HashRecord(Record), "synced_at" : Now.isoformat()}
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as file:
+        json.dump(State, file)
+
+    BuildRegistryIndex()
+
+## Company / person name index from mirrored table (also used by licensecheck_lcs_company / person)
+def BuildRegistryIndex():
+    for Kind in ("company", "person"):
+        Index = NameIndex(Kind)
+        Table = ReadTable(TABLE_NAME.format(Kind))
+        if not Table.empty:
+            Index.AddMany(Table.astype(object).where(Table.notna(), None).to_dict("records"))
+            Index.Complete = True
+        Index.Save()
+        Indexes[Kind] = Index
+        Log("info", "License registry index [{}] : {} records".format(Kind, len(Index.Records)))
+
+## Remote search of one name (wrapper also keep result in local index)
+def SearchRemote(Name, Kind):
+    if Kind == "person":
+        return LicenseCheck.licensecheck_lcs_person(Name, "")
+    return LicenseCheck.licensecheck_lcs_company(Name)
+
+## Screen batch of name (local index first, call API only for name not found when Remote=True)
+## source : local (exact / prefix match) , remote , fuzzy (near-miss name in local index, used only when remote found nothing)
+def ScreenNames(Names, Kind="person", Remote=True, MaxWorkers=8):
+
+    Rows = []
+    Missing = []
+    for Name in Names:
+        Found = SearchLocal(Kind, Name)
+        if Found:
+            Rows += [{"query" : Name, "source" : "local", **Record} for Record in Found]
+        else:
+            Missing.append(Name)
+
+    Result = RunConcurrent(SearchRemote, [(Name, Kind) for Name in Missing], MaxWorkers) if Remote else [None] * len(Missing)
+    for Name, Found in zip(Missing, Result):
+        Found = [Record for Record in (Found or []) if isinstance(Record, dict)]
+        if Found:
+            Rows += [{"query" : Name, "source" : "remote", **Record} for Record in Found]
+            continue
+        Near = SearchLocal(Kind, Name, Fuzzy=True) or []
+        Rows += [{"query" : Name, "source" : "fuzzy", **Record} for Record in Near] or [{"query" : Name, "source" : "not found"}]
+
+    return pd.DataFrame(Rows)
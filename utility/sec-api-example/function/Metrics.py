@@ -0,0 +1,159 @@
+from function.Settings import Setting
+import threading
+import atexit
+import os
+
+# Metrics of API call in Prometheus text format (counter / histogram by label, gauge from collector)
+METRICS_FILE = Setting.Get("MetricsFile", "")
+METRICS_PORT = int(Setting.Get("MetricsPort", "0"))
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+METRICS = {
+    "sec_api_requests_total" : ("counter", "API call by endpoint template and status"),
+    "sec_api_request_duration_seconds" : ("histogram", "API call latency by endpoint template"),
+    "sec_api_response_bytes_total" : ("counter", "Response body byte by endpoint template"),
+    "sec_api_rate_limit_wait_seconds" : ("histogram", "Time waiting for quota by priority class"),
+    "sec_api_concurrency_wait_seconds" : ("histogram", "Time waiting for in-flight slot by API product"),
+    "sec_api_cache_total" : ("counter", "GET served by HTTP cache (fresh / not_modified) or downloaded (miss)"),
+    "sec_api_cache_saved_bytes_total" : ("counter", "Byte not downloaded because of HTTP cache"),
+    "sec_api_retries_total" : ("counter", "Extra call by endpoint template and reason"),
+    "sec_api_circuit_rejected_total" : ("counter", "Call rejected while circuit is open"),
+    "sec_api_circuit_state" : ("gauge", "Circuit state by API product (0 closed, 1 half open, 2 open)"),
+    "sec_api_concurrency_limit" : ("gauge", "Current in-flight limit by API product"),
+    "sec_api_in_flight" : ("gauge", "Call in flight by API product"),
+    "sec_api_quota_tokens" : ("gauge", "Call left in quota bucket"),
+}
+
+Counters = {}
+Histograms = {}
+Collectors = []
+MetricsLock = threading.Lock()
+
+def LabelKey(Labels):
+    return tuple(sorted((Key, "{}".format(Value)) for Key, Value in Labels.items()))
+
+def Inc(Name, Value=1, **Labels):
+    with MetricsLock:
+        Key = (Name, LabelKey(Labels))
+        Counters[Key] = Counters.get(Key, 0) + Value
+
+def Observe(Name, Value, **Labels):
+    with MetricsLock:
+        Key = (Name, LabelKey(Labels))
+        if Key not in Histograms:
+            Histograms[Key] = {"buckets" : [0] * len(LATENCY_BUCKETS), "sum" : 0.0, "count" : 0}
+        Histogram = Histograms[Key]
+        for idx, Bound in enumerate(LATENCY_BUCKETS):
+            if Value <= Bound:
+                Histogram["buckets"][idx] += 1
+                break
+        Histogram["sum"] += Value
+        Histogram["count"] += 1
+
+## Collector : function return list of (name, labels, value) (read current state when metrics is exported)
+def RegisterCollector(Function):
+    Collectors.append(Function)
+
+def FormatLabels(Labels, **Extra):
+    Labels = list(Labels) + sorted(Extra.items())
+    if not Labels:
+        return ""
+    Escape = lambda Value: "{}".format(Value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join('{}="{}"'.format(Key, Escape(Value)) for Key, Value in Labels) + "}"
+
+## Prometheus text exposition of every metrics
+def RenderMetrics():
+    Samples = {Name : [] for Name in METRICS}
+    with MetricsLock:
+        for (Name, Labels), Value in sorted(Counters.items()):
+            Samples.setdefault(Name, []).append("{}{} {}".format(Name, FormatLabels(Labels), Value))
+        for (Name, Labels), Histogram in sorted(Histograms.items(), key=lambda Item: Item[0]):
+            Cumulative = 0
+            for Bound, Count in zip(LATENCY_BUCKETS, Histogram["buckets"]):
+                Cumulative += Count
+                Samples.setdefault(Name, []).append("{}_bucket{} {}".format(Name, FormatLabels(Labels, le=Bound), Cumulative))
+            Samples[Name].append("{}_bucket{} {}".format(Name, FormatLabels(Labels, le="+Inf"), Histogram["count"]))
+            Samples[Name].append("{}_sum{} {}".format(Name, FormatLabels(Labels), round(Histogram["sum"], 6)))
+            Samples[Name].append("{}_count{} {}".format(Name, FormatLabels(Labels), Histogram["count"]))
+    for Collector in Collectors:
+        for Name, Labels, Value in Collector():
+            Samples.setdefault(Name, []).append("{}{} {}".format(Name, FormatLabels(LabelKey(Labels)), Value))
+
+    Lines = []
+    for Name, Rows in Samples.items():
+        if not Rows:
+            continue
+        Type, Help = METRICS.get(Name, ("untyped", Name))
+        Lines += ["# HELP {} {}".format(Name, Help), "# TYPE {} {}".format(Name, Type)] + Rows
+    return "\n".join(Lines) + "\n"
+
+def WriteMetrics(Path=None):
+    Path = Path or METRICS_FILE
+    if Path:
+        os.makedirs(os.path.dirname(Path) or ".", exist_ok=True)
+        with open(Path, "w", encoding="utf-8") as file:
+            file.write(RenderMetrics())
+    return Path
+
+## Local endpoint for Prometheus scrape : http://127.0.0.1:<Port>/metrics
+def StartMetricsServer(Port=None):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            Body = RenderMetrics().encode("utf-8") if self.path.startswith("/metrics") else b""
+            self.send_response(200 if Body else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(Body)))
+            self.end_headers()
+            self.wfile.write(Body)
+
+        def log_message(self, *Args):
+            return
+
+    Server = ThreadingHTTPServer(("127.0.0.1", Port or METRICS_PORT), Handler)
+    threading.Thread(target=Server.serve_forever, name="metrics-server", daemon=True).start()
+    return Server
+
+## Summary by endpoint template : call, error, mean / p95 latency (from histogram bucket), byte
+def MetricsSummary():
+    with MetricsLock:
+        Endpoints = {}
+        for (Name, Labels), Value in Counters.items():
+            Label = dict(Labels)
+            if Name == "sec_api_requests_total":
+                Row = Endpoints.setdefault(Label["endpoint"], {"call" : 0, "error" : 0, "bytes" : 0})
+                Row["call"] += Value
+                Row["error"] += 0 if Label["status"] in ("200", "304") else Value
+            elif Name == "sec_api_response_bytes_total":
+                Endpoints.setdefault(Label["endpoint"], {"call" : 0, "error" : 0, "bytes" : 0})["bytes"] += Value
+        for (Name, Labels), Histogram in Histograms.items():
+            if Name == "sec_api_request_duration_seconds" and Histogram["count"]:
+                Row = Endpoints.setdefault(dict(Labels)["endpoint"], {"call" : 0, "error" : 0, "bytes" : 0})
+                Row["mean_ms"] = round(Histogram["sum"] / Histogram["count"] * 1000, 1)
+                Cumulative, Target = 0, Histogram["count"] * 0.95
+                Row["p95_le_ms"] = float("inf")
+                for Bound, Count in zip(LATENCY_BUCKETS, Histogram["buckets"]):
+                    Cumulative += Count
+                    if Cumulative >= Target:
+                        Row["p95_le_ms"] = Bound * 1000
+                        break
+        Wait = {dict(Labels)["priority"] : round(Histogram["sum"], 2) for (Name, Labels), Histogram in Histograms.items()
+                if Name == "sec_api_rate_limit_wait_seconds"}
+        Cache = {dict(Labels)["result"] : Value for (Name, Labels), Value in Counters.items() if Name == "sec_api_cache_total"}
+    return {"endpoint" : Endpoints, "rate_limit_wait_seconds" : Wait, "cache" : Cache}
+
+def PrintMetricsSummary():
+    Summary = MetricsSummary()
+    print("{:<60} {:>7} {:>6} {:>9} {:>9} {:>12}".format("endpoint", "call", "error", "mean ms", "p95 ms", "byte"))
+    for Endpoint, Row in sorted(Summary["endpoint"].items(), key=lambda Item: -Item[1]["call"]):
+        print("{:<60} {:>7} {:>6} {:>9} {:>9} {:>12,}".format(Endpoint, Row["call"], Row["error"], Row.get("mean_ms", "-"),
+                                                               "-" if "p95_le_ms" not in Row else "<= {:g}".format(Row["p95_le_ms"]), Row["bytes"]))
+    print("rate limit wait (second) : {}".format(Summary["rate_limit_wait_seconds"] or "-"))
+    print("cache : {}".format(Summary["cache"] or "-"))
+    return Summary
+
+if METRICS_PORT:
+    StartMetricsServer()
+if METRICS_FILE:
+    atexit.register(WriteMetrics)
@@ -0,0 +1,527 @@
+from function.Settings import Setting
+from urllib.parse import urlparse, unquote
+from pathlib import Path
+import threading
+import hashlib
+import random
+import json
+import math
+import time
+import glob
+import re
+import os
+
+# Local mock of SEC API for offline load / integration test (every path of endpoint registry, see function/Endpoints.py)
+#   python -m function.MockServer           -> http://127.0.0.1:<MockPort>, set Url=http://127.0.0.1:<MockPort> for the client
+# payload : recorded response (HTTP cache, MockData folder) > seeded from data/rmf-funds/*.json > generated record
+# fault injection is deterministic : every call draw from RNG of (MockSeed, method, path, n-th call of path)
+MOCK_PORT = int(Setting.Get("MockPort", "8099"))
+MOCK_LATENCY_MS = float(Setting.Get("MockLatency", "0"))
+MOCK_JITTER_MS = float(Setting.Get("MockJitter", "0"))
+MOCK_SLOW_RATE = float(Setting.Get("MockSlowRate", "0"))
+MOCK_SLOW_MS = float(Setting.Get("MockSlowLatency", "3000"))
+MOCK_ERROR_RATE = float(Setting.Get("MockErrorRate", "0"))
+MOCK_429_RATE = float(Setting.Get("Mock429Rate", "0"))
+MOCK_RATE_LIMIT = int(Setting.Get("MockRateLimit", "0"))
+MOCK_RATE_PERIOD = float(Setting.Get("MockRatePeriod", "300"))
+MOCK_SEED = int(Setting.Get("MockSeed", "0"))
+MOCK_AUTH = Setting.Get("MockAuth", "1") != "0"
+MOCK_DATA_PATH = Setting.Get("MockData", "data/mock")
+MOCK_RMF_PATH = Setting.Get("MockRmfFunds", str(Path(__file__).resolve().parents[3] / "data" / "rmf-funds"))
+RECORDED_PATH = "data/cache/http"
+ERROR_STATUS = [500, 502, 503, 504]
+KEY_HEADER = "Ocp-Apim-Subscription-Key"
+
+## Fault setting of mock server (change while running : POST /__mock/config {"error_rate" : 0.2})
+def DefaultFaults():
+    return {"latency_ms" : MOCK_LATENCY_MS, "jitter_ms" : MOCK_JITTER_MS, "slow_rate" : MOCK_SLOW_RATE, "slow_ms" : MOCK_SLOW_MS,
+            "error_rate" : MOCK_ERROR_RATE, "rate_429" : MOCK_429_RATE, "rate_limit" : MOCK_RATE_LIMIT,
+            "rate_period" : MOCK_RATE_PERIOD, "seed" : MOCK_SEED, "auth" : MOCK_AUTH}
+
+## Route of every endpoint : (method, regex of full path, endpoint name)
+def BuildRoutes():
+    from function.Endpoints import ENDPOINTS, PRODUCTS
+
+    Routes = []
+    for Spec in ENDPOINTS:
+        Paths = [(Spec.Method, Spec.Path)] + ([("GET", Spec.GetPath)] if Spec.GetPath is not None else [])
+        for Method, Template in Paths:
+            Pattern = re.escape(PRODUCTS[Spec.Product][0] + Template)
+            Pattern = re.sub(r"/\\\{(\w+)\\\}", lambda Match: "(?:/(?P<{0}>[^/]+)){1}".format(
+                Match.group(1), "?" if Match.group(1) in Spec.Defaults else ""), Pattern)
+            # fixed path is matched before path with parameter (/fund/amc before /fund/{proj_id})
+            Routes.append((Method, re.compile("^{}/?$".format(Pattern)), Spec.Name, Template.count("{")))
+    Routes.sort(key=lambda Route: Route[3])
+    return [Route[:3] for Route in Routes]
+
+## Recorded response : HTTP cache of client and MockData folder ({"url" or "path", "method", "body"}), key (method, path)
+def LoadRecorded(Folders=(RECORDED_PATH, MOCK_DATA_PATH)):
+    Recorded = {}
+    for Folder in Folders:
+        for FilePath in sorted(glob.glob(os.path.join(Folder, "*.json"))):
+            try:
+                with open(FilePath, "r", encoding="utf-8") as file:
+                    Item = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(Item, dict) or "body" not in Item or not (Item.get("url") or Item.get("path")):
+                continue
+            Key = (Item.get("method", "GET").upper(), unquote(urlparse(Item.get("path") or Item["url"]).path).rstrip("/"))
+            if Item.get("request") is not None:
+                Key += (json.dumps(Item["request"], sort_keys=True, ensure_ascii=False),)
+            Recorded[Key] = Item["body"]
+    return Recorded
+
+## AMC id of mock (11 character, start with C0 like SEC unique_id)
+def AmcId(Index):
+    return "C{:010d}".format(Index + 1)
+
+## Fund / AMC table from data/rmf-funds/*.json (fund_id is proj_id, symbol is proj_abbr_name)
+def LoadSeed(Folder=None):
+    Funds, Amcs = {}, {}
+    for FilePath in sorted(glob.glob(os.path.join(Folder or MOCK_RMF_PATH, "*.json"))):
+        try:
+            with open(FilePath, "r", encoding="utf-8") as file:
+                Fund = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(Fund, dict) or not Fund.get("fund_id"):
+            continue
+        AmcName = Fund.get("amc") or "Unknown"
+        if AmcName not in Amcs:
+            Amcs[AmcName] = {"unique_id" : AmcId(len(Amcs)), "name_th" : AmcName, "name_en" : AmcName,
+                             "last_upd_date" : Fund.get("data_fetched_at")}
+        Fund["amc_id"] = Amcs[AmcName]["unique_id"]
+        Fund["metadata"] = Fund.get("metadata") or {}
+        Funds[Fund["fund_id"]] = Fund
+    Symbols = {(Fund.get("symbol") or "").upper() : Fund for Fund in Funds.values()}
+    return {"funds" : Funds, "symbols" : Symbols, "amcs" : list(Amcs.values())}
+
+def FundInfo(Fund):
+    return {"proj_id" : Fund["fund_id"], "unique_id" : Fund["amc_id"], "regis_id" : Fund["fund_id"], "regis_date" : "-",
+            "cancel_date" : "-", "proj_name_th" : Fund.get("fund_name"), "proj_name_en" : Fund.get("fund_name"),
+            "proj_abbr_name" : Fund.get("symbol"), "fund_status" : "RG", "permit_us_investment" : "N",
+            "last_upd_date" : Fund.get("data_fetched_at")}
+
+## API period name of performance field in rmf-funds
+PERIODS = {"ytd" : "year to date", "3m" : "3 months", "6m" : "6 months", "1y" : "1 year", "3y" : "3 years", "5y" : "5 years",
+           "10y" : "10 years", "since_inception" : "inception date"}
+
+def PerformanceRows(Fund):
+    Rows = []
+    for Key, Period in PERIODS.items():
+        if (Fund.get("performance") or {}).get(Key) is not None:
+            Rows.append({"performance_type_desc" : "ผลตอบแทนกองทุนรวม", "reference_period" : Period,
+                         "performance_val" : "{}".format(Fund["performance"][Key])})
+        if ((Fund.get("benchmark") or {}).get("returns") or {}).get(Key) is not None:
+            Rows.append({"performance_type_desc" : "ผลตอบแทนตัวชี้วัด", "reference_period" : Period,
+                         "performance_val" : "{}".format(Fund["benchmark"]["returns"][Key])})
+    if (Fund.get("risk_metrics") or {}).get("standard_deviation_5y") is not None:
+        Rows.append({"performance_type_desc" : "ความผันผวนของกองทุนรวม", "reference_period" : "5 years",
+                     "performance_val" : "{}".format(Fund["risk_metrics"]["standard_deviation_5y"])})
+    return Rows
+
+def NavRows(Fund):
+    Rows = {Row["nav_date"] : Row for Row in (Fund.get("nav_history_30d") or []) if Row.get("nav_date")}
+    if (Fund.get("latest_nav") or {}).get("nav_date"):
+        Rows.setdefault(Fund["latest_nav"]["nav_date"], Fund["latest_nav"])
+    return {re.sub(r"\D", "", Date) : dict(Row, unique_id=Fund["amc_id"], class_abbr_name=Fund.get("symbol"))
+            for Date, Row in Rows.items()}
+
+## Payload of FundFactsheet / FundDailyInfo endpoint from one rmf fund (endpoint not in SEEDERS use generated record)
+SEEDERS = {
+    "fund_factsheet_project_type" : lambda Fund: {"proj_id" : Fund["fund_id"], "project_type" : Fund["metadata"].get("fund_type")},
+    "fund_factsheet_policy" : lambda Fund: {"proj_id" : Fund["fund_id"], "policy_desc" : Fund["metadata"].get("fund_classification"),
+                                           "management_style" : Fund["metadata"].get("management_style")},
+    "fund_factsheet_suitability" : lambda Fund: {"proj_id" : Fund["fund_id"], "risk_spectrum" : "RS{}".format(Fund["metadata"].get("risk_level")),
+                                                "risk_spectrum_desc" : (Fund.get("suitability") or {}).get("risk_level")},
+    "fund_factsheet_risk" : lambda Fund: [{"risk_factor_type_th" : Row.get("risk_type"), "risk_desc_th" : Row.get("risk_desc")}
+                                         for Row in Fund.get("risk_factors") or []],
+    "fund_factsheet_asset" : lambda Fund: [{"proj_id" : Fund["fund_id"], "asset_seq" : idx + 1, "asset_name" : Row.get("asset_class"),
+                                           "asset_ratio" : Row.get("percentage")} for idx, Row in enumerate(Fund.get("asset_allocation") or [])],
+    "fund_factsheet_performance" : PerformanceRows,
+    "fund_factsheet_return" : PerformanceRows,
+    "fund_factsheet_5YearLost" : PerformanceRows,
+    "fund_factsheet_benchmark" : lambda Fund: [{"proj_id" : Fund["fund_id"], "benchmark" : Fund["benchmark"]["name"]}]
+                                              if (Fund.get("benchmark") or {}).get("name") else [],
+    "fund_factsheet_FundTrackingError" : lambda Fund: [{"tracking_error_percent" : Fund["risk_metrics"]["tracking_error_1y"]}]
+                                                      if (Fund.get("risk_metrics") or {}).get("tracking_error_1y") is not None else [],
+    "fund_factsheet_fund_compare" : lambda Fund: {"proj_id" : Fund["fund_id"], "fund_compare" : Fund.get("category")},
+    "fund_factsheet_fee" : lambda Fund: [{"fee_class_desc" : Row.get("fee_type"), "fee_type_desc" : Row.get("fee_desc"),
+                                         "actual_fee" : Row.get("fee_value"), "fee_remark" : Row.get("fee_remark")} for Row in Fund.get("fees") or []],
+    "fund_factsheet_InvolveParty" : lambda Fund: [{"party_type_desc" : Row.get("party_role"), "person_name" : Row.get("party_name")}
+                                                 for Row in Fund.get("involved_parties") or []],
+    "fund_factsheet_FundTop5" : lambda Fund: [{"asset_name" : Row.get("security_name"), "port_pct" : Row.get("percentage")}
+                                             for Row in Fund.get("top_holdings") or []],
+    "fund_factsheet_dividend" : lambda Fund: {"proj_id" : Fund["fund_id"], "dividend_policy" : Fund["metadata"].get("dividend_policy")},
+    "fund_factsheet_class_fund" : lambda Fund: [{"proj_id" : Fund["fund_id"], "class_abbr_name" : Fund.get("symbol"),
+                                                "class_name" : Fund.get("fund_name")}],
+    "fund_factsheet_urls" : lambda Fund: {"url_factsheet" : (Fund.get("document_urls") or {}).get("factsheet_url"),
+                                         "url_annual_report" : (Fund.get("document_urls") or {}).get("annual_report_url"),
+                                         "url_halfyear_report" : (Fund.get("document_urls") or {}).get("halfyear_report_url")},
+    "fund_factsheet_investment" : lambda Fund: [{"minimum_sub_ipo" : (Fund.get("investment_minimums") or {}).get("minimum_initial"),
+                                                "minimum_sub" : (Fund.get("investment_minimums") or {}).get("minimum_additional"),
+                                                "minimum_redempt" : (Fund.get("investment_minimums") or {}).get("minimum_redemption"),
+                                                "lowbal_val" : (Fund.get("investment_minimums") or {}).get("minimum_balance")}],
+    "fund_dailyinfo_dividend" : lambda Fund: [dict(Row, unique_id=Fund["amc_id"], class_abbr_name=Fund.get("symbol"))
+                                             for Row in Fund.get("dividends") or []],
+}
+
+# Generated universe of product without seed (company of LicenseCheck / Onereport, PVD AMC, alert case)
+MOCK_COMPANY = 12
+MOCK_PERSON = 3
+MOCK_PVD_AMC = 4
+MOCK_PVD_FUND = 3
+MOCK_ALERT = 8
+MOCK_DATE = "2025-01-01T00:00:00"
+ASSET_TYPES = [("EQ", "หุ้น", "Equity"), ("BD", "ตราสารหนี้", "Bond"), ("DP", "เงินฝาก", "Deposit"), ("UT", "หน่วยลงทุน", "Investment unit")]
+DIGITAL_ASSETS = {"BTC" : 2000000.0, "ETH" : 100000.0, "USDT" : 35.0, "XRP" : 20.0}
+INVESTOR_TYPES = ["retail", "institution", "foreign"]
+
+## RNG of generated record (the same key always give the same record)
+def KeyRng(Seed, *Key):
+    return random.Random(":".join("{}".format(Part) for Part in (Seed,) + Key))
+
+## Argument of path / body ("None" is sent by client for empty body field)
+def Query(Args, Key):
+    Value = "{}".format(Args.get(Key) or "").strip()
+    return "" if Value == "None" else Value
+
+def Company(Index):
+    return {"unique_id" : "{:010d}".format(Index + 1), "comp_name_th" : "บริษัท ทดสอบ {} จำกัด".format(Index + 1),
+            "comp_name_en" : "MOCK COMPANY {} CO., LTD.".format(Index + 1), "last_upd_date" : MOCK_DATE}
+
+def Person(CompanyId, Index):
+    return {"unique_id" : "{}{:02d}".format(CompanyId, Index + 1), "person_name_th" : "บุคคล {} {}".format(CompanyId, Index + 1),
+            "person_name_en" : "PERSON {} {}".format(CompanyId, Index + 1), "regis_sale_no" : "{}{:02d}".format(CompanyId[-4:], Index + 1)}
+
+def PVDAmc(Index):
+    return {"unique_id" : AmcId(100 + Index), "name_th" : "บลจ. ทดสอบ {}".format(Index + 1), "name_en" : "MOCK AMC {}".format(Index + 1),
+            "last_upd_date" : MOCK_DATE}
+
+def PVDFund(AmcIndex, Index):
+    Amc = PVDAmc(AmcIndex)
+    Abbr = "PVD{}{:02d}".format(AmcIndex + 1, Index + 1)
+    return {"fund_id" : "PV{:03d}{:02d}".format(AmcIndex + 1, Index + 1), "unique_id" : Amc["unique_id"],
+            "proj_name_th" : "กองทุนสำรองเลี้ยงชีพ {}".format(Abbr), "proj_name_en" : "{} PROVIDENT FUND".format(Abbr),
+            "proj_abbr_name" : Abbr, "fund_status" : "RG", "last_upd_date" : MOCK_DATE}
+
+def PVDFunds():
+    return [PVDFund(AmcIndex, Index) for AmcIndex in range(MOCK_PVD_AMC) for Index in range(MOCK_PVD_FUND)]
+
+## Weight (percent, sum to 100) of asset type
+def Weights(Rng, Count):
+    Raw = [Rng.uniform(1, 10) for _ in range(Count)]
+    return [round(Value * 100 / sum(Raw), 2) for Value in Raw]
+
+## GET /{unique_id}/fund : fund of AMC , POST /fund : fund with FundName in name
+def PVDFundPayload(Args, Seed):
+    if "unique_id" in Args:
+        return [Fund for Fund in PVDFunds() if Fund["unique_id"] == Args["unique_id"]]
+    return [Fund for Fund in PVDFunds() if Query(Args, "FundName").lower() in (Fund["proj_name_th"] + Fund["proj_name_en"]).lower()]
+
+def PVDPort(Args, Seed):
+    Rng = KeyRng(Seed, "pvdport", Args["proj_id"], Args["period"])
+    return [{"secur_name" : "{} {}".format(Name, idx + 1), "asset_type_code" : Code, "percent_nav" : Weight,
+             "market_value" : round(Weight * 1000000, 2)} for idx, ((Code, _, Name), Weight) in enumerate(zip(ASSET_TYPES, Weights(Rng, len(ASSET_TYPES))))]
+
+## Issue of bond from issuer name / security code (issued_ref_id is stable for the same name)
+def BondIssue(Key, Index, Seed):
+    Rng = KeyRng(Seed, "bond", Key.upper(), Index)
+    return {"issued_ref_id" : "{:08d}".format(Rng.randrange(10 ** 8)), "symbol" : "{}{:02d}".format(re.sub(r"\W", "", Key.upper())[:4] or "BD", Index + 1),
+            "issuer_name_th" : Key, "issuer_name_en" : Key.upper(), "last_upd_date" : MOCK_DATE}
+
+## Coupon term of issue (the same issue always give the same term, redemption date is maturity date)
+def BondTerm(issued_ref_id, Seed):
+    Rng = KeyRng(Seed, "bondterm", issued_ref_id)
+    Year = Rng.randint(2015, 2024)
+    return {"issued_ref_id" : issued_ref_id, "coupon_rate" : round(Rng.uniform(1, 6), 2), "coupon_frequency" : Rng.choice([1, 2, 4]),
+            "issue_date" : "{}-{:02d}-15".format(Year, Rng.randint(1, 12)), "maturity_date" : "{}-{:02d}-15".format(Year + Rng.randint(2, 10), Rng.randint(1, 12)),
+            "par_value" : 1000.0}
+
+def Rows(Key, Count, **Fields):
+    return [dict(Fields, item_seq=idx + 1, item_code="{}{:02d}".format(Key, idx + 1)) for idx in range(Count)]
+
+def DigitalDaily(Name, Args, Seed):
+    Rng = KeyRng(Seed, Name, Args["trade_date"])
+    if Name == "digitalasset_daily_investor_type_summary":
+        return [{"investor_type" : Type, "buy_value" : round(Rng.uniform(1e6, 1e8), 2), "sell_value" : round(Rng.uniform(1e6, 1e8), 2),
+                 "account" : Rng.randint(100, 10000)} for Type in INVESTOR_TYPES]
+    if Name == "digitalasset_daily_dtw_daily_summary":
+        return [{"asset" : Asset, "deposit_value" : round(Rng.uniform(1e5, 1e7), 2), "withdraw_value" : round(Rng.uniform(1e5, 1e7), 2)}
+                for Asset in DIGITAL_ASSETS]
+    Result = []
+    for Asset, Price in DIGITAL_ASSETS.items():
+        Open = Price * Rng.uniform(0.95, 1.05)
+        Close = Open * Rng.uniform(0.97, 1.03)
+        Result.append({"asset" : Asset, "currency" : "THB", "open" : round(Open, 4), "high" : round(max(Open, Close) * Rng.uniform(1, 1.02), 4),
+                       "low" : round(min(Open, Close) * Rng.uniform(0.98, 1), 4), "close" : round(Close, 4),
+                       "volume" : round(Rng.uniform(10, 1000), 4), "value" : round(Rng.uniform(1e6, 1e8), 2)})
+    return Result
+
+def RefRows(Name, Args, Seed):
+    if Name == "ref_fund_portfolio_asset_type":
+        return [{"asset_type_code" : Code, "asset_type_desc_th" : Th, "asset_type_desc_en" : En} for Code, Th, En in ASSET_TYPES]
+    Key = Name[len("ref_"):].split("_")[-1]
+    return [{"code" : "{}{:02d}".format(Key[:2].upper(), idx + 1), "desc_th" : "{} {}".format(Key, idx + 1), "desc_en" : "{} {}".format(Key.upper(), idx + 1)}
+            for idx in range(KeyRng(Seed, Name).randint(3, 6))]
+
+## Response shape of endpoint without seed : field read by crawler (unique_id, proj_id, issued_ref_id, case_id, ...) is always there
+SHAPES = {
+    # LicenseCheck
+    "licensecheck_lcs_company" : lambda Args, Seed: [Row for Row in map(Company, range(MOCK_COMPANY))
+                                                     if Query(Args, "Name").lower() in (Row["comp_name_th"] + Row["comp_name_en"]).lower()],
+    "licensecheck_lcs_person" : lambda Args, Seed: [Row for Index in range(MOCK_COMPANY) for Row in
+                                                    (Person(Company(Index)["unique_id"], idx) for idx in range(MOCK_PERSON))
+                                                    if Query(Args, "Name").lower() in (Row["person_name_th"] + Row["person_name_en"]).lower()
+                                                    and Query(Args, "regis_sale_no") in ("", Row["regis_sale_no"])],
+    "licensecheck_lcs_company_personnel" : lambda Args, Seed: [dict(Person(Args["unique_id"], idx), position="กรรมการ") for idx in range(MOCK_PERSON)],
+    "licensecheck_lcs_company_license" : lambda Args, Seed: Rows("LC", 2, unique_id=Args["unique_id"], license_type="หลักทรัพย์", effective_date=MOCK_DATE),
+    "licensecheck_lcs_company_business_act" : lambda Args, Seed: Rows("BA", 2, unique_id=Args["unique_id"], business_act="นายหน้าซื้อขายหลักทรัพย์"),
+    "licensecheck_lcs_person_license" : lambda Args, Seed: Rows("LP", 1, unique_id=Args["unique_id"], license_type="ผู้แนะนำการลงทุน", effective_date=MOCK_DATE),
+    "licensecheck_lcs_person_workinfo" : lambda Args, Seed: Rows("WI", 1, unique_id=Args["unique_id"], comp_unique_id=Args["unique_id"][:10], start_date=MOCK_DATE),
+    "licensecheck_lcs_enforcement" : lambda Args, Seed: Rows("EN", 1, unique_id=Args["unique_id"], case_id=Query(Args, "case_id") or "EN{}".format(Args["unique_id"]),
+                                                             action_desc="ภาคทัณฑ์"),
+    "licensecheck_lcs_alertdetail" : lambda Args, Seed: [{"case_id" : "IA{:05d}".format(idx + 1), "alert_date" : "2025-01-{:02d}".format(idx + 1),
+                                                          "subject_name" : "ผู้ให้บริการไม่ได้รับอนุญาต {}".format(idx + 1), "alert_type" : "IA"} for idx in range(MOCK_ALERT)],
+    "licensecheck_lcs_alertaction" : lambda Args, Seed: Rows("AC", KeyRng(Seed, "alert", Args["case_id"]).randint(1, 3), case_id=Args["case_id"],
+                                                             action_type_code="01", action_date=MOCK_DATE),
+    # PVDFactSheet
+    "pvd_factsheet_amc" : lambda Args, Seed: [PVDAmc(Index) for Index in range(MOCK_PVD_AMC)],
+    "pvd_factsheet_fund" : PVDFundPayload,
+    "pvd_factsheet_policy" : lambda Args, Seed: [{"proj_id" : Args["proj_id"], "policy_code" : "MIX", "policy_desc" : "นโยบายผสม"}],
+    "pvd_factsheet_return" : lambda Args, Seed: [{"proj_id" : Args["proj_id"], "reference_period" : Period,
+                                                  "return_val" : round(KeyRng(Seed, "pvdreturn", Args["proj_id"], Period).uniform(-5, 10), 2)} for Period in ("1 year", "3 years", "5 years")],
+    "pvd_factsheet_fee" : lambda Args, Seed: [{"proj_id" : Args["proj_id"], "fee_type_desc" : "ค่าธรรมเนียมการจัดการ",
+                                               "actual_fee" : round(KeyRng(Seed, "pvdfee", Args["proj_id"]).uniform(0.1, 1), 4)}],
+    "pvd_factsheet_pvdFullPort" : PVDPort,
+    # Bond
+    "bond_outs_issuer" : lambda Args, Seed: [BondIssue(Query(Args, "IssuerName"), idx, Seed) for idx in range(KeyRng(Seed, "issuer", Query(Args, "IssuerName").upper()).randint(1, 3))]
+                                            if Query(Args, "IssuerName") else None,
+    "bond_outs_issue" : lambda Args, Seed: [BondIssue(Query(Args, "SecurityCode"), 0, Seed)] if Query(Args, "SecurityCode") else None,
+    "bond_outs_coupon" : lambda Args, Seed: [BondTerm(Args["issued_ref_id"], Seed)],
+    "bond_outs_redemption" : lambda Args, Seed: [{"issued_ref_id" : Args["issued_ref_id"], "redemption_date" : BondTerm(Args["issued_ref_id"], Seed)["maturity_date"],
+                                                  "redemption_type" : "Bullet"}],
+    "bond_outs_outstanding_value" : lambda Args, Seed: [{"issued_ref_id" : Args["issued_ref_id"], "outstanding_date" : Args["outstanding_date"],
+                                                         "outstanding_value" : round(KeyRng(Seed, "outstanding", Args["issued_ref_id"]).uniform(100, 5000), 0) * 1e6}],
+    # Onereport
+    "onereport_sbo_info" : lambda Args, Seed: [dict(Company(Index), report_year=Args["report_year"]) for Index in range(MOCK_COMPANY)],
+}
+
+## Generated record of endpoint without recorded / seeded payload (the same path always give the same record)
+def GeneratedPayload(Name, Args, Seed):
+    if Name in SHAPES:
+        return SHAPES[Name](Args, Seed)
+    if Name.startswith("digitalasset_daily_"):
+        return DigitalDaily(Name, Args, Seed)
+    if Name.startswith("ref_"):
+        return RefRows(Name, Args, Seed)
+    Rng = KeyRng(Seed, Name, sorted(Args.items()))
+    if Name.startswith("onereport_"):
+        return Rows(Name.split("_")[-1][:2].upper(), Rng.randint(1, 4), unique_id=Args["unique_id"], report_year=Args["report_year"],
+                    value=round(Rng.uniform(0, 1000), 2))
+    if Name.startswith("digitalasset_"):
+        return [dict(Args, asset=Asset, value=round(Rng.uniform(1e6, 1e8), 2)) for Asset in DIGITAL_ASSETS]
+    return [dict(Args, seq=idx + 1, code="{}{:04d}".format(Name.split("_")[0].upper()[:3], Rng.randrange(10000)),
+                 value=round(Rng.uniform(0, 1000), 2), last_upd_date=MOCK_DATE) for idx in range(Rng.randint(1, 5))]
+
+## Mock of SEC API : route, payload and fault of every call
+class MockApi:
+    def __init__(self, Faults=None, Recorded=None, Seed=None):
+        self.Faults = dict(DefaultFaults(), **(Faults or {}))
+        self.Routes = BuildRoutes()
+        self.Recorded = LoadRecorded() if Recorded is None else Recorded
+        self.Seed = LoadSeed() if Seed is None else Seed
+        self.Lock = threading.Lock()
+        self.Calls = {}
+        self.Window = [0.0, 0]
+        self.Stats = {"request" : 0, "status" : {}, "endpoint" : {}}
+
+    def Configure(self, **Faults):
+        with self.Lock:
+            self.Faults.update(Faults)
+            self.Calls.clear()
+            self.Window = [0.0, 0]
+        return dict(self.Faults)
+
+    def Match(self, Method, PathName):
+        for RouteMethod, Pattern, Name in self.Routes:
+            Found = Pattern.match(PathName)
+            if RouteMethod == Method and Found:
+                return Name, {Key : Value for Key, Value in Found.groupdict().items() if Value is not None}
+        return None, {}
+
+    ## Fault of n-th call of path (latency second, status or None, Retry-After)
+    def Fault(self, Method, PathName):
+        with self.Lock:
+            Faults = dict(self.Faults)
+            Count = self.Calls[(Method, PathName)] = self.Calls.get((Method, PathName), 0) + 1
+            # quota of subscription key : MockRateLimit call per MockRatePeriod second (fixed window like SEC API)
+            Limited, RetryAfter = False, 0
+            if Faults["rate_limit"]:
+                Now = time.time()
+                if Now - self.Window[0] >= Faults["rate_period"]:
+                    self.Window = [Now, 0]
+                self.Window[1] += 1
+                Limited = self.Window[1] > Faults["rate_limit"]
+                RetryAfter = max(1, math.ceil(self.Window[0] + Faults["rate_period"] - Now))
+        Rng = random.Random("{}:{}:{}:{}".format(Faults["seed"], Method, PathName, Count))
+        Latency = max(0.0, Faults["latency_ms"] + Rng.uniform(-1, 1) * Faults["jitter_ms"])
+        if Rng.random() < Faults["slow_rate"]:
+            Latency = Faults["slow_ms"]
+        if Limited:
+            return Latency / 1000, 429, RetryAfter
+        Roll = Rng.random()
+        if Roll < Faults["rate_429"]:
+            return Latency / 1000, 429, 1
+        if Roll < Faults["rate_429"] + Faults["error_rate"]:
+            return Latency / 1000, Rng.choice(ERROR_STATUS), None
+        return Latency / 1000, None, None
+
+    def Fund(self, Args):
+        Key = Args.get("proj_id") or Args.get("proj_fund") or Args.get("ClassParam") or ""
+        return self.Seed["funds"].get(Key) or self.Seed["symbols"].get(Key.upper())
+
+    ## Search POST : name in request body is searched in name of fund / AMC seed
+    def Search(self, Name, Body):
+        Query = "{}".format(next(iter(Body.values()), "") if isinstance(Body, dict) else "").strip().lower()
+        Funds = self.Seed["funds"].values()
+        if Name == "fund_factsheet_fund":
+            return [FundInfo(Fund) for Fund in Funds if Query in (Fund.get("fund_name") or "").lower() or Query in (Fund.get("symbol") or "").lower()]
+        if Name == "fund_factsheet_class_fund":
+            return [Row for Fund in Funds if Query in (Fund.get("symbol") or "").lower() for Row in SEEDERS[Name](Fund)]
+        return None
+
+    ## Payload of call (None : no data, answered with 204 like SEC API)
+    def Payload(self, Method, PathName, Name, Args, Body):
+        Key = (Method, PathName.rstrip("/"))
+        if Method == "POST" and Key + (json.dumps(Body, sort_keys=True, ensure_ascii=False),) in self.Recorded:
+            return self.Recorded[Key + (json.dumps(Body, sort_keys=True, ensure_ascii=False),)]
+        if Key in self.Recorded:
+            return self.Recorded[Key]
+
+        Seeded = bool(self.Seed["funds"])
+        if Seeded and Name in ("fund_factsheet_amc", "fund_dailyinfo_amc"):
+            return self.Seed["amcs"]
+        if Seeded and Name == "fund_factsheet_fund":
+            if Method == "GET":
+                return [FundInfo(Fund) for Fund in self.Seed["funds"].values() if Fund["amc_id"] == Args["FundParam"]] or None
+            return self.Search(Name, Body) or None
+        if Seeded and Name == "fund_factsheet_class_fund" and Method == "POST":
+            return self.Search(Name, Body) or None
+        if Seeded and Name == "fund_dailyinfo_dailynav":
+            Fund = self.Fund(Args)
+            return NavRows(Fund).get(re.sub(r"\D", "", Args["nav_date"])) if Fund is not None else None
+        if Seeded and Name in SEEDERS:
+            Fund = self.Fund(Args)
+            return SEEDERS[Name](Fund) or None if Fund is not None else None
+        return GeneratedPayload(Name, dict(Args, **(Body if isinstance(Body, dict) else {})), self.Faults["seed"]) or None
+
+    ## Answer one call : (status, header, body byte)
+    def Handle(self, Method, Url, Headers, RawBody=b""):
+        PathName = unquote(urlparse(Url).path)
+        if PathName.startswith("/__mock/"):
+            return self.Control(Method, PathName, RawBody)
+        Name, Args = self.Match(Method, PathName)
+        Latency, Status, RetryAfter = self.Fault(Method, PathName)
+        if Latency:
+            time.sleep(Latency)
+
+        Header = {"Content-Type" : "application/json; charset=utf-8"}
+        if Status is None and Name is None:
+            Status = 404
+        elif Status is None and self.Faults["auth"] and not Headers.get(KEY_HEADER):
+            Status = 401
+        if Status is not None:
+            if RetryAfter is not None:
+                Header["Retry-After"] = str(RetryAfter)
+            return self.Count(Name, Status), Header, json.dumps({"statusCode" : Status, "message" : "mock {}".format(Status)}).encode("utf-8")
+
+        try:
+            Body = json.loads(RawBody or b"{}")
+        except ValueError:
+            Body = {}
+        Payload = self.Payload(Method, PathName, Name, Args, Body)
+        if Payload is None:
+            return self.Count(Name, 204), {}, b""
+        Content = json.dumps(Payload, ensure_ascii=False).encode("utf-8")
+        Header["ETag"] = '"{}"'.format(hashlib.sha1(Content).hexdigest())
+        if Method == "GET" and Headers.get("If-None-Match") == Header["ETag"]:
+            return self.Count(Name, 304), {"ETag" : Header["ETag"]}, b""
+        return self.Count(Name, 200), Header, Content
+
+    def Count(self, Name, Status):
+        with self.Lock:
+            self.Stats["request"] += 1
+            self.Stats["status"][str(Status)] = self.Stats["status"].get(str(Status), 0) + 1
+            Row = self.Stats["endpoint"].setdefault(Name or "unknown", {})
+            Row[str(Status)] = Row.get(str(Status), 0) + 1
+        return Status
+
+    ## GET /__mock/stats : call by status / endpoint, POST /__mock/config : change fault, POST /__mock/reset : clear count
+    def Control(self, Method, PathName, RawBody):
+        if Method == "POST" and PathName == "/__mock/config":
+            Result = self.Configure(**json.loads(RawBody or b"{}"))
+        elif Method == "POST" and PathName == "/__mock/reset":
+            with self.Lock:
+                self.Calls.clear()
+                self.Window = [0.0, 0]
+                self.Stats = {"request" : 0, "status" : {}, "endpoint" : {}}
+            Result = {"reset" : True}
+        elif PathName == "/__mock/stats":
+            with self.Lock:
+                Result = json.loads(json.dumps(dict(self.Stats, faults=self.Faults)))
+        else:
+            return 404, {}, b""
+        return 200, {"Content-Type" : "application/json"}, json.dumps(Result).encode("utf-8")
+
+## Start mock server in background thread : StartMockServer(0) use free port (server.server_address[1])
+## RmfPath : folder of rmf-funds json for fund seed (default MockRmfFunds)
+def StartMockServer(Port=None, Host="127.0.0.1", RmfPath=None, **Faults):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    Api = MockApi(Faults, Seed=LoadSeed(RmfPath))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def Answer(self):
+            RawBody = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            Status, Header, Content = Api.Handle(self.command, self.path, self.headers, RawBody)
+            self.send_response(Status)
+            for Key, Value in Header.items():
+                self.send_header(Key, Value)
+            self.send_header("Content-Length", str(len(Content)))
+            self.end_headers()
+            self.wfile.write(Content)
+
+        # client that gave up (timeout / hedged call cancelled) close the socket before answer, not an error of mock
+        def handle_one_request(self):
+            try:
+                super().handle_one_request()
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+        do_GET = do_POST = Answer
+
+        def log_message(self, *Args):
+            return
+
+    Server = ThreadingHTTPServer((Host, MOCK_PORT if Port is None else Port), Handler)
+    Server.daemon_threads = True
+    Server.Api = Api
+    threading.Thread(target=Server.serve_forever, name="mock-server", daemon=True).start()
+    return Server
+
+if __name__ == "__main__":
+    Server = StartMockServer()
+    Api = Server.Api
+    print("SEC API mock on http://{}:{} : {} route, {} recorded, {} fund / {} AMC seeded".format(
+        Server.server_address[0], Server.server_address[1], len(Api.Routes), len(Api.Recorded),
+        len(Api.Seed["funds"]), len(Api.Seed["amcs"])))
+    print("fault : {}".format(Api.Faults))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        Server.shutdown()
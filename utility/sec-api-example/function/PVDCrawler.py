@@ -0,0 +1,93 @@
+from function.AllFunction import *
+from function.Store import FlattenResponse, AppendTable, UpsertTable, DropPartition, LoadManifest, SaveManifest
+from function.FundSchema import FUND_TABLE, HOLDING_TABLE, ToFundTable, ToHoldingTable, PortfolioPeriods
+from function.FundPortSync import MISS_RETRY_DAYS
+import function.PVDFactSheet as PVDFactSheet
+
+# Declare variable
+TABLE_NAME = "pvd/{}"
+PVD_ID_FIELD = "proj_id"
+
+SECTIONS = {
+    "policy" : PVDFactSheet.pvd_factsheet_policy,
+    "return" : PVDFactSheet.pvd_factsheet_return,
+    "fee" : PVDFactSheet.pvd_factsheet_fee,
+}
+
+def FetchSection(Section, proj_id):
+    return SECTIONS[Section](proj_id)
+
+## Provident fund universe (every AMC concurrently), malformed AMC / fund row is skipped with log
+def CrawlPVDFund(MaxWorkers=8):
+
+    amc = [row for row in (PVDFactSheet.pvd_factsheet_amc() or []) if isinstance(row, dict) and row.get("unique_id")]
+    Records = []
+    Skipped = 0
+    for row, resp in zip(amc, RunConcurrent(PVDFactSheet.pvd_factsheet_fund, [row["unique_id"] for row in amc], MaxWorkers)):
+        for Record in (resp if isinstance(resp, list) else [resp] if resp else []):
+            if not isinstance(Record, dict):
+                Skipped += 1
+                continue
+            Record = {Key : Value for Key, Value in Record.items() if Key != "unique_id"}
+            Records.append(dict(Record, amc_id=row["unique_id"]))
+    if not Records:
+        return pd.DataFrame()
+
+    # id is read after rename to shared column (fund_id of PVD API is proj_id)
+    Fund = ToFundTable(FlattenResponse(Records), "PVD")
+    Missing = Fund[PVD_ID_FIELD].isna() | (Fund[PVD_ID_FIELD].astype(str).str.strip() == "")
+    for Record in Fund[Missing].to_dict("records"):
+        Log("warning", "PVD fund without id is skipped : {} [{}]".format(Record.get("fund_name_en") or Record.get("fund_name_th"), Record.get("amc_id")))
+    Skipped += int(Missing.sum())
+    Fund = Fund[~Missing].reset_index(drop=True)
+    Fund[PVD_ID_FIELD] = Fund[PVD_ID_FIELD].astype(str)
+
+    DropPartition(FUND_TABLE, "fund_type", "PVD")
+    AppendTable(Fund, FUND_TABLE, PartitionCols=["fund_type"])
+    Log("info", "PVD universe : {} AMC, {} fund ({} row skipped)".format(len(amc), len(Fund), Skipped))
+    return Fund
+
+## Crawl provident fund : universe, policy / return / fee and new portfolio period
+@Traced()
+def CrawlPVD(PortStart="2020-01-01", PortEnd=None, MaxWorkers=8):
+
+    Fund = CrawlPVDFund(MaxWorkers)
+    if Fund.empty:
+        Log("warning", "PVD universe : no fund")
+        return
+    ProjIds = list(Fund[PVD_ID_FIELD].unique())
+
+    # section of every fund (data can change every day) : replace rows of fund fetched this run, stored rows of failed call are kept
+    Tasks = [(Section, proj_id) for proj_id in ProjIds for Section in SECTIONS]
+    Frames = {Section : [] for Section in SECTIONS}
+    Fetched = {Section : [] for Section in SECTIONS}
+    for (Section, proj_id), resp in zip(Tasks, RunConcurrent(FetchSection, Tasks, MaxWorkers)):
+        if resp is not None:
+            Frames[Section].append(FlattenResponse(resp, proj_id=proj_id, fund_type="PVD"))
+            Fetched[Section].append(proj_id)
+    for Section, Frame in Frames.items():
+        Frame = [df for df in Frame if not df.empty]
+        UpsertTable(pd.concat(Frame, ignore_index=True) if Frame else pd.DataFrame(), TABLE_NAME.format(Section), PVD_ID_FIELD, Fetched[Section])
+        if len(Fetched[Section]) < len(ProjIds):
+            Log("warning", "PVD [{}] : {} of {} fund failed, stored rows are kept".format(Section, len(ProjIds) - len(Fetched[Section]), len(ProjIds)))
+
+    # portfolio : published period never change, fetch only period not stored and not known to be missing
+    Done = LoadManifest("pvd_port")
+    Missing = LoadManifest("pvd_port_miss")
+    Tasks = [(proj_id, period) for proj_id in ProjIds for period in PortfolioPeriods(PortStart, PortEnd)
+             if "{}|{}".format(proj_id, period) not in Done and "{}|{}".format(proj_id, period) not in Missing]
+    Log("info", "PVD portfolio : {} (fund, period) to fetch".format(len(Tasks)))
+
+    Holding = []
+    RetryFrom = (datetime.now() - pd.Timedelta(days=MISS_RETRY_DAYS)).strftime("%Y%m%d")
+    for (proj_id, period), resp in zip(Tasks, RunConcurrent(PVDFactSheet.pvd_factsheet_pvdFullPort, Tasks, MaxWorkers, "backfill")):
+        if resp:
+            Holding.append(FlattenResponse(resp, proj_id=proj_id, period=period))
+            Done.add("{}|{}".format(proj_id, period))
+        elif resp is not None and period < RetryFrom:
+            # API answered without data ([]), failed call (None) is fetched again next run
+            Missing.add("{}|{}".format(proj_id, period))
+    if Holding:
+        AppendTable(ToHoldingTable(pd.concat(Holding, ignore_index=True), "PVD"), HOLDING_TABLE, PartitionCols=["fund_type"])
+    SaveManifest("pvd_port", Done)
+    SaveManifest("pvd_port_miss", Missing)
@@ -0,0 +1,157 @@
+from function.Settings import Setting
+from datetime import datetime
+import tracemalloc
+import threading
+import atexit
+import time
+import sys
+import re
+import os
+
+# Profiling of whole run [Profile=1 in .env or --profile on command line], report in folder ProfilePath/<start time>
+# ProfileMode : sample (stack of every thread every ProfileInterval second -> collapsed stack) or cprofile (main thread, pstats)
+PROFILE = Setting.Get("Profile", "0") == "1" or "--profile" in sys.argv
+PROFILE_MODE = Setting.Get("ProfileMode", "sample")
+PROFILE_PATH = Setting.Get("ProfilePath", "data/profile")
+PROFILE_INTERVAL = float(Setting.Get("ProfileInterval", "0.005"))
+PROFILE_TOP = 20
+ROOT_STAGE = "run"
+
+ProfileState = {"running" : False, "mode" : None, "folder" : None, "start" : None, "peak" : 0, "snapshot" : None, "profiler" : None, "sampler" : None}
+Samples = {}
+Stages = [ROOT_STAGE]
+StageReport = []
+StageLock = threading.Lock()
+
+def FrameName(Frame):
+    Code = Frame.f_code
+    return "{} ({}:{})".format(Code.co_name, os.path.basename(Code.co_filename), Code.co_firstlineno)
+
+## Thread name without pool / worker number (every worker of the same pool is one root of flamegraph)
+def ThreadGroup(Name):
+    return re.sub(r"[-_0-9]+$", "", Name) or Name
+
+## Sampler : every Interval second, add current stack of every thread to Samples (key is collapsed stack)
+## stack inside this module (snapshot of stage) is not counted
+def Sampler(Stop, Interval):
+    Own = threading.get_ident()
+    while not Stop.wait(Interval):
+        Names = {Thread.ident : Thread.name for Thread in threading.enumerate()}
+        Stage = ";".join("[{}]".format(Name) for Name in tuple(Stages))
+        for Ident, Frame in sys._current_frames().items():
+            if Ident == Own:
+                continue
+            Stack = []
+            while Frame is not None and Frame.f_code.co_filename != __file__:
+                Stack.append(FrameName(Frame))
+                Frame = Frame.f_back
+            if Frame is not None:
+                continue
+            Key = ";".join([Stage, ThreadGroup(Names.get(Ident, "thread"))] + Stack[::-1])
+            Samples[Key] = Samples.get(Key, 0) + 1
+
+## Start profiling (called at import when Profile=1 or --profile, report is written at exit)
+def StartProfile(Mode=None):
+    if ProfileState["running"]:
+        return ProfileState["folder"]
+    import cProfile
+    Mode = Mode or PROFILE_MODE
+    ProfileState.update(running=True, mode=Mode, start=time.time(), peak=0,
+                        folder=os.path.join(PROFILE_PATH, datetime.now().strftime("%Y%m%d%H%M%S")))
+    tracemalloc.start()
+    if Mode == "cprofile":
+        ProfileState["profiler"] = cProfile.Profile()
+        ProfileState["profiler"].enable()
+    else:
+        Stop = threading.Event()
+        Thread = threading.Thread(target=Sampler, args=(Stop, PROFILE_INTERVAL), name="profile-sampler", daemon=True)
+        Thread.start()
+        ProfileState["sampler"] = (Stop, Thread)
+    ProfileState["snapshot"] = tracemalloc.take_snapshot()
+    return ProfileState["folder"]
+
+## Stage of run : with Stage("fund enumeration"): ... (wall time and top allocation of stage in report, do nothing when not profiling)
+class Stage:
+    def __init__(self, Name):
+        self.Name = Name
+
+    def __enter__(self):
+        if not ProfileState["running"]:
+            return self
+        self.Before = tracemalloc.take_snapshot()
+        KeepPeak()
+        self.Start = time.time()
+        with StageLock:
+            Stages.append(self.Name)
+        return self
+
+    def __exit__(self, *Error):
+        if not ProfileState["running"] or not hasattr(self, "Before"):
+            return False
+        Second = time.time() - self.Start
+        with StageLock:
+            Path = "/".join(Stages)
+            if Stages[-1] == self.Name:
+                Stages.pop()
+        StageReport.append((Path, Second, self.Before, tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1]))
+        KeepPeak()
+        return False
+
+## Keep peak of run before peak is reset for stage
+def KeepPeak():
+    ProfileState["peak"] = max(ProfileState["peak"], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+## Wall time, peak traced memory and top allocation (by line) made during stage (compared when report is written)
+def StageAllocation(Path, Second, Before, After, Peak):
+    Ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    Stats = After.filter_traces(Ignore).compare_to(Before.filter_traces(Ignore), "lineno")
+    Stats = sorted((Stat for Stat in Stats if Stat.size_diff > 0), key=lambda Stat: -Stat.size_diff)[:PROFILE_TOP]
+    return {"stage" : Path, "second" : Second, "peak" : Peak, "top" : Stats}
+
+def FormatSize(Size):
+    for Unit in ("B", "KiB", "MiB"):
+        if abs(Size) < 1024:
+            return "{:.1f} {}".format(Size, Unit)
+        Size /= 1024
+    return "{:.1f} GiB".format(Size)
+
+## Stop profiling and write report : stacks.collapsed (sample) or profile.pstats + profile.txt (cprofile), allocations.txt
+def StopProfile():
+    if not ProfileState["running"]:
+        return None
+    Folder = ProfileState["folder"]
+    os.makedirs(Folder, exist_ok=True)
+    if ProfileState["profiler"] is not None:
+        import pstats
+        ProfileState["profiler"].disable()
+        ProfileState["profiler"].dump_stats(os.path.join(Folder, "profile.pstats"))
+        with open(os.path.join(Folder, "profile.txt"), "w", encoding="utf-8") as file:
+            pstats.Stats(ProfileState["profiler"], stream=file).sort_stats("cumulative").print_stats(PROFILE_TOP * 2)
+    if ProfileState["sampler"] is not None:
+        Stop, Thread = ProfileState["sampler"]
+        Stop.set()
+        Thread.join()
+        with open(os.path.join(Folder, "stacks.collapsed"), "w", encoding="utf-8") as file:
+            for Key, Count in sorted(Samples.items()):
+                file.write("{} {}\n".format(Key, Count))
+    KeepPeak()
+    StageReport.append((ROOT_STAGE, time.time() - ProfileState["start"], ProfileState["snapshot"], tracemalloc.take_snapshot(), ProfileState["peak"]))
+    tracemalloc.stop()
+    ProfileState.update(running=False, profiler=None, sampler=None, snapshot=None)
+
+    with open(os.path.join(Folder, "allocations.txt"), "w", encoding="utf-8") as file:
+        for Report in (StageAllocation(*Item) for Item in StageReport):
+            file.write("== {} : {:.2f} second, peak {} ==\n".format(Report["stage"], Report["second"], FormatSize(Report["peak"])))
+            for Stat in Report["top"]:
+                Frame = Stat.traceback[0]
+                file.write("{:>12} {:>8} block  {}:{}\n".format(FormatSize(Stat.size_diff), Stat.count_diff, Frame.filename, Frame.lineno))
+            file.write("\n")
+    StageReport.clear()
+    Samples.clear()
+    print("Profile is written to folder [{}]".format(Folder))
+    return Folder
+
+if PROFILE:
+    StartProfile()
+    atexit.register(StopProfile)
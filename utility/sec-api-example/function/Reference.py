@@ -0,0 +1,86 @@
+from function.AllFunction import *
+from function.Endpoints import EndpointFunctions
+import numpy as np
+import time
+
+# Declare variable
+REFERENCE_PATH = "data/ref/reference.json"
+REFERENCE_TTL = 7 * 24 * 60 * 60
+
+# Loaded reference table and lookup array (table name -> data)
+Tables = {}
+Lookups = {}
+
+def RefFunctions():
+    return EndpointFunctions("Common", "ref_")
+
+def TableName(table):
+    return table[len("ref_"):] if table.startswith("ref_") else table
+
+## Fetch every common/ref table in parallel and keep in data folder
+@Traced()
+def PreloadReference(Refresh=False, MaxWorkers=8, Path=REFERENCE_PATH, TTL=REFERENCE_TTL):
+
+    global Tables
+    if not Refresh and os.path.isfile(Path) and time.time() - os.path.getmtime(Path) < TTL:
+        with open(Path, "r", encoding="utf-8") as file:
+            Tables = json.load(file)["tables"]
+        Lookups.clear()
+        return Tables
+
+    Functions = RefFunctions()
+    Names = sorted(Functions)
+    Result = RunConcurrent(lambda Name: Functions[Name](), Names, MaxWorkers)
+
+    # keep old table when refresh fail
+    Tables = {Name : (resp if resp is not None else Tables.get(Name, [])) for Name, resp in zip(Names, Result)}
+    Lookups.clear()
+
+    os.makedirs(os.path.dirname(Path), exist_ok=True)
+    with open(Path, "w", encoding="utf-8") as file:
+        json.dump({"fetched_at" : datetime.now().isoformat(), "tables" : Tables}, file, ensure_ascii=False)
+
+    Log("info", "Preload reference complete : {} tables".format(len(Tables)))
+    return Tables
+
+def GetTable(table):
+    if not Tables:
+        PreloadReference()
+    return Tables.get(TableName(table)) or []
+
+## Guess code / description field (first field with code, description field after it)
+def DetectFields(Rows):
+    Keys = list(Rows[0]) if Rows else []
+    CodeField = next((Key for Key in Keys if Key.lower().endswith(("code", "_id", "type"))), Keys[0] if Keys else None)
+    Others = [Key for Key in Keys if Key != CodeField]
+    ValueField = next((Key for Key in Others if "desc" in Key.lower() or "name" in Key.lower()), Others[0] if Others else CodeField)
+    return CodeField, ValueField
+
+## code -> description dictionary
+def RefDict(table, CodeField=None, ValueField=None):
+    Rows = GetTable(table)
+    AutoCode, AutoValue = DetectFields(Rows)
+    CodeField, ValueField = CodeField or AutoCode, ValueField or AutoValue
+    return {"{}".format(Row.get(CodeField)) : Row.get(ValueField) for Row in Rows}
+
+## code as pandas categorical (use for code column with small memory)
+def RefCategorical(table, CodeField=None, ValueField=None):
+    return pd.CategoricalDtype(categories=list(RefDict(table, CodeField, ValueField)))
+
+def RefLookup(table, CodeField=None, ValueField=None):
+    Key = (TableName(table), CodeField, ValueField)
+    if Key not in Lookups:
+        Mapping = RefDict(table, CodeField, ValueField)
+        Lookups[Key] = (pd.Index(list(Mapping), dtype=object), np.array(list(Mapping.values()) + [None], dtype=object))
+    return Lookups[Key]
+
+## Decode code column of data frame (vectorized, no loop per row)
+def decode(df, column, table, Target=None, CodeField=None, ValueField=None):
+
+    Codes, Values = RefLookup(table, CodeField, ValueField)
+    Position = Codes.get_indexer(df[column].astype(str))
+
+    # not found (-1) point to the last item (None)
+    Position[Position < 0] = len(Values) - 1
+    df[Target or "{}_desc".format(column)] = Values[Position]
+    return df
@@ -0,0 +1,267 @@
+from function.AllFunction import *
+from collections import defaultdict
+from bisect import bisect_left
+from threading import Lock, Timer
+import unicodedata
+import atexit
+import re
+
+# Thai word segmentation (optional : pip install pythainlp)
+try:
+    from pythainlp.tokenize import word_tokenize
+except ImportError:
+    word_tokenize = None
+
+# Declare variable
+INDEX_PATH = "data/search_index_{}.json"
+FUZZY_THRESHOLD = 0.6
+MAX_RESULTS = 50
+# index changed by remote search is written at most once per SAVE_DELAY second (and at exit)
+SAVE_DELAY = 5.0
+
+# Field setting for each index (id fields, name fields)
+INDEX_FIELDS = {
+    "amc" : (["unique_id"], ["name_th", "name_en"]),
+    "fund" : (["proj_id"], ["proj_name_th", "proj_name_en", "proj_abbr_name"]),
+    "class_fund" : (["proj_id", "class_abbr_name"], ["class_abbr_name", "class_name_th", "class_name_en"]),
+    "pvd_fund" : (["proj_id", "fund_id"], ["fund_name_th", "fund_name_en", "proj_name_th", "proj_name_en", "proj_abbr_name"]),
+    "company" : (["unique_id"], ["comp_name_th", "comp_name_en", "name_th", "name_en"]),
+    "person" : (["unique_id"], ["person_name_th", "person_name_en", "full_name_th", "full_name_en", "name_th", "name_en"]),
+    "issuer" : (["issuer_id", "unique_id", "issued_ref_id"], ["issuer_name_th", "issuer_name_en", "IssuerName", "name_th", "name_en"]),
+}
+
+ThaiRun = re.compile("[\u0E00-\u0E7F]+")
+Separator = re.compile(r"[\s\-_/().,&\[\]]+")
+
+def NormalizeName(Name):
+
+    # unicode normalize, lower case and collapse separators
+    Name = unicodedata.normalize("NFKC", "{}".format(Name)).casefold()
+    return Separator.sub(" ", Name).strip()
+
+def TokenizeName(Name):
+
+    Tokens = []
+    for Word in NormalizeName(Name).split(" "):
+        if not Word:
+            continue
+        Tokens.append(Word)
+
+        # Thai has no space between words, split Thai run to word
+        if word_tokenize is not None:
+            for Run in ThaiRun.findall(Word):
+                Tokens.extend(Token for Token in word_tokenize(Run, keep_whitespace=False) if Token != Run)
+
+    return Tokens
+
+def NGrams(Key, Size=3):
+
+    Key = " {} ".format(Key)
+    return {Key[idx:idx + Size] for idx in range(max(len(Key) - Size + 1, 1))}
+
+# Local name index
+## exact  : dict lookup on normalized name
+## prefix : bisect on sorted name / token keys
+## fuzzy  : character trigram (query coverage, dice score)
+class NameIndex:
+    def __init__(self, Kind):
+        self.Kind = Kind
+        self.IdFields, self.NameFields = INDEX_FIELDS[Kind]
+        self.Records = {}
+        self.Exact = defaultdict(set)
+        self.Prefix = defaultdict(set)
+        self.Grams = defaultdict(set)
+        self.GramCount = {}
+        self.PrefixKeys = []
+        self.Dirty = False
+        # built from full bulk listing (index filled only from remote search result can miss name with the same prefix)
+        self.Complete = False
+
+    def RecordId(self, Record):
+        Ids = ["{}".format(Record[Field]) for Field in self.IdFields if Record.get(Field) not in (None, "")]
+        if not Ids:
+            Ids = [NormalizeName(Record.get(Field)) for Field in self.NameFields if Record.get(Field)]
+        return "|".join(Ids)
+
+    def Add(self, Record):
+        if not isinstance(Record, dict):
+            return
+        RecordId = self.RecordId(Record)
+        if not RecordId:
+            return
+        self.Records[RecordId] = Record
+
+        for Field in self.NameFields:
+            if not Record.get(Field):
+                continue
+            Key = NormalizeName(Record[Field])
+            self.Exact[Key].add(RecordId)
+            self.Prefix[Key].add(RecordId)
+            for Token in TokenizeName(Record[Field]):
+                self.Prefix[Token].add(RecordId)
+
+            Compact = Key.replace(" ", "")
+            Grams = NGrams(Compact)
+            for Gram in Grams:
+                self.Grams[Gram].add((RecordId, Compact))
+            self.GramCount[Compact] = len(Grams)
+
+        self.Dirty = True
+
+    def AddMany(self, Records):
+        for Record in (Records or []):
+            self.Add(Record)
+
+    def PrefixSearch(self, Key):
+        if self.Dirty:
+            self.PrefixKeys = sorted(self.Prefix)
+            self.Dirty = False
+
+        Found = set()
+        idx = bisect_left(self.PrefixKeys, Key)
+        while idx < len(self.PrefixKeys) and self.PrefixKeys[idx].startswith(Key):
+            Found |= self.Prefix[self.PrefixKeys[idx]]
+            if len(Found) >= MAX_RESULTS:
+                break
+            idx += 1
+        return Found
+
+    def FuzzySearch(self, Key, Threshold):
+        Compact = Key.replace(" ", "")
+        Grams = NGrams(Compact)
+        Shared = defaultdict(int)
+        for Gram in Grams:
+            for Candidate in self.Grams.get(Gram, ()):
+                Shared[Candidate] += 1
+
+        # score = (share of query trigram found, dice) so partial name still match
+        Score = {}
+        for (RecordId, Name), Count in Shared.items():
+            Cover = float(Count) / len(Grams)
+            Dice = 2.0 * Count / (len(Grams) + self.GramCount[Name])
+            if Cover >= Threshold and (Cover, Dice) > Score.get(RecordId, (0, 0)):
+                Score[RecordId] = (Cover, Dice)
+        return sorted(Score, key=Score.get, reverse=True)[:MAX_RESULTS]
+
+    def Lookup(self, Name, Fuzzy=True, Threshold=FUZZY_THRESHOLD, Prefix=True):
+        Key = NormalizeName(Name)
+        if not Key:
+            return []
+
+        Found = self.Exact.get(Key) or (self.PrefixSearch(Key) if Prefix else set())
+        if Found:
+            return [self.Records[RecordId] for RecordId in sorted(Found)][:MAX_RESULTS]
+        if Fuzzy:
+            return [self.Records[RecordId] for RecordId in self.FuzzySearch(Key, Threshold)]
+        return []
+
+    def Save(self, Path=None):
+        Path = Path or INDEX_PATH.format(self.Kind)
+        os.makedirs(os.path.dirname(Path), exist_ok=True)
+        TempPath = "{}.tmp".format(Path)
+        with open(TempPath, "w", encoding="utf-8") as file:
+            json.dump({"complete" : self.Complete, "records" : list(self.Records.values())}, file, ensure_ascii=False)
+        os.replace(TempPath, Path)
+
+    def Load(self, Path=None):
+        Path = Path or INDEX_PATH.format(self.Kind)
+        if os.path.isfile(Path):
+            with open(Path, "r", encoding="utf-8") as file:
+                Saved = json.load(file)
+            # index file of older version is a list of record
+            if isinstance(Saved, list):
+                Saved = {"complete" : False, "records" : Saved}
+            self.AddMany(Saved["records"])
+            self.Complete = Saved["complete"]
+        return self
+
+# Loaded index (lazy load from data folder), every read / change of loaded index is done with IndexLock
+Indexes = {}
+IndexLock = Lock()
+SaveTimers = {}
+
+def GetIndex(Kind):
+    with IndexLock:
+        if Kind not in Indexes:
+            Indexes[Kind] = NameIndex(Kind).Load()
+    return Indexes[Kind]
+
+## Search local index : return None when not found (caller will call remote search)
+## only exact / prefix match is used, fuzzy match (near-miss name) must not hide the result of remote search
+## prefix match is used only when index is built from bulk listing (remote result alone is exact match only)
+def SearchLocal(Kind, Name, Fuzzy=False):
+    Index = GetIndex(Kind)
+    with IndexLock:
+        Found = Index.Lookup(Name, Fuzzy=Fuzzy, Prefix=Index.Complete or Fuzzy)
+    return Found if Found else None
+
+def SaveIndex(Kind):
+    with IndexLock:
+        SaveTimers.pop(Kind, None)
+        if Kind in Indexes:
+            Indexes[Kind].Save()
+
+## Write every index with pending change now
+def FlushIndex():
+    for Kind in list(SaveTimers):
+        Pending = SaveTimers.get(Kind)
+        if Pending is not None:
+            Pending.cancel()
+            SaveIndex(Kind)
+
+atexit.register(FlushIndex)
+
+## Keep remote search result in local index (file is written later by timer, not on every search)
+def RememberRemote(Kind, resp):
+    if resp:
+        Index = GetIndex(Kind)
+        with IndexLock:
+            Index.AddMany(resp if isinstance(resp, list) else [resp])
+            if Kind not in SaveTimers:
+                SaveTimers[Kind] = Timer(SAVE_DELAY, SaveIndex, [Kind])
+                SaveTimers[Kind].daemon = True
+                SaveTimers[Kind].start()
+
+## Build local index from bulk listing
+@Traced()
+def BuildSearchIndex(Kinds=("amc", "fund", "pvd_fund", "company"), MaxWorkers=8):
+
+    # import here (wrapper module also import this module)
+    from function.FundFactsheet import fund_factsheet_amc, fund_factsheet_fund, fund_factsheet_class_fund
+    from function.PVDFactSheet import pvd_factsheet_amc, pvd_factsheet_fund
+    from function.LicenseCheck import licensecheck_lcs_company
+
+    for Kind in Kinds:
+        Index = NameIndex(Kind)
+
+        if Kind == "amc":
+            Index.AddMany(fund_factsheet_amc())
+
+        elif Kind in ("fund", "class_fund"):
+            amc = fund_factsheet_amc() or []
+            FundIndex = NameIndex("fund")
+            for resp in RunConcurrent(fund_factsheet_fund, [row["unique_id"] for row in amc], MaxWorkers):
+                FundIndex.AddMany(resp)
+
+            if Kind == "fund":
+                Index = FundIndex
+            else:
+                for resp in RunConcurrent(fund_factsheet_class_fund, list(FundIndex.Records), MaxWorkers):
+                    Index.AddMany(resp)
+
+        elif Kind == "pvd_fund":
+            amc = pvd_factsheet_amc() or []
+            for resp in RunConcurrent(pvd_factsheet_fund, [row["unique_id"] for row in amc], MaxWorkers):
+                Index.AddMany(resp)
+
+        elif Kind == "company":
+            Index.AddMany(licensecheck_lcs_company(None))
+
+        # issuer has no bulk listing, it is filled from remote search result
+        else:
+            Index = GetIndex(Kind)
+        Index.Complete = Index.Complete or Kind in ("amc", "fund", "class_fund", "pvd_fund", "company")
+
+        Index.Save()
+        Indexes[Kind] = Index
+        Log("info", "Search index [{}] : {} records".format(Kind, len(Index.Records)))
@@ -0,0 +1,69 @@
+from pathlib import Path
+import importlib
+import threading
+import os
+
+# Declare variable
+ENV_FILE = ".env"
+DEFAULT_URL = "https://api.sec.or.th"
+
+## Setting of every module : .env is read once at first use (value already in environment is not replaced)
+class Settings:
+    def __init__(self, EnvFile=ENV_FILE):
+        self.EnvFile = EnvFile
+        self.Loaded = False
+        self.Lock = threading.Lock()
+        self.HeaderCache = {}
+
+    def Load(self):
+        if not self.Loaded:
+            with self.Lock:
+                if not self.Loaded:
+                    try:
+                        from dotenv import load_dotenv
+                        load_dotenv(Path(self.EnvFile))
+                    except ImportError:
+                        pass
+                    self.Loaded = True
+        return self
+
+    def Get(self, Name, Default=None):
+        self.Load()
+        return os.getenv(Name, Default)
+
+    ## Base URL of API product : Setting.ApiUrl("/FundFactsheet")
+    def ApiUrl(self, Product):
+        return (self.Get("Url") or DEFAULT_URL) + Product
+
+    ## Request header with subscription key of API product (same dict for every module of product)
+    def Headers(self, KeyName):
+        if KeyName not in self.HeaderCache:
+            self.HeaderCache[KeyName] = {
+                "Content-type":"application/json",
+                "Accept":"application/json",
+                "Accept-Encoding" : "gzip, deflate",
+                "Ocp-Apim-Subscription-Key" : self.Get(KeyName),
+            }
+        return self.HeaderCache[KeyName]
+
+Setting = Settings()
+
+## Module imported at first attribute access : pd = LazyModule("pandas")
+class LazyModule:
+    def __init__(self, Name):
+        object.__setattr__(self, "_Name", Name)
+        object.__setattr__(self, "_Module", None)
+
+    def _Load(self):
+        if self._Module is None:
+            object.__setattr__(self, "_Module", importlib.import_module(self._Name))
+        return self._Module
+
+    def __getattr__(self, Attribute):
+        return getattr(self._Load(), Attribute)
+
+    def __setattr__(self, Attribute, Value):
+        setattr(self._Load(), Attribute, Value)
+
+    def __repr__(self):
+        return "<lazy module '{}'{}>".format(self._Name, "" if self._Module is None else " (loaded)")
@@ -0,0 +1,170 @@
+from function.AllFunction import *
+import hashlib
+import glob
+
+# Declare variable
+SNAPSHOT_PATH = "data/snapshot"
+RMF_FUNDS_PATH = str(Path(__file__).resolve().parents[3] / "data" / "rmf-funds")
+
+# record key : class symbol first (class of the same fund share proj_id)
+KEY_FIELDS = ["symbol", "proj_id", "fund_id"]
+PROJ_ID_FIELDS = ["proj_id", "fund_id"]
+
+# field that change every run without any change of fund data
+IGNORE_FIELDS = ["data_fetched_at", "errors"]
+
+# section : top level field of fund record (field not listed is in section "other")
+SECTIONS = {
+    "metadata" : ["symbol", "fund_name", "amc", "metadata", "category", "suitability", "risk_factors", "involved_parties", "document_urls", "investment_minimums"],
+    "fee" : ["fees"],
+    "asset" : ["asset_allocation", "top_holdings"],
+    "nav" : ["latest_nav", "nav_history_30d", "dividends"],
+    "performance" : ["performance", "benchmark", "risk_metrics"],
+}
+FIELD_SECTION = {Field : Section for Section, Fields in SECTIONS.items() for Field in Fields}
+
+def HashValue(Value):
+    return hashlib.sha1(json.dumps(Value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+def RecordKey(Record, Fields=KEY_FIELDS):
+    return next(("{}".format(Record[Field]) for Field in Fields if Record.get(Field)), None)
+
+## Hash of every field (dict field is hashed one level deeper : "latest_nav.last_val")
+def HashFields(Record):
+    Hashes = {}
+    for Field, Value in Record.items():
+        if Field in IGNORE_FIELDS:
+            continue
+        if isinstance(Value, dict) and Value:
+            for SubField, SubValue in Value.items():
+                Hashes["{}.{}".format(Field, SubField)] = HashValue(SubValue)
+        else:
+            Hashes[Field] = HashValue(Value)
+    return Hashes
+
+## Snapshot index : key -> {proj_id, hash, section hash, field hash} (enough to diff without old record)
+def IndexSnapshot(Records):
+    Index = {}
+    for Record in (Records.values() if isinstance(Records, dict) else Records):
+        Key = RecordKey(Record)
+        if Key is None:
+            continue
+        Fields = HashFields(Record)
+        Sections = {}
+        for Field, Hash in sorted(Fields.items()):
+            Sections.setdefault(FIELD_SECTION.get(Field.split(".")[0], "other"), []).append(Hash)
+        Index[Key] = {
+            "proj_id" : RecordKey(Record, PROJ_ID_FIELDS),
+            "hash" : HashValue(sorted(Fields.items())),
+            "sections" : {Section : HashValue(Hashes) for Section, Hashes in Sections.items()},
+            "fields" : Fields,
+        }
+    return Index
+
+## Load fund record of snapshot (folder of json file or one json file of list)
+def LoadSnapshot(Path=RMF_FUNDS_PATH):
+    Files = sorted(glob.glob(os.path.join(Path, "*.json"))) if os.path.isdir(Path) else [Path]
+    Records = {}
+    for File in Files:
+        with open(File, "r", encoding="utf-8") as file:
+            Data = json.load(file)
+        for Record in (Data if isinstance(Data, list) else [Data]):
+            if isinstance(Record, dict) and RecordKey(Record) is not None:
+                Records[RecordKey(Record)] = Record
+    return Records
+
+def FieldValue(Record, Field):
+    Value = Record
+    for Part in Field.split("."):
+        Value = Value.get(Part) if isinstance(Value, dict) else None
+    return Value
+
+## Compare two snapshot index (one pass over each index)
+## New record is used to attach changed value to event (optional)
+def DiffSnapshot(Old, New, Records=None):
+    Events = []
+    for Key, Item in New.items():
+        if Key not in Old:
+            Events.append({"event" : "added", "key" : Key, "proj_id" : Item["proj_id"], "sections" : sorted(Item["sections"]),
+                           "record" : Records.get(Key) if Records else None})
+        elif Old[Key]["hash"] != Item["hash"]:
+            OldFields, NewFields = Old[Key]["fields"], Item["fields"]
+            Fields = sorted(Field for Field in set(OldFields) | set(NewFields) if OldFields.get(Field) != NewFields.get(Field))
+            Sections = sorted(Section for Section in set(Old[Key]["sections"]) | set(Item["sections"])
+                              if Old[Key]["sections"].get(Section) != Item["sections"].get(Section))
+            Change = {"event" : "modified", "key" : Key, "proj_id" : Item["proj_id"], "sections" : Sections, "fields" : Fields}
+            if Records and Key in Records:
+                Change["values"] = {Field : FieldValue(Records[Key], Field) for Field in Fields if Field in NewFields}
+                Change["removed_fields"] = [Field for Field in Fields if Field not in NewFields]
+            Events.append(Change)
+    for Key in Old:
+        if Key not in New:
+            Events.append({"event" : "removed", "key" : Key, "proj_id" : Old[Key].get("proj_id")})
+    return Events
+
+## Apply change event to record of last snapshot (for loader that keep record in memory)
+def ApplyChanges(Records, Events):
+    for Change in Events:
+        if Change["event"] == "removed":
+            Records.pop(Change["key"], None)
+        elif Change["event"] == "added":
+            Records[Change["key"]] = Change["record"]
+        else:
+            Record = Records.setdefault(Change["key"], {})
+            for Field in Change.get("removed_fields", []):
+                Parts = Field.split(".")
+                Parent = FieldValue(Record, ".".join(Parts[:-1])) if len(Parts) > 1 else Record
+                if isinstance(Parent, dict):
+                    Parent.pop(Parts[-1], None)
+            for Field, Value in Change.get("values", {}).items():
+                Parts = Field.split(".")
+                Target = Record
+                for Part in Parts[:-1]:
+                    if not isinstance(Target.get(Part), dict):
+                        Target[Part] = {}
+                    Target = Target[Part]
+                Target[Parts[-1]] = Value
+    return Records
+
+def SnapshotIndexPath(Name):
+    return os.path.join(SNAPSHOT_PATH, "{}.index.json".format(Name))
+
+def LoadSnapshotIndex(Name):
+    if os.path.isfile(SnapshotIndexPath(Name)):
+        with open(SnapshotIndexPath(Name), "r", encoding="utf-8") as file:
+            return json.load(file)
+    return {}
+
+## Diff snapshot against last run, keep new index and append event to change feed
+@Traced()
+def SyncSnapshot(Path=RMF_FUNDS_PATH, Name="rmf-funds"):
+
+    Records = LoadSnapshot(Path)
+    Index = IndexSnapshot(Records)
+    Events = DiffSnapshot(LoadSnapshotIndex(Name), Index, Records)
+
+    Now = datetime.now().isoformat()
+    Count = {Event : 0 for Event in ("added", "modified", "removed")}
+    for Change in Events:
+        Change["detected_at"] = Now
+        Count[Change["event"]] += 1
+    Log("info", "Snapshot [{}] : {} fund ({} added, {} modified, {} removed)".format(Name, len(Index), Count["added"], Count["modified"], Count["removed"]))
+
+    os.makedirs(SNAPSHOT_PATH, exist_ok=True)
+    with open(SnapshotIndexPath(Name), "w", encoding="utf-8") as file:
+        json.dump(Index, file, ensure_ascii=False)
+    with open(os.path.join(SNAPSHOT_PATH, "{}.changes.jsonl".format(Name)), "a", encoding="utf-8") as file:
+        for Change in Events:
+            file.write(json.dumps(Change, ensure_ascii=False, default=str) + "\n")
+
+    return Events
+
+## Read change feed (optionally only change after Since)
+def ReadSnapshotChanges(Name="rmf-funds", Since=None):
+    Path = os.path.join(SNAPSHOT_PATH, "{}.changes.jsonl".format(Name))
+    if not os.path.isfile(Path):
+        return []
+    with open(Path, "r", encoding="utf-8") as file:
+        Events = [json.loads(Line) for Line in file if Line.strip()]
+    Since = Since.isoformat() if isinstance(Since, datetime) else Since
+    return [Change for Change in Events if Since is None or Change["detected_at"] > Since]
@@ -0,0 +1,116 @@
+from function.AllFunction import *
+from threading import Lock
+import pyarrow.dataset as ds
+import pyarrow as pa
+
+# Columnar table store (parquet : pip install pyarrow)
+## data/<table name>/<partition column>=<value>/*.parquet
+
+# Declare variable
+STORE_PATH = "data"
+ManifestLock = Lock()
+
+def TablePath(Name):
+    return os.path.join(STORE_PATH, Name)
+
+## Flatten API response (list of dict) to data frame and add key column
+def FlattenResponse(resp, **Keys):
+    if not resp:
+        return pd.DataFrame()
+    df = pd.json_normalize(resp if isinstance(resp, list) else [resp])
+    for Key, Value in Keys.items():
+        df[Key] = Value
+    return df
+
+def ToText(Value):
+    if Value is None or isinstance(Value, str):
+        return Value
+    if isinstance(Value, (list, dict)):
+        return json.dumps(Value, ensure_ascii=False)
+    return None if pd.isna(Value) else "{}".format(Value)
+
+## Keep column type the same in every file (text as string, number as float)
+def PrepareTable(df):
+    df = df.copy()
+    for Column in df.columns:
+        if pd.api.types.is_bool_dtype(df[Column]):
+            continue
+        elif df[Column].isna().all():
+            # empty column has no type, it take type of other file when read
+            df[Column] = pd.Series([None] * len(df), index=df.index, dtype=object)
+        elif pd.api.types.is_numeric_dtype(df[Column]):
+            df[Column] = df[Column].astype("float64")
+        else:
+            df[Column] = df[Column].map(ToText).astype("string")
+    return df
+
+## Append rows to table (new file per write, old file is never rewritten)
+@Traced()
+def AppendTable(df, Name, PartitionCols=None):
+    if df is None or df.empty:
+        return
+    df = df.copy()
+    for Column in (PartitionCols or []):
+        df[Column] = df[Column].astype("string")
+    df = PrepareTable(df)
+    os.makedirs(TablePath(Name), exist_ok=True)
+
+    if PartitionCols:
+        df.to_parquet(TablePath(Name), partition_cols=PartitionCols, index=False)
+    else:
+        FileName = "part-{}.parquet".format(datetime.now().strftime("%Y%m%d%H%M%S%f"))
+        df.to_parquet(os.path.join(TablePath(Name), FileName), index=False)
+
+## Replace whole table
+@Traced()
+def WriteTable(df, Name):
+    if os.path.isdir(TablePath(Name)):
+        for Root, Dirs, Files in os.walk(TablePath(Name), topdown=False):
+            for File in Files:
+                os.remove(os.path.join(Root, File))
+            for Dir in Dirs:
+                os.rmdir(os.path.join(Root, Dir))
+    AppendTable(df, Name)
+
+## Replace rows of Keys (Key column) and keep other rows
+@Traced()
+def UpsertTable(df, Name, Key, Keys):
+    Old = ReadTable(Name)
+    if not Old.empty:
+        Old = Old[~Old[Key].isin(list(Keys))]
+    Frames = [Frame for Frame in (Old, df) if Frame is not None and not Frame.empty]
+    WriteTable(pd.concat(Frames, ignore_index=True) if Frames else pd.DataFrame(), Name)
+
+## Remove one partition (use before rewrite partition of the same key)
+def DropPartition(Name, Column, Value):
+    Path = os.path.join(TablePath(Name), "{}={}".format(Column, Value))
+    if os.path.isdir(Path):
+        for File in os.listdir(Path):
+            os.remove(os.path.join(Path, File))
+        os.rmdir(Path)
+
+@Traced()
+def ReadTable(Name, Columns=None, Filters=None):
+    if not os.path.isdir(TablePath(Name)) or not any(Files for Root, Dirs, Files in os.walk(TablePath(Name))):
+        return pd.DataFrame()
+
+    # column can be added by later file, read with schema of every file
+    Dataset = ds.dataset(TablePath(Name), format="parquet", partitioning="hive")
+    Schema = pa.unify_schemas([Fragment.physical_schema for Fragment in Dataset.get_fragments()] + [Dataset.partitioning.schema], promote_options="permissive")
+    return pd.read_parquet(TablePath(Name), columns=Columns, filters=Filters, schema=Schema)
+
+## Manifest of fetched key (use to skip key already stored)
+def ManifestPath(Name):
+    return os.path.join(STORE_PATH, "manifest", "{}.json".format(Name))
+
+def LoadManifest(Name):
+    if os.path.isfile(ManifestPath(Name)):
+        with open(ManifestPath(Name), "r", encoding="utf-8") as file:
+            return set(json.load(file))
+    return set()
+
+def SaveManifest(Name, Keys):
+    with ManifestLock:
+        os.makedirs(os.path.dirname(ManifestPath(Name)), exist_ok=True)
+        with open(ManifestPath(Name), "w", encoding="utf-8") as file:
+            json.dump(sorted(Keys), file, ensure_ascii=False)
@@ -0,0 +1,157 @@
+from function.Settings import Setting
+from functools import wraps
+import threading
+import atexit
+import json
+import time
+import os
+
+# Tracing span of crawl job / stage / API call, export as OTLP JSON (one ExportTraceServiceRequest per line)
+TRACE = Setting.Get("Trace", "0") == "1"
+TRACE_FILE = Setting.Get("TraceFile", "data/trace/traces.jsonl")
+SERVICE_NAME = "sec-api-example"
+SPAN_KIND = {"internal" : 1, "server" : 2, "client" : 3}
+
+TraceState = threading.local()
+Finished = []
+TraceLock = threading.Lock()
+
+def SpanStack():
+    if not hasattr(TraceState, "Stack"):
+        TraceState.Stack = []
+    return TraceState.Stack
+
+def CurrentSpan():
+    Stack = SpanStack()
+    return Stack[-1] if Stack else None
+
+## Span : with Span("stage name", key=value): ... (do nothing when Trace=1 is not set in .env)
+class Span:
+    def __init__(self, Name, Kind="internal", **Attributes):
+        self.Name = Name
+        self.Kind = Kind
+        self.Attributes = Attributes
+        self.Status = None
+
+    def __enter__(self):
+        if not TRACE:
+            return self
+        Parent = CurrentSpan()
+        self.TraceId = Parent.TraceId if Parent else os.urandom(16).hex()
+        self.ParentId = Parent.SpanId if Parent else None
+        self.SpanId = os.urandom(8).hex()
+        self.Start = time.time_ns()
+        SpanStack().append(self)
+        return self
+
+    def __exit__(self, Type, Value, Traceback):
+        if not TRACE:
+            return False
+        self.End = time.time_ns()
+        if Type is not None:
+            self.Status = (2, "{}: {}".format(Type.__name__, Value))
+        Stack = SpanStack()
+        if self in Stack:
+            Stack.remove(self)
+        with TraceLock:
+            Finished.append(self)
+        if self.ParentId is None:
+            ExportTrace(self.TraceId)
+        return False
+
+    def SetAttribute(self, Key, Value):
+        self.Attributes[Key] = Value
+
+## Use span of other thread as parent (worker thread of RunConcurrent)
+class Attach:
+    def __init__(self, Parent):
+        self.Parent = Parent
+
+    def __enter__(self):
+        if self.Parent is not None:
+            SpanStack().append(self.Parent)
+        return self.Parent
+
+    def __exit__(self, *Error):
+        if self.Parent is not None and SpanStack() and SpanStack()[-1] is self.Parent:
+            SpanStack().pop()
+        return False
+
+## Decorator : run function in a span named Name (default : function name)
+def Traced(Name=None):
+    def Decorator(Function):
+        @wraps(Function)
+        def Wrapper(*Args, **Kwargs):
+            if not TRACE:
+                return Function(*Args, **Kwargs)
+            with Span(Name or Function.__name__):
+                return Function(*Args, **Kwargs)
+        return Wrapper
+    return Decorator
+
+def AttributeValue(Value):
+    if isinstance(Value, bool):
+        return {"boolValue" : Value}
+    if isinstance(Value, int):
+        return {"intValue" : str(Value)}
+    if isinstance(Value, float):
+        return {"doubleValue" : Value}
+    return {"stringValue" : "{}".format(Value)}
+
+def SpanRecord(Item):
+    Record = {
+        "traceId" : Item.TraceId,
+        "spanId" : Item.SpanId,
+        "name" : Item.Name,
+        "kind" : SPAN_KIND.get(Item.Kind, 1),
+        "startTimeUnixNano" : str(Item.Start),
+        "endTimeUnixNano" : str(Item.End),
+        "attributes" : [{"key" : Key, "value" : AttributeValue(Value)} for Key, Value in Item.Attributes.items() if Value is not None],
+        "status" : {"code" : Item.Status[0], "message" : Item.Status[1]} if Item.Status else {"code" : 0},
+    }
+    if Item.ParentId:
+        Record["parentSpanId"] = Item.ParentId
+    return Record
+
+## Write finished span of trace (every trace when TraceId is None) to TraceFile
+def ExportTrace(TraceId=None):
+    with TraceLock:
+        Spans = [Item for Item in Finished if TraceId is None or Item.TraceId == TraceId]
+        Finished[:] = [Item for Item in Finished if Item not in Spans]
+    if not Spans:
+        return
+    Request = {"resourceSpans" : [{
+        "resource" : {"attributes" : [{"key" : "service.name", "value" : {"stringValue" : SERVICE_NAME}}]},
+        "scopeSpans" : [{"scope" : {"name" : SERVICE_NAME}, "spans" : [SpanRecord(Item) for Item in Spans]}],
+    }]}
+    os.makedirs(os.path.dirname(TRACE_FILE) or ".", exist_ok=True)
+    with TraceLock:
+        with open(TRACE_FILE, "a", encoding="utf-8") as file:
+            file.write(json.dumps(Request, ensure_ascii=False) + "\n")
+
+## Read span of exported trace (last trace when TraceId is None)
+def ReadTrace(TraceId=None, Path=None):
+    Spans = []
+    with open(Path or TRACE_FILE, "r", encoding="utf-8") as file:
+        for Line in file:
+            for Resource in json.loads(Line)["resourceSpans"]:
+                for Scope in Resource["scopeSpans"]:
+                    Spans += Scope["spans"]
+    TraceId = TraceId or (Spans[-1]["traceId"] if Spans else None)
+    return [Item for Item in Spans if Item["traceId"] == TraceId]
+
+## Critical path : from root, follow the child that end last (the child that decide when parent end)
+def CriticalPath(TraceId=None, Path=None):
+    Spans = ReadTrace(TraceId, Path)
+    Children = {}
+    for Item in Spans:
+        Children.setdefault(Item.get("parentSpanId"), []).append(Item)
+    Chain = []
+    Node = max(Children.get(None, []), key=lambda Item: int(Item["endTimeUnixNano"]), default=None)
+    while Node is not None:
+        Chain.append({"name" : Node["name"], "duration_ms" : (int(Node["endTimeUnixNano"]) - int(Node["startTimeUnixNano"])) / 1e6})
+        Node = max(Children.get(Node["spanId"], []), key=lambda Item: int(Item["endTimeUnixNano"]), default=None)
+    return Chain
+
+if TRACE:
+    atexit.register(ExportTrace)
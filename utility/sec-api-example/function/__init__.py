@@ -0,0 +1,29 @@
+import importlib
+
+# Lazy loader : module of API product is imported (and its setting read) only when first used
+#   from function import fund_factsheet_amc     -> import function.FundFactsheet
+#   import function; function.FundPortSync      -> import function.FundPortSync
+PRODUCT_PREFIX = {
+    "fund_factsheet_" : "FundFactsheet",
+    "fund_dailyinfo_" : "FundDailyInfo",
+    "licensecheck_" : "LicenseCheck",
+    "pvd_factsheet_" : "PVDFactSheet",
+    "digitalasset_" : "DigitalAsset",
+    "onereport_" : "Onereport",
+    "ref_" : "Common",
+    "bond_" : "Bond",
+}
+
+def __getattr__(Name):
+    Module = next((Module for Prefix, Module in PRODUCT_PREFIX.items() if Name.startswith(Prefix)), None)
+    if Module is not None:
+        return getattr(importlib.import_module("{}.{}".format(__name__, Module)), Name)
+    try:
+        return importlib.import_module("{}.{}".format(__name__, Name))
+    except ModuleNotFoundError as e:
+        if e.name != "{}.{}".format(__name__, Name):
+            raise
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, Name)) from None
+
+def __dir__():
+    return sorted(set(globals()) | set(PRODUCT_PREFIX.values()))
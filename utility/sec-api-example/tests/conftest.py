@@ -0,0 +1,36 @@
+from pathlib import Path
+import sys
+import os
+
+import pytest
+
+# client is imported as in Main.py (function.*), setting is read at import so it is set before any test import the client
+CLIENT_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CLIENT_PATH))
+os.environ.setdefault("Verbose", "error")
+os.environ.setdefault("LogLevel", "error")
+os.environ.setdefault("Hedge", "0")
+
+## Every test run in its own folder (data/ and log/ of client are relative to working folder)
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+## Fresh circuit breaker / in-flight limit of every API product
+@pytest.fixture
+def client_state(monkeypatch):
+    import function.AllFunction as AllFunction
+    monkeypatch.setattr(AllFunction, "Breakers", {})
+    monkeypatch.setattr(AllFunction, "Limiters", {})
+    return AllFunction
+
+## Mock SEC API on free port, client call it through Url
+@pytest.fixture
+def mock_server(monkeypatch, client_state):
+    from function.MockServer import StartMockServer
+    Server = StartMockServer(0, auth=False)
+    monkeypatch.setenv("Url", "http://127.0.0.1:{}".format(Server.server_address[1]))
+    yield Server
+    Server.shutdown()
+    Server.server_close()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from function.AllFunction import AdaptiveLimit, AIMD_START_LIMIT, AIMD_MIN_LIMIT
+
+## One call of Latency second with StatusCode
+def Call(Limiter, StatusCode=200, Latency=0.01):
+    Limiter.Acquire()
+    Limiter.Release(time.time() - Latency, StatusCode)
+
+def test_healthy_call_increase_limit_by_one_per_round():
+    Limiter = AdaptiveLimit("Test")
+    for _ in range(AIMD_START_LIMIT):
+        Call(Limiter)
+    assert AIMD_START_LIMIT + 0.9 < Limiter.Limit < AIMD_START_LIMIT + 1
+    assert Limiter.InFlight == 0
+
+@pytest.mark.parametrize("StatusCode", [429, 503, None])
+def test_overload_halve_limit_once_per_round_trip(StatusCode):
+    Limiter = AdaptiveLimit("Test")
+    Call(Limiter, Latency=0.05)
+    Call(Limiter, StatusCode)
+    Limit = Limiter.Limit
+    assert Limit == pytest.approx((AIMD_START_LIMIT + 1.0 / AIMD_START_LIMIT) / 2)
+
+    # call of the same burst does not decrease again
+    Call(Limiter, StatusCode)
+    assert Limiter.Limit == Limit
+    time.sleep(0.06)
+    Call(Limiter, StatusCode)
+    assert Limiter.Limit == pytest.approx(Limit / 2)
+    for _ in range(3):
+        time.sleep(0.06)
+        Call(Limiter, StatusCode)
+    assert Limiter.Limit == AIMD_MIN_LIMIT
+
+def test_gradual_slow_down_is_latency_spike():
+    Limiter = AdaptiveLimit("Test")
+    for _ in range(5):
+        Call(Limiter, Latency=0.001)
+    Limit, Baseline = Limiter.Limit, Limiter.Latency
+    for _ in range(6):
+        Call(Limiter, Latency=0.05)
+    assert Limiter.Limit < Limit
+    assert Limiter.Latency == Baseline
+
+def test_slow_latency_become_normal_at_minimum_limit():
+    Limiter = AdaptiveLimit("Test")
+    Call(Limiter, Latency=0.001)
+    for _ in range(20):
+        time.sleep(0.002)
+        Call(Limiter, Latency=0.05)
+    assert Limiter.Limit >= AIMD_MIN_LIMIT
+    assert Limiter.Latency == pytest.approx(0.05, rel=0.1)
+    Limit = Limiter.Limit
+    Call(Limiter, Latency=0.05)
+    assert Limiter.Limit > Limit
+
+def test_acquire_wait_for_free_slot():
+    Limiter = AdaptiveLimit("Test")
+    Limiter.Limit = 1.0
+    Start = Limiter.Acquire()
+    Acquired = threading.Event()
+    Thread = threading.Thread(target=lambda: Limiter.Acquire() and Acquired.set())
+    Thread.start()
+    assert not Acquired.wait(0.1)
+    Limiter.Release(Start, 200)
+    assert Acquired.wait(1)
+    Thread.join()
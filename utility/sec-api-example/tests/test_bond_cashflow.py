@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import function.BondCashFlow as BondCashFlow
+from function.Store import AppendTable
+
+def Term(Rows):
+    df = pd.DataFrame(Rows, columns=["issued_ref_id", "rate", "frequency", "issue_date", "maturity_date", "par"]).set_index("issued_ref_id")
+    df["issue_date"] = pd.to_datetime(df["issue_date"])
+    df["maturity_date"] = pd.to_datetime(df["maturity_date"])
+    return df
+
+def Dates(Series):
+    return [str(Date)[:10] for Date in Series]
+
+def test_regular_semi_annual_schedule():
+    Schedule = BondCashFlow.CouponSchedule(Term([("A", 4.0, 2, "2020-01-15", "2023-01-15", 1000.0)]))
+    assert Dates(Schedule["payment_date"]) == ["2020-07-15", "2021-01-15", "2021-07-15", "2022-01-15", "2022-07-15", "2023-01-15"]
+    assert list(Schedule["coupon"]) == [20.0] * 6
+    assert list(Schedule["principal"]) == [0.0] * 5 + [1000.0]
+    assert Schedule["cash_flow"].sum() == pytest.approx(1120.0)
+
+def test_short_first_period_and_month_end():
+    Schedule = BondCashFlow.CouponSchedule(Term([("B", 3.0, 2, "2020-03-01", "2022-01-15", 1000.0),
+                                                  ("C", 2.0, 2, "2020-08-31", "2021-08-31", 1000.0)]))
+    B = Schedule[Schedule["issued_ref_id"] == "B"]
+    assert Dates(B["payment_date"]) == ["2020-07-15", "2021-01-15", "2021-07-15", "2022-01-15"]
+    assert Dates(B["period_start"])[0] == "2020-03-01"
+    C = Schedule[Schedule["issued_ref_id"] == "C"]
+    assert Dates(C["payment_date"]) == ["2021-02-28", "2021-08-31"]
+
+def test_accrued_interest():
+    Bond = Term([("A", 4.0, 2, "2020-01-15", "2023-01-15", 1000.0)])
+    Mid = BondCashFlow.AccruedInterest(Bond, "2020-04-15").iloc[0]
+    assert Dates([Mid["last_coupon_date"], Mid["next_coupon_date"]]) == ["2020-01-15", "2020-07-15"]
+    assert Mid["accrued_interest"] == pytest.approx(20.0 * 91 / 182)
+
+    assert BondCashFlow.AccruedInterest(Bond, "2020-07-15").iloc[0]["accrued_interest"] == 0.0
+    Matured = BondCashFlow.AccruedInterest(Bond, "2023-06-01").iloc[0]
+    assert Matured["accrued_interest"] == 0.0 and Matured["remaining_life_year"] == 0.0
+
+def test_maturity_from_redemption_table():
+    AppendTable(pd.DataFrame({"issued_ref_id" : ["A"], "coupon_rate" : ["4.0"], "coupon_frequency" : ["2"], "issue_date" : ["2020-01-15"]}),
+                BondCashFlow.TABLE_NAME.format("coupon"))
+    AppendTable(pd.DataFrame({"issued_ref_id" : ["A"], "redemption_date" : ["2023-01-15"]}), BondCashFlow.TABLE_NAME.format("redemption"))
+    Loaded = BondCashFlow.LoadIssueTerm()
+    assert str(Loaded.loc["A", "maturity_date"])[:10] == "2023-01-15"
+    assert Loaded.loc["A", "par"] == BondCashFlow.DEFAULT_PAR
+    assert np.array_equal(BondCashFlow.CouponSchedule(Loaded)["coupon"].values, np.full(6, 20.0))
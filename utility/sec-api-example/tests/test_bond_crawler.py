@@ -0,0 +1,63 @@
+import function.BondCrawler as BondCrawler
+from function.Store import ReadTable
+
+def EndpointCalls(Server, Name):
+    return sum(Server.Api.Stats["endpoint"].get(Name, {}).values())
+
+def test_universe_keep_new_issue_only(mock_server):
+    First = BondCrawler.DiscoverBondIssue(["PTT"], ["CPALL"])
+    Again = BondCrawler.DiscoverBondIssue(["PTT", "SCB"])
+    Stored = ReadTable(BondCrawler.TABLE_NAME.format("issue"))
+    assert len(Stored) == Stored["issued_ref_id"].nunique() == len(set(First["issued_ref_id"]) | set(Again["issued_ref_id"]))
+    assert BondCrawler.IssueUniverse() == sorted(Stored["issued_ref_id"])
+
+def test_detail_of_crawled_issue_is_not_fetched_again(mock_server):
+    BondCrawler.DiscoverBondIssue(["PTT"])
+    BondCrawler.CrawlBondDetail(Sections=["coupon", "redemption"])
+    Calls = EndpointCalls(mock_server, "bond_outs_coupon")
+    assert Calls == len(BondCrawler.IssueUniverse())
+
+    BondCrawler.CrawlBondDetail(Sections=["coupon", "redemption"])
+    assert EndpointCalls(mock_server, "bond_outs_coupon") == Calls
+    assert set(ReadTable(BondCrawler.TABLE_NAME.format("coupon"))["issued_ref_id"]) == set(BondCrawler.IssueUniverse())
+
+def test_backfill_call_only_missing_date(mock_server):
+    BondCrawler.DiscoverBondIssue(["SCB"])
+    Issues = BondCrawler.IssueUniverse()
+    BondCrawler.BackfillOutstanding("2024-01-01", "2024-01-03")
+    BondCrawler.BackfillOutstanding("2024-01-01", "2024-01-05")
+    # 2024-01-01 .. 2024-01-05 : 5 business day, each date called once
+    assert EndpointCalls(mock_server, "bond_outs_outstanding_value") == 5 * len(Issues)
+
+    Series = BondCrawler.OutstandingSeries()
+    assert list(Series.index) == ["2024-01-0{}".format(Day) for Day in range(1, 6)]
+    assert sorted(Series.columns) == Issues
+    Portfolio = BondCrawler.PortfolioOutstanding({Issues[0] : 2.0})
+    assert (Portfolio == Series[Issues[0]] * 2.0).all()
+
+def test_failed_section_is_fetched_on_resume(mock_server, client_state):
+    BondCrawler.DiscoverBondIssue(["PTT", "SCB", "KBANK"])
+    Issues = BondCrawler.IssueUniverse()
+    mock_server.Api.Configure(error_rate=0.4, seed=3)
+    BondCrawler.CrawlBondDetail(Sections=["coupon", "redemption"], MaxWorkers=2)
+    assert len(set(ReadTable(BondCrawler.TABLE_NAME.format("coupon"))["issued_ref_id"])) < len(Issues)
+
+    # clean rerun (circuit opened by the outage is closed)
+    mock_server.Api.Configure(error_rate=0.0)
+    client_state.Breakers.clear()
+    BondCrawler.CrawlBondDetail(Sections=["coupon", "redemption"])
+    for Section in ("coupon", "redemption"):
+        Stored = ReadTable(BondCrawler.TABLE_NAME.format(Section))
+        assert sorted(Stored["issued_ref_id"]) == Issues
+
+def test_manifest_of_old_version_is_upgraded(mock_server):
+    from function.Store import SaveManifest, LoadManifest
+    BondCrawler.DiscoverBondIssue(["PTT"])
+    Issues = BondCrawler.IssueUniverse()
+    BondCrawler.CrawlBondDetail(Issues[:1], Sections=["coupon"])
+    SaveManifest(BondCrawler.MANIFEST_NAME, Issues[:1])
+
+    BondCrawler.CrawlBondDetail(Issues[:1], Sections=["coupon", "redemption"])
+    assert EndpointCalls(mock_server, "bond_outs_coupon") == 1
+    assert EndpointCalls(mock_server, "bond_outs_redemption") == 1
+    assert LoadManifest(BondCrawler.MANIFEST_NAME) == {"{}|coupon".format(Issues[0]), "{}|redemption".format(Issues[0])}
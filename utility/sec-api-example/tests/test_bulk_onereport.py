@@ -0,0 +1,45 @@
+import pandas as pd
+
+import function.BulkOnereport as BulkOnereport
+from function.MockServer import MOCK_COMPANY
+from function.Store import AppendTable, LoadManifest, SaveManifest
+
+def SectionCalls(Server):
+    return sum(Count for Name, Row in Server.Api.Stats["endpoint"].items() if Name != "onereport_sbo_info" for Count in Row.values())
+
+def test_failed_section_is_fetched_again_on_resume(mock_server):
+    mock_server.Api.Configure(error_rate=0.2, seed=1)
+    Done = BulkOnereport.BulkOnereport([2024], MaxWorkers=4)
+    Total = MOCK_COMPANY * len(BulkOnereport.SECTIONS)
+    First = len([Key for Key in Done if Key.count("|") == 2])
+    assert 0 < First < Total
+
+    mock_server.Api.Configure(error_rate=0.0)
+    Calls = SectionCalls(mock_server)
+    Done = BulkOnereport.BulkOnereport([2024], MaxWorkers=4)
+    assert len([Key for Key in Done if Key.count("|") == 2]) == Total
+    assert SectionCalls(mock_server) - Calls == Total - First
+    assert LoadManifest(BulkOnereport.MANIFEST_NAME) == Done
+
+def test_legacy_manifest_keep_only_stored_section():
+    AppendTable(pd.DataFrame({"unique_id" : ["0000000001"], "report_year" : [2024], "value" : [1.0]}),
+                BulkOnereport.TABLE_NAME.format("cgp_director"), PartitionCols=["report_year"])
+    SaveManifest(BulkOnereport.MANIFEST_NAME, {"2024|0000000001", "2024|sbo_info"})
+
+    Done = BulkOnereport.UpgradeManifest(LoadManifest(BulkOnereport.MANIFEST_NAME))
+    assert Done == {"2024|sbo_info", "2024|0000000001|cgp_director"}
+
+def test_failed_sbo_info_is_fetched_again(mock_server, monkeypatch):
+    import function.Onereport as Onereport
+    Info = Onereport.onereport_sbo_info
+    Calls = []
+    monkeypatch.setattr(Onereport, "onereport_sbo_info", lambda report_year, language: Calls.append(report_year) or None)
+    Done = BulkOnereport.BulkOnereport([2024], Sections=["cgp_director"])
+    assert Done == set() and Calls == [2024]
+
+    monkeypatch.setattr(Onereport, "onereport_sbo_info", lambda report_year, language: Calls.append(report_year) or Info(report_year, language))
+    Calls.clear()
+    Done = BulkOnereport.BulkOnereport([2024], Sections=["cgp_director"])
+    assert Calls == [2024]
+    assert "2024|sbo_info" in Done and len(Done) == MOCK_COMPANY + 1
+    assert len(BulkOnereport.ReadOnereport("sbo_info")) == MOCK_COMPANY
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+import function.AllFunction as AllFunction
+from function.AllFunction import CircuitBreaker, CircuitOpenError
+from function.Settings import Setting
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(AllFunction, "BREAKER_OPEN_SECONDS", 0.05)
+    return CircuitBreaker("Test")
+
+def Fail(Breaker, Count, StatusCode=500, Latency=0.01):
+    for _ in range(Count):
+        Breaker.Allow()
+        Breaker.Record(StatusCode, Latency)
+
+def test_open_when_error_rate_is_high(breaker):
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS // 2, 200)
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS // 2 - 1)
+    assert breaker.State == "closed"
+    Fail(breaker, 1)
+    assert breaker.State == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.Allow()
+    assert breaker.Rejected == 1
+
+@pytest.mark.parametrize("StatusCode", [400, 404, 429])
+def test_client_error_is_not_outage(breaker, StatusCode):
+    Fail(breaker, AllFunction.BREAKER_WINDOW, StatusCode)
+    assert breaker.State == "closed"
+
+def test_slow_call_and_timeout_are_failure(breaker):
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS // 2, 200, Latency=AllFunction.BREAKER_SLOW_CALL + 1)
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS // 2, None)
+    assert breaker.State == "open"
+
+def test_half_open_probe(breaker):
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS)
+    time.sleep(0.06)
+
+    # one probe at a time
+    breaker.Allow()
+    assert breaker.State == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.Allow()
+    breaker.Record(200, 0.01)
+    Fail(breaker, AllFunction.BREAKER_PROBES - 1, 200)
+    assert breaker.State == "closed" and len(breaker.Calls) == 0
+
+def test_failed_probe_open_again(breaker):
+    Fail(breaker, AllFunction.BREAKER_MIN_CALLS)
+    time.sleep(0.06)
+    Fail(breaker, 1, 503)
+    assert breaker.State == "open"
+
+def test_open_circuit_stop_call_to_api(mock_server):
+    mock_server.Api.Configure(error_rate=1.0)
+    Url = Setting.ApiUrl("/FundFactsheet") + "/fund/{}/policy"
+    Result = AllFunction.RunConcurrent(lambda proj_id: AllFunction.RateLimiter.CallGetAPI(self=None, headers={}, url=Url.format(proj_id)),
+                                       ["M{:04d}_2565".format(idx) for idx in range(30)], MaxWorkers=1)
+    assert Result == [None] * 30
+    assert mock_server.Api.Stats["request"] == AllFunction.BREAKER_MIN_CALLS
+    assert AllFunction.BreakerStats()["FundFactsheet"]["state"] == "open"
+
+def test_call_result_of_no_data_failure_and_timeout(mock_server, monkeypatch):
+    Url = Setting.ApiUrl("/FundFactsheet")
+    Get = lambda Path: AllFunction.RateLimiter.CallGetAPI(self=None, headers={}, url=Url + Path, TTL=0)
+    assert Get("/fund/amc/C9999999999") == []
+
+    mock_server.Api.Configure(error_rate=1.0)
+    assert Get("/fund/amc") is None
+
+    # call that hang is failed by read timeout
+    monkeypatch.setattr(AllFunction, "REQUEST_TIMEOUT", (1.0, 0.1))
+    mock_server.Api.Configure(error_rate=0.0, slow_rate=1.0, slow_ms=1000)
+    Start = time.time()
+    assert Get("/fund/amc") is None
+    assert AllFunction.RateLimiter.CallPostAPI(self=None, headers={}, data={"name" : "fund"}, url=Url + "/fund") is None
+    from function.FundFactsheet import fund_factsheet_asset
+    assert fund_factsheet_asset("M0001_2565") is None
+    assert time.time() - Start < 1.0
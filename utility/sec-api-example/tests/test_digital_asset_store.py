@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import function.DigitalAssetStore as DigitalAssetStore
+
+def DailyCalls(Server, Summary):
+    return sum(Server.Api.Stats["endpoint"].get("digitalasset_daily_{}".format(Summary), {}).values())
+
+def test_sync_fetch_only_missing_historical_date(mock_server):
+    Today = datetime.now().strftime("%Y-%m-%d")
+    DigitalAssetStore.SyncDigitalAssetDaily("2024-01-01", "2024-01-10", Summaries=["surv_trade_summary"])
+    DigitalAssetStore.SyncDigitalAssetDaily("2024-01-01", "2024-01-14", Summaries=["surv_trade_summary"])
+    assert DailyCalls(mock_server, "surv_trade_summary") == 14
+
+    # today is never fetched (not final yet)
+    DigitalAssetStore.SyncDigitalAssetDaily(Today, Today, Summaries=["surv_trade_summary"])
+    assert DailyCalls(mock_server, "surv_trade_summary") == 14
+
+    df = DigitalAssetStore.ReadDigitalAssetDaily("surv_trade_summary", "2024-01-03", "2024-01-05")
+    assert sorted(df["trade_date"].dt.strftime("%Y-%m-%d").unique()) == ["2024-01-03", "2024-01-04", "2024-01-05"]
+
+def test_weekly_rollup_of_price_and_value(mock_server):
+    DigitalAssetStore.SyncDigitalAssetDaily("2024-01-01", "2024-01-14", Summaries=["surv_trade_summary"])
+    Daily = DigitalAssetStore.ReadDigitalAssetDaily("surv_trade_summary")
+    Rollup = DigitalAssetStore.RollupDigitalAsset("surv_trade_summary", "W")
+
+    assert len(Rollup) == 2 * Daily["asset"].nunique()
+    Week = Daily[(Daily["asset"] == "BTC") & (Daily["trade_date"] <= pd.Timestamp("2024-01-07"))]
+    Row = Rollup[(Rollup["asset"] == "BTC") & (Rollup["period"] == pd.Timestamp("2024-01-01"))].iloc[0]
+    assert Row["open"] == Week["open"].iloc[0]
+    assert Row["close"] == Week["close"].iloc[-1]
+    assert Row["high"] == Week["high"].max()
+    assert Row["low"] == Week["low"].min()
+    assert Row["value"] == pytest.approx(Week["value"].sum())
+    assert Row["trade_days"] == 7
@@ -0,0 +1,84 @@
+import inspect
+
+import pytest
+
+import function.Endpoints as Endpoints
+from function.Endpoints import ENDPOINTS, REGISTRY, PRODUCTS, FormatPath, EndpointFunctions
+
+## Record call of wrapper instead of calling API
+@pytest.fixture
+def calls(monkeypatch):
+    Calls = []
+
+    class RateLimiter:
+        def CallGetAPI(self, headers, url, TTL=None, Immutable=False, Endpoint=None):
+            Calls.append(("GET", url, None))
+            return []
+
+        def CallPostAPI(self, headers, data, url, Endpoint=None):
+            Calls.append(("POST", url, data))
+            return []
+
+    monkeypatch.setattr(Endpoints, "RateLimiter", RateLimiter)
+    monkeypatch.setattr(Endpoints, "SearchLocal", lambda Kind, Name: None)
+    monkeypatch.setattr(Endpoints, "RememberRemote", lambda Kind, resp: None)
+    monkeypatch.setenv("Url", "http://sec")
+    return Calls
+
+def test_registry_is_consistent():
+    assert len(REGISTRY) == len(ENDPOINTS)
+    for Spec in ENDPOINTS:
+        assert Spec.Product in PRODUCTS
+        assert Spec.Method in ("GET", "POST")
+        assert (Spec.GetIf is None) == (Spec.GetPath is None)
+        assert set(Spec.Defaults) <= set(Spec.Params)
+
+def test_format_path_drop_optional_segment():
+    Path = "/{unique_id}/enforcement/{case_id}"
+    assert FormatPath(Path, {"unique_id" : "C0000000001", "case_id" : None}, {"case_id" : None}) == "/C0000000001/enforcement"
+    assert FormatPath(Path, {"unique_id" : "C0000000001", "case_id" : "12"}, {"case_id" : None}) == "/C0000000001/enforcement/12"
+
+def test_wrapper_signature_and_doc():
+    from function.LicenseCheck import licensecheck_lcs_enforcement, licensecheck_lcs_enforcement_batch
+    assert str(inspect.signature(licensecheck_lcs_enforcement)) == "(unique_id, case_id=None)"
+    assert licensecheck_lcs_enforcement.__doc__ == "GET LicenseCheck/licensee/{unique_id}/enforcement/{case_id}"
+    assert licensecheck_lcs_enforcement.Endpoint is REGISTRY["licensecheck_lcs_enforcement"]
+    assert licensecheck_lcs_enforcement_batch.__module__ == "function.LicenseCheck"
+    with pytest.raises(TypeError):
+        licensecheck_lcs_enforcement()
+
+def test_endpoint_functions_by_name():
+    Functions = EndpointFunctions("Common", "ref_")
+    assert len(Functions) == sum(Spec.Product == "Common" for Spec in ENDPOINTS)
+    assert Functions["role_person"].__name__ == "ref_role_person"
+    assert not any(Name.endswith(("_batch", "_async")) for Name in Functions)
+
+def test_call_url_of_wrapper(calls):
+    from function.FundFactsheet import fund_factsheet_fund, fund_factsheet_class_fund, fund_factsheet_FundPort
+    from function.LicenseCheck import licensecheck_lcs_enforcement, licensecheck_lcs_company
+    fund_factsheet_FundPort("M0001_2565", "202312")
+    licensecheck_lcs_enforcement("C0000000001")
+    fund_factsheet_fund("C0000000001")
+    fund_factsheet_fund("กองทุนเปิด")
+    fund_factsheet_class_fund("M0001_2565")
+    fund_factsheet_class_fund("M1094_2557")
+    fund_factsheet_class_fund("M-RMF")
+    licensecheck_lcs_company(None)
+    licensecheck_lcs_company(CompName="บริษัท")
+    assert calls == [
+        ("GET", "http://sec/FundFactsheet/fund/M0001_2565/FundPort/202312", None),
+        ("GET", "http://sec/LicenseCheck/licensee/C0000000001/enforcement", None),
+        ("GET", "http://sec/FundFactsheet/fund/amc/C0000000001", None),
+        ("POST", "http://sec/FundFactsheet/fund", {"name" : "กองทุนเปิด"}),
+        ("GET", "http://sec/FundFactsheet/fund/M0001_2565/class_fund", None),
+        ("GET", "http://sec/FundFactsheet/fund/M1094_2557/class_fund", None),
+        ("POST", "http://sec/FundFactsheet/fund/class_fund", {"name" : "M-RMF"}),
+        ("GET", "http://sec/LicenseCheck/licensee/company", None),
+        ("POST", "http://sec/LicenseCheck/licensee/company", {"Name" : "บริษัท"}),
+    ]
+
+def test_wrapper_call_mock_api(mock_server):
+    from function.FundFactsheet import fund_factsheet_amc, fund_factsheet_amc_batch
+    Amc = fund_factsheet_amc()
+    assert Amc and all(Item["unique_id"].startswith("C") for Item in Amc)
+    assert fund_factsheet_amc_batch([(), ()]) == [Amc, Amc]
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+import function.FeederGraph as FeederGraph
+import function.SearchIndex as SearchIndex
+
+def Graph(Edges):
+    return pd.DataFrame(Edges, columns=["feeder_id", "master_id", "master_name", "weight"])
+
+def Allocation(Rows):
+    return pd.DataFrame(Rows, columns=["proj_id", "asset_name", "asset_ratio"])
+
+def Effective(df, proj_id):
+    Rows = df[df["proj_id"] == proj_id]
+    return dict(zip(Rows["asset_name"], Rows["asset_ratio"].round(6)))
+
+def test_master_unit_row_is_replaced_by_master_allocation():
+    Edges = Graph([("F", "M", "Master Fund", 0.8)])
+    Alloc = Allocation([("F", "Investment unit of Master Fund", 80.0), ("F", "Cash", 20.0), ("M", "Equity", 50.0), ("M", "Bond", 50.0)])
+    Result = FeederGraph.EffectiveAllocation(Alloc, ["F"], Edges)
+    assert Effective(Result, "F") == {"Cash" : 20.0, "Equity" : 40.0, "Bond" : 40.0}
+    assert sum(Effective(Result, "F").values()) == pytest.approx(100.0)
+
+def test_multi_level_master():
+    Edges = Graph([("F", "M", "M", 1.0), ("M", "G", "G", 0.5)])
+    Alloc = Allocation([("F", "หน่วยลงทุน M", 100.0), ("M", "หน่วยลงทุน G", 50.0), ("M", "Bond", 50.0), ("G", "Equity", 100.0)])
+    Result = FeederGraph.EffectiveAllocation(Alloc, ["F"], Edges)
+    assert Effective(Result, "F") == {"Bond" : 50.0, "Equity" : 50.0}
+
+def test_other_unit_trust_is_kept():
+    Edges = Graph([("F", "M", "Master Fund", 0.6)])
+    Alloc = Allocation([("F", "Unit trust Master Fund", 60.0), ("F", "Unit trust Other Fund", 10.0), ("F", "Cash", 30.0),
+                        ("M", "Equity", 100.0)])
+    Own = FeederGraph.OwnAllocation(Alloc, Edges)
+    assert dict(zip(Own[Own["proj_id"] == "F"]["asset_name"], Own[Own["proj_id"] == "F"]["asset_ratio"])) == {"Unit trust Other Fund" : 10.0, "Cash" : 30.0}
+
+def test_feeder_without_unit_row_is_scaled():
+    Edges = Graph([("F", "M", "Master Fund", 0.5)])
+    Own = FeederGraph.OwnAllocation(Allocation([("F", "Cash", 100.0), ("M", "Equity", 100.0)]), Edges)
+    assert list(Own[Own["proj_id"] == "F"]["asset_ratio"]) == [50.0]
+
+def test_effective_fee():
+    Edges = Graph([("F", "M", "Master Fund", 0.8), ("X", "EXT:Foreign", "Foreign", 1.0)])
+    Fee = FeederGraph.EffectiveFee(pd.Series({"F" : 0.5, "M" : 1.0, "X" : 0.3}), ["F", "X"], Edges)
+    assert Fee.loc["F", "effective_fee"] == pytest.approx(1.3)
+    assert not Fee.loc["F", "unknown_master"]
+    assert Fee.loc["X", "unknown_master"]
+
+def test_build_graph_from_feeder_response(monkeypatch):
+    SearchIndex.Indexes.clear()
+    Response = {"F1" : [{"master_proj_id" : "M1", "invest_ratio" : "95"}], "F2" : {"master_fund_name" : "Global Fund", "invest_ratio" : None},
+                "F3" : None, "F4" : [{"master_proj_id" : "F4"}]}
+    monkeypatch.setattr(FeederGraph, "fund_factsheet_feeder_fund", lambda proj_id: Response[proj_id])
+    Built = FeederGraph.BuildFeederGraph(list(Response), MaxWorkers=2)
+    assert list(zip(Built["feeder_id"], Built["master_id"], Built["weight"])) == [("F1", "M1", 0.95), ("F2", "EXT:Global Fund", 1.0)]
+    SearchIndex.Indexes.clear()
+
+def test_master_without_allocation_is_kept_as_holding():
+    Edges = Graph([("F", "EXT:Foo Global Fund", "Foo Global Fund", 0.97), ("T", "M", "M", 1.0), ("M", "G", "G", 0.9)])
+    Alloc = Allocation([("F", "Investment Unit", 97.0), ("F", "Cash", 3.0),
+                        ("T", "หน่วยลงทุน M", 100.0), ("M", "หน่วยลงทุน G", 90.0), ("M", "Cash", 10.0)])
+    Result = FeederGraph.EffectiveAllocation(Alloc, ["F", "T"], Edges)
+    assert Effective(Result, "F") == {"Investment Unit" : 97.0, "Cash" : 3.0}
+    assert Effective(Result, "T") == {"หน่วยลงทุน G" : 90.0, "Cash" : 10.0}
+    assert Result.groupby("proj_id")["asset_ratio"].sum().tolist() == pytest.approx([100.0, 100.0])
+
+def test_failed_feeder_call_is_checked_again(monkeypatch):
+    SearchIndex.Indexes.clear()
+    Response = {"F1" : [{"master_proj_id" : "M1"}], "F2" : None, "F3" : []}
+    Called = []
+    monkeypatch.setattr(FeederGraph, "MutualFundUniverse", lambda MaxWorkers: pd.DataFrame({"proj_id" : list(Response)}))
+    monkeypatch.setattr(FeederGraph, "fund_factsheet_feeder_fund", lambda proj_id: Called.append(proj_id) or Response[proj_id])
+    assert list(FeederGraph.FeederGraph()["feeder_id"]) == ["F1"]
+
+    Response["F2"] = [{"master_proj_id" : "M2"}]
+    Called.clear()
+    assert sorted(FeederGraph.FeederGraph()["feeder_id"]) == ["F1", "F2"]
+    assert Called == ["F2"]
+    Called.clear()
+    assert sorted(FeederGraph.FeederGraph()["feeder_id"]) == ["F1", "F2"]
+    assert Called == []
+    SearchIndex.Indexes.clear()
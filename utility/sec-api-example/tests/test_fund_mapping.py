@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import function.FundMapping as FundMapping
+
+AMC = [{"unique_id" : "C0000000001", "name_en" : "TEST AMC"}]
+FUNDS = {
+    "C0000000001" : [
+        {"proj_id" : "M0001_2565", "proj_abbr_name" : "TEST-RMF", "proj_name_en" : "Test RMF", "fund_status" : "RG"},
+        {"proj_id" : "M0002_2560", "proj_abbr_name" : "OLD-RMF", "proj_name_en" : "Old RMF", "fund_status" : "CA"},
+        {"proj_id" : "M0003_2565", "proj_abbr_name" : "TEST-SSF", "proj_name_en" : "Test SSF", "fund_status" : "RG"},
+    ],
+}
+CLASS_FUND = {"M0001_2565" : [{"class_abbr_name" : "TEST-RMF"}, {"class_abbr_name" : "TEST-RMF-A"}], "M0002_2560" : []}
+
+@pytest.fixture
+def api(monkeypatch):
+    Calls = {"class_fund" : []}
+    ClassFund = dict(CLASS_FUND)
+
+    def ClassFundOf(proj_id):
+        Calls["class_fund"].append(proj_id)
+        return ClassFund[proj_id]
+
+    monkeypatch.setattr(FundMapping, "fund_factsheet_amc", lambda: AMC)
+    monkeypatch.setattr(FundMapping, "fund_factsheet_fund", lambda unique_id: FUNDS[unique_id])
+    monkeypatch.setattr(FundMapping, "fund_factsheet_class_fund", ClassFundOf)
+    return Calls, ClassFund
+
+def Build(**Args):
+    return FundMapping.BuildFundMapping(OutputPath="data/fund-mapping.json", StatePath="data/state.json", MaxWorkers=2, **Args)
+
+def test_mapping_has_fund_and_class_symbol(api):
+    Data = Build()
+    assert sorted(Data["mapping"]) == ["OLD-RMF", "TEST-RMF", "TEST-RMF-A"]
+    assert Data["mapping"]["TEST-RMF-A"]["proj_id"] == "M0001_2565"
+    assert Data["statistics"]["mapped_symbols"] == 2
+    assert Data["statistics"]["class_symbols"] == 1
+    assert Data["statistics"]["cancelled_funds"] == 1
+    assert Data["generated_at"].endswith("Z")
+    with open("data/fund-mapping.json", "r", encoding="utf-8") as file:
+        assert json.load(file)["mapping"] == Data["mapping"]
+
+def test_unchanged_amc_is_not_rebuilt(api):
+    Calls, _ = api
+    Build()
+    Build()
+    assert sorted(Calls["class_fund"]) == ["M0001_2565", "M0002_2560"]
+
+def test_incomplete_class_fund_is_rebuilt_next_run(api):
+    Calls, ClassFund = api
+    ClassFund["M0001_2565"] = None
+    Data = Build()
+    assert "TEST-RMF-A" not in Data["mapping"]
+    with open("data/state.json", "r", encoding="utf-8") as file:
+        assert json.load(file)["C0000000001"]["hash"] is None
+
+    ClassFund["M0001_2565"] = CLASS_FUND["M0001_2565"]
+    assert "TEST-RMF-A" in Build()["mapping"]
+    assert Calls["class_fund"].count("M0001_2565") == 2
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+import function.FundPortSync as FundPortSync
+from function.FundSchema import HOLDING_TABLE
+
+UNIVERSE = pd.DataFrame({"proj_id" : ["F1", "F2"], "regis_date" : ["2023-06-01", "2010-01-01"]})
+
+@pytest.fixture
+def api(monkeypatch):
+    Api = {"answer" : {}, "calls" : []}
+
+    def FullPort(proj_id, period):
+        Api["calls"].append((proj_id, period))
+        return Api["answer"].get((proj_id, period), [{"secur_name" : "Bond", "percent_nav" : "100"}])
+
+    monkeypatch.setattr(FundPortSync, "MutualFundUniverse", lambda MaxWorkers=8: UNIVERSE)
+    monkeypatch.setitem(FundPortSync.SECTIONS, "full_port", (FullPort, "QE", HOLDING_TABLE))
+    return Api
+
+def Sync():
+    return FundPortSync.SyncFundPort("2023-01-01", "2023-12-31", Sections=["full_port"], MaxWorkers=2)
+
+def test_period_before_fund_start_is_not_checked(api):
+    assert Sync() == {"full_port" : 7}
+    assert sorted(Period for proj_id, Period in api["calls"] if proj_id == "F1") == ["20230630", "20230930", "20231231"]
+    assert FundPortSync.AvailablePeriods()["F1"] == ["20230630", "20230930", "20231231"]
+
+def test_only_no_data_answer_is_recorded_as_miss(api):
+    api["answer"] = {("F1", "20230930") : [], ("F1", "20231231") : None}
+    assert Sync() == {"full_port" : 5}
+    assert FundPortSync.LoadManifest("fund_full_port_miss") == {"F1|20230930"}
+
+    # failed call is fetched again, missed period is not
+    api["answer"], api["calls"] = {}, []
+    assert Sync() == {"full_port" : 1}
+    assert api["calls"] == [("F1", "20231231")]
+
+def test_recent_missing_period_is_checked_again(api, monkeypatch):
+    monkeypatch.setattr(FundPortSync, "MISS_RETRY_DAYS", 100000)
+    api["answer"] = {("F1", "20230930") : []}
+    Sync()
+    assert FundPortSync.LoadManifest("fund_full_port_miss") == set()
+
+    api["answer"], api["calls"] = {}, []
+    Sync()
+    assert api["calls"] == [("F1", "20230930")]
+    assert len(FundPortSync.ReadFundPort(ProjIds=["F1"])) == 3
@@ -0,0 +1,53 @@
+from collections import deque
+import time
+
+import pytest
+
+import function.AllFunction as AllFunction
+
+URL = "http://127.0.0.1/FundFactsheet/fund/M0001_2565/policy"
+
+@pytest.fixture
+def hedge(monkeypatch):
+    Sent = []
+    Delay = {1 : 0.0, 2 : 0.0}
+
+    def SendRequest(Method, url, Attempt=1, Endpoint=None, **Args):
+        Sent.append(Attempt)
+        time.sleep(Delay[Attempt])
+        return "attempt {}".format(Attempt)
+
+    monkeypatch.setattr(AllFunction, "SendRequest", SendRequest)
+    monkeypatch.setattr(AllFunction, "HEDGE_REQUEST", True)
+    monkeypatch.setattr(AllFunction, "HEDGE_BUDGET", 1.0)
+    monkeypatch.setattr(AllFunction, "HedgeTokens", [0.0])
+    monkeypatch.setattr(AllFunction, "HedgeStats", {"request" : 0, "hedged" : 0, "won" : 0})
+    monkeypatch.setattr(AllFunction, "EndpointLatency", {AllFunction.EndpointOf(URL) : deque([0.02] * AllFunction.HEDGE_MIN_SAMPLE)})
+    return Sent, Delay
+
+def test_no_hedge_without_enough_latency_sample(hedge, monkeypatch):
+    Sent, _ = hedge
+    monkeypatch.setattr(AllFunction, "EndpointLatency", {})
+    assert AllFunction.HedgedGet(URL) == "attempt 1"
+    assert Sent == [1] and AllFunction.HedgeStats["request"] == 0
+
+def test_fast_primary_is_not_hedged(hedge):
+    Sent, _ = hedge
+    assert AllFunction.HedgedGet(URL) == "attempt 1"
+    assert Sent == [1]
+
+def test_slow_primary_is_hedged_and_first_response_win(hedge):
+    Sent, Delay = hedge
+    Delay[1] = 0.5
+    assert AllFunction.HedgedGet(URL) == "attempt 2"
+    assert Sent == [1, 2]
+    assert AllFunction.HedgeStats == {"request" : 1, "hedged" : 1, "won" : 1}
+
+def test_hedge_is_limited_by_budget(hedge, monkeypatch):
+    Sent, Delay = hedge
+    monkeypatch.setattr(AllFunction, "HEDGE_BUDGET", 0.5)
+    Delay[1] = 0.1
+    for _ in range(4):
+        AllFunction.HedgedGet(URL)
+    assert AllFunction.HedgeStats["hedged"] == 2
+    assert Sent.count(2) == 2
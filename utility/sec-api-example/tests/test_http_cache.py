@@ -0,0 +1,41 @@
+import os
+
+import function.AllFunction as AllFunction
+from function.Settings import Setting
+
+def Url(Path):
+    return Setting.ApiUrl("/FundFactsheet") + Path
+
+def Get(Path, **Args):
+    return AllFunction.RateLimiter.CallGetAPI(self=None, headers={}, url=Url(Path), **Args)
+
+def Status(Server, Name):
+    return Server.Api.Stats["endpoint"].get(Name, {})
+
+def test_fresh_response_is_used_within_ttl(mock_server):
+    First = Get("/fund/amc", TTL=3600)
+    assert First and os.path.isfile(AllFunction.HttpCachePath(Url("/fund/amc")))
+    assert Get("/fund/amc", TTL=3600) == First
+    assert Status(mock_server, "fund_factsheet_amc") == {"200" : 1}
+
+def test_stale_response_is_revalidated_with_etag(mock_server):
+    Before = dict(AllFunction.CacheStats)
+    First = Get("/fund/amc", TTL=0)
+    assert AllFunction.ReadHttpCache(Url("/fund/amc"))["etag"]
+    assert Get("/fund/amc", TTL=0) == First
+    assert Status(mock_server, "fund_factsheet_amc") == {"200" : 1, "304" : 1}
+    assert AllFunction.CacheStats["not_modified"] - Before["not_modified"] == 1
+    assert AllFunction.CacheStats["saved_bytes"] > Before["saved_bytes"]
+
+def test_changed_response_is_downloaded_again(mock_server):
+    Get("/fund/amc", TTL=0)
+    Cached = AllFunction.ReadHttpCache(Url("/fund/amc"))
+    AllFunction.WriteHttpCache(Url("/fund/amc"), dict(Cached, etag='"old"', body=[]))
+    assert Get("/fund/amc", TTL=0) == Cached["body"]
+    assert Status(mock_server, "fund_factsheet_amc") == {"200" : 2}
+
+def test_immutable_response_is_never_fetched_again(mock_server):
+    Path = "/fund/M0001_2565/FundFullPort/202403"
+    Get(Path, TTL=0, Immutable=True)
+    Get(Path, TTL=0, Immutable=True)
+    assert sum(Status(mock_server, "fund_factsheet_FundFullPort").values()) == 1
@@ -0,0 +1,52 @@
+import pytest
+
+import function.InvestorAlertSync as InvestorAlertSync
+import function.LicenseCheck as LicenseCheck
+
+@pytest.fixture
+def api(monkeypatch):
+    Api = {"alerts" : [{"case_id" : "IA1", "subject_name" : "A"}, {"case_id" : "IA2", "subject_name" : "B"}],
+           "failed" : set(), "calls" : []}
+
+    def AlertAction(case_id):
+        Api["calls"].append(case_id)
+        return None if case_id in Api["failed"] else [{"case_id" : case_id, "action_seq" : 1}]
+
+    monkeypatch.setattr(LicenseCheck, "licensecheck_lcs_alertdetail", lambda: [dict(Row) for Row in Api["alerts"]])
+    monkeypatch.setattr(LicenseCheck, "licensecheck_lcs_alertaction", AlertAction)
+    return Api
+
+def Summary(Events):
+    return sorted((Change["event"], Change["case_id"]) for Change in Events)
+
+def test_added_modified_removed(api):
+    assert Summary(InvestorAlertSync.SyncInvestorAlert()) == [("added", "IA1"), ("added", "IA2")]
+
+    api["alerts"] = [{"case_id" : "IA1", "subject_name" : "A2"}, {"case_id" : "IA3", "subject_name" : "C"}]
+    api["calls"].clear()
+    Events = InvestorAlertSync.SyncInvestorAlert()
+    assert Summary(Events) == [("added", "IA3"), ("modified", "IA1"), ("removed", "IA2")]
+    assert next(Change for Change in Events if Change["event"] == "modified")["fields"] == ["subject_name"]
+    assert sorted(api["calls"]) == ["IA1", "IA3"]
+
+    # nothing changed : no event, no action call
+    api["calls"].clear()
+    assert InvestorAlertSync.SyncInvestorAlert() == []
+    assert api["calls"] == []
+    assert len(InvestorAlertSync.ReadAlertChanges()) == 5
+
+def test_case_with_failed_action_is_detected_again(api):
+    api["failed"] = {"IA2"}
+    assert Summary(InvestorAlertSync.SyncInvestorAlert()) == [("added", "IA1")]
+    assert sorted(InvestorAlertSync.LoadAlertState()) == ["IA1"]
+
+    api["failed"] = set()
+    Events = InvestorAlertSync.SyncInvestorAlert()
+    assert Summary(Events) == [("added", "IA2")]
+    assert Events[0]["actions"] == [{"case_id" : "IA2", "action_seq" : 1}]
+
+def test_failed_alert_detail_keep_state(api, monkeypatch):
+    InvestorAlertSync.SyncInvestorAlert()
+    monkeypatch.setattr(LicenseCheck, "licensecheck_lcs_alertdetail", lambda: None)
+    assert InvestorAlertSync.SyncInvestorAlert() == []
+    assert sorted(InvestorAlertSync.LoadAlertState()) == ["IA1", "IA2"]
@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+import ImportTime
+import function
+from function.Settings import LazyModule
+
+@pytest.fixture(autouse=True)
+def one_round(monkeypatch):
+    monkeypatch.setattr(ImportTime, "ROUNDS", 1)
+
+@pytest.mark.parametrize("Statement", ImportTime.STATEMENTS)
+def test_import_does_not_load_heavy_module(Statement):
+    _, Heavy = ImportTime.MeasureImport(Statement)
+    assert Heavy == []
+
+def test_heavy_import_is_detected():
+    _, Heavy = ImportTime.MeasureImport("from function.AllFunction import pd; pd.DataFrame")
+    assert "pandas" in Heavy and "requests" not in Heavy
+
+def test_lazy_attribute_of_package():
+    Function = function.fund_factsheet_amc
+    assert Function.__module__ == "function.FundFactsheet"
+    assert function.ref_role_person is sys.modules["function.Common"].ref_role_person
+    assert function.FundPortSync is sys.modules["function.FundPortSync"]
+    assert "Bond" in dir(function)
+    with pytest.raises(AttributeError):
+        function.NoSuchModule
+    with pytest.raises(AttributeError):
+        function.fund_factsheet_no_such_endpoint
+
+def test_lazy_module_load_at_first_use():
+    Module = LazyModule("colorsys")
+    sys.modules.pop("colorsys", None)
+    assert repr(Module) == "<lazy module 'colorsys'>"
+    assert "colorsys" not in sys.modules
+    assert Module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert repr(Module) == "<lazy module 'colorsys' (loaded)>"
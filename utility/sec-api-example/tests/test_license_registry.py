@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import function.LicenseRegistry as LicenseRegistry
+import function.SearchIndex as SearchIndex
+from function.MockServer import MOCK_COMPANY, MOCK_PERSON
+from function.Store import ReadTable
+
+FAILED_COMPANY = "0000000003"
+
+@pytest.fixture(autouse=True)
+def index():
+    SearchIndex.Indexes.clear()
+    yield SearchIndex.Indexes
+    SearchIndex.Indexes.clear()
+
+def LoadState():
+    with open(LicenseRegistry.STATE_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def test_state_move_only_for_fully_synced_company(mock_server, monkeypatch):
+    License = LicenseRegistry.COMPANY_SECTIONS["company_license"]
+    Calls = []
+
+    def FailingLicense(unique_id):
+        Calls.append(unique_id)
+        return None if unique_id == FAILED_COMPANY else License(unique_id)
+
+    monkeypatch.setitem(LicenseRegistry.COMPANY_SECTIONS, "company_license", FailingLicense)
+    LicenseRegistry.SyncLicenseRegistry(MaxWorkers=4)
+    State = LoadState()
+    assert len(State) == MOCK_COMPANY - 1 and FAILED_COMPANY not in State
+    assert FAILED_COMPANY not in set(ReadTable(LicenseRegistry.TABLE_NAME.format("company_license"))["company_id"])
+    # personnel of failed company is not kept either (whole company is synced again)
+    assert len(ReadTable(LicenseRegistry.TABLE_NAME.format("person"))) == (MOCK_COMPANY - 1) * MOCK_PERSON
+
+    # next run sync only the failed company
+    monkeypatch.setitem(LicenseRegistry.COMPANY_SECTIONS, "company_license", lambda unique_id: Calls.append(unique_id) or License(unique_id))
+    Calls.clear()
+    LicenseRegistry.SyncLicenseRegistry(MaxWorkers=4)
+    assert Calls == [FAILED_COMPANY]
+    assert len(LoadState()) == MOCK_COMPANY
+    assert FAILED_COMPANY in set(ReadTable(LicenseRegistry.TABLE_NAME.format("company_license"))["company_id"])
+    assert len(ReadTable(LicenseRegistry.TABLE_NAME.format("person"))) == MOCK_COMPANY * MOCK_PERSON
+
+def test_screen_name_source(mock_server, monkeypatch):
+    LicenseRegistry.SyncLicenseRegistry(MaxWorkers=4)
+    monkeypatch.setattr(LicenseRegistry, "SearchRemote", lambda Name, Kind: [{"unique_id" : "X1", "person_name_en" : Name}] if Name == "REMOTE ONLY" else [])
+
+    Result = LicenseRegistry.ScreenNames(["person 0000000001 1", "REMOTE ONLY", "PERSON 0000000001 1X", "zzzz"], Kind="person", MaxWorkers=2)
+    Source = Result.groupby("query")["source"].first().to_dict()
+    assert Source == {"person 0000000001 1" : "local", "REMOTE ONLY" : "remote", "PERSON 0000000001 1X" : "fuzzy", "zzzz" : "not found"}
+
+def test_company_with_failed_person_is_synced_again(mock_server, monkeypatch):
+    License = LicenseRegistry.PERSON_SECTIONS["person_license"]
+    FailedPerson = FAILED_COMPANY + "02"
+    monkeypatch.setitem(LicenseRegistry.PERSON_SECTIONS, "person_license", lambda unique_id: None if unique_id == FailedPerson else License(unique_id))
+    LicenseRegistry.SyncLicenseRegistry(MaxWorkers=4)
+    State = LoadState()
+    assert len(State) == MOCK_COMPANY - 1 and FAILED_COMPANY not in State
+    assert FailedPerson not in set(ReadTable(LicenseRegistry.TABLE_NAME.format("person_license"))["person_id"])
+
+    monkeypatch.setitem(LicenseRegistry.PERSON_SECTIONS, "person_license", License)
+    LicenseRegistry.SyncLicenseRegistry(MaxWorkers=4)
+    assert len(LoadState()) == MOCK_COMPANY
+    assert FailedPerson in set(ReadTable(LicenseRegistry.TABLE_NAME.format("person_license"))["person_id"])
@@ -0,0 +1,41 @@
+from datetime import datetime
+import json
+import os
+
+import function.AllFunction as AllFunction
+
+def ReadLog():
+    Path = os.path.join(AllFunction.LOG_PATH, "log_{}.jsonl".format(datetime.now().strftime("%Y%m%d")))
+    if not os.path.isfile(Path):
+        return []
+    with open(Path, "r", encoding="utf-8") as file:
+        return [json.loads(Line) for Line in file if Line.strip()]
+
+def test_log_write_json_line_with_field(monkeypatch, capsys):
+    monkeypatch.setattr(AllFunction, "LOG_LEVEL", "info")
+    monkeypatch.setattr(AllFunction, "VERBOSE", "warning")
+    AllFunction.Log("info", "test call", endpoint="fund/{}/policy", status=200, latency_ms=12.5)
+    AllFunction.Log("warning", "test warning")
+    AllFunction.Log("debug", "test debug")
+    AllFunction.FlushLog()
+
+    Records = [Record for Record in ReadLog() if Record["message"].startswith("test ")]
+    assert [(Record["level"], Record["message"]) for Record in Records] == [("info", "test call"), ("warning", "test warning")]
+    assert Records[0]["endpoint"] == "fund/{}/policy" and Records[0]["status"] == 200 and Records[0]["latency_ms"] == 12.5
+    assert capsys.readouterr().out == "test warning\n"
+
+def test_old_error_log_is_not_printed(monkeypatch, capsys):
+    monkeypatch.setattr(AllFunction, "LOG_LEVEL", "info")
+    AllFunction.WriteResponseLog("test error", 500)
+    AllFunction.FlushLog()
+    Record = next(Record for Record in ReadLog() if Record["message"] == "test error")
+    assert Record["level"] == "error" and Record["status"] == 500
+    assert "test error" not in capsys.readouterr().out
+
+def test_many_log_is_written_in_order(monkeypatch):
+    monkeypatch.setattr(AllFunction, "LOG_LEVEL", "info")
+    monkeypatch.setattr(AllFunction, "VERBOSE", "error")
+    for idx in range(2000):
+        AllFunction.Log("info", "test batch", seq=idx)
+    AllFunction.FlushLog()
+    assert [Record["seq"] for Record in ReadLog() if Record["message"] == "test batch"] == list(range(2000))
@@ -0,0 +1,84 @@
+import urllib.request
+
+import pytest
+
+import function.Metrics as Metrics
+
+@pytest.fixture(autouse=True)
+def metrics(monkeypatch):
+    monkeypatch.setattr(Metrics, "Counters", {})
+    monkeypatch.setattr(Metrics, "Histograms", {})
+    monkeypatch.setattr(Metrics, "Collectors", [])
+
+def test_render_counter_histogram_and_gauge():
+    Metrics.Inc("sec_api_requests_total", product="FundFactsheet", endpoint="FundFactsheet/fund/amc", status=200)
+    Metrics.Inc("sec_api_requests_total", 2, product="FundFactsheet", endpoint="FundFactsheet/fund/amc", status=200)
+    Metrics.Observe("sec_api_request_duration_seconds", 0.2, endpoint="FundFactsheet/fund/amc")
+    Metrics.Observe("sec_api_request_duration_seconds", 3.0, endpoint="FundFactsheet/fund/amc")
+    Metrics.RegisterCollector(lambda: [("sec_api_circuit_state", {"product" : "Bond"}, 2)])
+
+    Lines = Metrics.RenderMetrics().splitlines()
+    assert "# TYPE sec_api_requests_total counter" in Lines
+    assert 'sec_api_requests_total{endpoint="FundFactsheet/fund/amc",product="FundFactsheet",status="200"} 3' in Lines
+    assert 'sec_api_request_duration_seconds_bucket{endpoint="FundFactsheet/fund/amc",le="0.1"} 0' in Lines
+    assert 'sec_api_request_duration_seconds_bucket{endpoint="FundFactsheet/fund/amc",le="0.25"} 1' in Lines
+    assert 'sec_api_request_duration_seconds_bucket{endpoint="FundFactsheet/fund/amc",le="5.0"} 2' in Lines
+    assert 'sec_api_request_duration_seconds_bucket{endpoint="FundFactsheet/fund/amc",le="+Inf"} 2' in Lines
+    assert 'sec_api_request_duration_seconds_sum{endpoint="FundFactsheet/fund/amc"} 3.2' in Lines
+    assert 'sec_api_circuit_state{product="Bond"} 2' in Lines
+    # metric without sample has no header
+    assert "# TYPE sec_api_in_flight gauge" not in Lines
+
+def test_label_value_is_escaped():
+    Metrics.Inc("sec_api_retries_total", reason='say "hi"\n')
+    assert 'sec_api_retries_total{reason="say \\"hi\\"\\n"} 1' in Metrics.RenderMetrics()
+
+def test_summary_by_endpoint():
+    for Status in (200, 200, 304, 503):
+        Metrics.Inc("sec_api_requests_total", endpoint="Bond/outstanding/issue", status=Status)
+    Metrics.Inc("sec_api_response_bytes_total", 1500, endpoint="Bond/outstanding/issue")
+    for Latency in [0.04] * 19 + [0.4]:
+        Metrics.Observe("sec_api_request_duration_seconds", Latency, endpoint="Bond/outstanding/issue")
+    Row = Metrics.MetricsSummary()["endpoint"]["Bond/outstanding/issue"]
+    assert (Row["call"], Row["error"], Row["bytes"]) == (4, 1, 1500)
+    assert Row["p95_le_ms"] == 50.0
+    assert Row["mean_ms"] == pytest.approx(58.0)
+
+def test_write_and_serve_metrics():
+    Metrics.Inc("sec_api_cache_total", result="fresh")
+    assert Metrics.WriteMetrics("metrics/sec.prom") == "metrics/sec.prom"
+    with open("metrics/sec.prom", "r", encoding="utf-8") as file:
+        assert 'sec_api_cache_total{result="fresh"} 1' in file.read()
+
+    Server = Metrics.StartMetricsServer(0)
+    try:
+        Body = urllib.request.urlopen("http://127.0.0.1:{}/metrics".format(Server.server_address[1])).read().decode("utf-8")
+    finally:
+        Server.shutdown()
+        Server.server_close()
+    assert 'sec_api_cache_total{result="fresh"} 1' in Body
+
+def test_api_call_is_counted(mock_server):
+    from function.AllFunction import RateLimiter
+    from function.Settings import Setting
+    RateLimiter.CallGetAPI(self=None, headers={}, url=Setting.ApiUrl("/FundFactsheet") + "/fund/amc", TTL=0)
+    Text = Metrics.RenderMetrics()
+    assert 'sec_api_requests_total{endpoint="FundFactsheet/fund/amc",method="GET",product="FundFactsheet",status="200"} 1' in Text
+    assert 'sec_api_request_duration_seconds_count{endpoint="FundFactsheet/fund/amc",product="FundFactsheet"} 1' in Text
+
+def test_wrapper_call_is_labelled_by_endpoint_template(mock_server, monkeypatch):
+    import function.AllFunction as AllFunction
+    from function.FundFactsheet import fund_factsheet_FundTop5, fund_factsheet_5YearLost, fund_factsheet_fund
+    monkeypatch.setattr(AllFunction, "EndpointLatency", {})
+    fund_factsheet_FundTop5("M0001_2565", "20231231")
+    fund_factsheet_FundTop5("M0002_2565", "20240331")
+    fund_factsheet_5YearLost("ABCDEF")
+    fund_factsheet_fund("C0000000001")
+
+    Text = Metrics.RenderMetrics()
+    assert 'sec_api_request_duration_seconds_count{endpoint="FundFactsheet/fund/{proj_id}/FundTop5/{period}",product="FundFactsheet"} 2' in Text
+    assert 'endpoint="FundFactsheet/fund/{proj_id}/5YearLost"' in Text
+    assert 'endpoint="FundFactsheet/fund/amc/{FundParam}"' in Text
+    assert "FundFactsheet/fund/{}" not in Text
+    # latency of hedge is kept per template (204 of fund without data is not a latency sample)
+    assert list(AllFunction.EndpointLatency) == ["FundFactsheet/fund/amc/{FundParam}"]
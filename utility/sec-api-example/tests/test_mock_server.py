@@ -0,0 +1,92 @@
+import urllib.request
+import json
+
+import pytest
+
+from function.MockServer import MockApi, StartMockServer, KEY_HEADER, ERROR_STATUS
+
+POLICY = "/FundFactsheet/fund/M0001_2565/policy"
+COUPON = "/bond/outstanding/TH0001/coupon"
+
+## Mock without recorded / seeded payload and without latency
+def Mock(**Faults):
+    return MockApi(dict({"latency_ms" : 0, "jitter_ms" : 0, "slow_rate" : 0, "auth" : False}, **Faults), Recorded={},
+                   Seed={"funds" : {}, "symbols" : {}, "amcs" : []})
+
+def Statuses(Api, Count=40, Path=COUPON):
+    return [Api.Handle("GET", Path, {})[0] for _ in range(Count)]
+
+def test_fault_is_deterministic_by_seed():
+    First = Statuses(Mock(error_rate=0.3, seed=7))
+    assert First == Statuses(Mock(error_rate=0.3, seed=7))
+    assert First != Statuses(Mock(error_rate=0.3, seed=8))
+    assert set(First) - {200} <= set(ERROR_STATUS) and 200 in First and len(set(First)) > 1
+
+def test_configure_reset_fault_sequence():
+    Api = Mock(error_rate=0.3, seed=7)
+    First = Statuses(Api)
+    Api.Configure(seed=7)
+    assert Statuses(Api) == First
+    Api.Configure(error_rate=1.0)
+    assert set(Statuses(Api, 10)) <= set(ERROR_STATUS)
+
+def test_rate_limit_of_subscription_key():
+    Api = Mock(rate_limit=3, rate_period=60)
+    assert Statuses(Api, 3) == [200] * 3
+    Status, Header, _ = Api.Handle("GET", COUPON, {})
+    assert Status == 429 and 1 <= int(Header["Retry-After"]) <= 60
+
+def test_status_of_call():
+    Api = Mock(auth=True)
+    assert Api.Handle("GET", COUPON, {})[0] == 401
+    assert Api.Handle("GET", COUPON, {KEY_HEADER : "key"})[0] == 200
+    assert Api.Handle("GET", "/FundFactsheet/no/such/path", {KEY_HEADER : "key"})[0] == 404
+    # SecurityCode is required, no data without it
+    assert Api.Handle("POST", "/bond/outstanding/issue", {KEY_HEADER : "key"}, b"{}")[0] == 204
+    assert Api.Stats["endpoint"]["bond_outs_coupon"] == {"401" : 1, "200" : 1}
+
+def test_etag_and_not_modified():
+    Api = Mock()
+    Status, Header, Content = Api.Handle("GET", COUPON, {})
+    assert Status == 200 and Header["ETag"]
+    assert Api.Handle("GET", COUPON, {"If-None-Match" : Header["ETag"]})[:2] == (304, {"ETag" : Header["ETag"]})
+    assert Api.Handle("GET", COUPON, {"If-None-Match" : '"old"'})[2] == Content
+
+def test_generated_payload_is_stable():
+    Coupon = json.loads(Mock(seed=1).Handle("GET", COUPON, {})[2])
+    assert Coupon == json.loads(Mock(seed=1).Handle("GET", COUPON, {})[2])
+    assert Coupon[0]["issued_ref_id"] == "TH0001"
+    assert Coupon != json.loads(Mock(seed=2).Handle("GET", COUPON, {})[2])
+
+def test_control_endpoint():
+    Api = Mock()
+    Statuses(Api, 3)
+    Stats = json.loads(Api.Handle("GET", "/__mock/stats", {})[2])
+    assert Stats["request"] == 3 and Stats["status"] == {"200" : 3}
+    assert json.loads(Api.Handle("POST", "/__mock/config", {}, b'{"error_rate" : 1.0}')[2])["error_rate"] == 1.0
+    assert Api.Handle("GET", COUPON, {})[0] in ERROR_STATUS
+    Api.Handle("POST", "/__mock/reset", {})
+    assert Api.Stats == {"request" : 0, "status" : {}, "endpoint" : {}}
+    assert Api.Handle("GET", "/__mock/unknown", {})[0] == 404
+
+def test_server_use_fund_seed_of_rmf_path(tmp_path):
+    Folder = tmp_path / "rmf"
+    Folder.mkdir()
+    for Symbol, Amc in (("ABC-RMF", "AMC ONE"), ("XYZ-RMF", "AMC TWO")):
+        Fund = {"fund_id" : "M{}_2565".format(Symbol[:3]), "symbol" : Symbol, "fund_name" : "Fund {}".format(Symbol), "amc" : Amc,
+                "metadata" : {"fund_classification" : "Equity", "management_style" : "Active"}}
+        (Folder / "{}.json".format(Symbol)).write_text(json.dumps(Fund), encoding="utf-8")
+    (Folder / "broken.json").write_text("{", encoding="utf-8")
+
+    Server = StartMockServer(0, RmfPath=str(Folder), auth=False, latency_ms=0, jitter_ms=0, error_rate=0, slow_rate=0)
+    Url = "http://127.0.0.1:{}/FundFactsheet".format(Server.server_address[1])
+    Get = lambda Path: json.loads(urllib.request.urlopen(Url + Path).read())
+    try:
+        assert [Amc["name_en"] for Amc in Get("/fund/amc")] == ["AMC ONE", "AMC TWO"]
+        assert Get("/fund/MABC_2565/policy")["policy_desc"] == "Equity"
+        Request = urllib.request.Request(Url + "/fund", data=json.dumps({"name" : "xyz"}).encode("utf-8"), method="POST")
+        assert [Fund["proj_abbr_name"] for Fund in json.loads(urllib.request.urlopen(Request).read())] == ["XYZ-RMF"]
+    finally:
+        Server.shutdown()
+        Server.server_close()
+    assert len(Server.Api.Seed["funds"]) == 2
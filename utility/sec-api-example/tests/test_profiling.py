@@ -0,0 +1,64 @@
+import os
+import time
+
+import pytest
+
+import function.Profiling as Profiling
+
+@pytest.fixture(autouse=True)
+def profile(monkeypatch):
+    monkeypatch.setattr(Profiling, "PROFILE_PATH", "profile")
+    monkeypatch.setattr(Profiling, "PROFILE_INTERVAL", 0.001)
+    monkeypatch.setattr(Profiling, "ProfileState", dict(Profiling.ProfileState, running=False))
+    monkeypatch.setattr(Profiling, "Samples", {})
+    monkeypatch.setattr(Profiling, "Stages", [Profiling.ROOT_STAGE])
+    monkeypatch.setattr(Profiling, "StageReport", [])
+    yield
+    Profiling.StopProfile()
+
+def BusyLoop(Second):
+    End = time.time() + Second
+    Block = []
+    while time.time() < End:
+        Block.append(bytearray(1024))
+    return len(Block)
+
+def ReadFile(Folder, Name):
+    with open(os.path.join(Folder, Name), "r", encoding="utf-8") as file:
+        return file.read()
+
+def test_stage_do_nothing_when_not_profiling():
+    with Profiling.Stage("fund enumeration") as Item:
+        pass
+    assert not hasattr(Item, "Before") and Profiling.StageReport == []
+    assert Profiling.StopProfile() is None
+
+def test_sample_profile_of_stage():
+    Folder = Profiling.StartProfile("sample")
+    assert Profiling.StartProfile("sample") == Folder
+    with Profiling.Stage("fund enumeration"):
+        with Profiling.Stage("policy"):
+            BusyLoop(0.1)
+    assert Profiling.StopProfile() == Folder
+    assert not Profiling.ProfileState["running"] and Profiling.Samples == {}
+
+    Stacks = ReadFile(Folder, "stacks.collapsed").splitlines()
+    assert any(Line.startswith("[run];[fund enumeration];[policy];MainThread;") and "BusyLoop (test_profiling.py:" in Line for Line in Stacks)
+    assert all(int(Line.rsplit(" ", 1)[1]) > 0 for Line in Stacks)
+    Allocation = ReadFile(Folder, "allocations.txt")
+    assert "== run/fund enumeration/policy : " in Allocation and "== run/fund enumeration : " in Allocation
+    assert "== run : " in Allocation
+    assert Allocation.index("== run/fund enumeration/policy") < Allocation.index("== run : ")
+
+def test_cprofile_profile():
+    Folder = Profiling.StartProfile("cprofile")
+    BusyLoop(0.02)
+    Profiling.StopProfile()
+    assert os.path.isfile(os.path.join(Folder, "profile.pstats"))
+    assert "BusyLoop" in ReadFile(Folder, "profile.txt")
+    assert not os.path.exists(os.path.join(Folder, "stacks.collapsed"))
+
+def test_thread_group_of_worker():
+    assert Profiling.ThreadGroup("ThreadPoolExecutor-3_12") == "ThreadPoolExecutor"
+    assert Profiling.ThreadGroup("profile-sampler") == "profile-sampler"
+    assert Profiling.FormatSize(2048) == "2.0 KiB"
@@ -0,0 +1,72 @@
+import function.PVDCrawler as PVDCrawler
+import function.PVDFactSheet as PVDFactSheet
+from function.FundSchema import FUND_TABLE, HOLDING_TABLE
+from function.MockServer import MOCK_PVD_AMC, MOCK_PVD_FUND
+from function.Store import ReadTable
+
+AMC = [{"unique_id" : "C0000000001", "name_en" : "AMC 1"}, {"unique_id" : "C0000000002", "name_en" : "AMC 2"}, "bad row", {"name_en" : "no id"}]
+FUNDS = {
+    "C0000000001" : [{"fund_id" : "PV001", "proj_name_en" : "Fund 1", "unique_id" : "C0000000001"}, "bad record",
+                     {"fund_id" : "", "proj_name_en" : "No Id Fund"}, {"proj_name_en" : "Missing Id Fund"}],
+    "C0000000002" : {"fund_id" : "PV002", "proj_name_en" : "Fund 2"},
+}
+
+def test_malformed_row_is_skipped(monkeypatch):
+    monkeypatch.setattr(PVDFactSheet, "pvd_factsheet_amc", lambda: AMC)
+    monkeypatch.setattr(PVDFactSheet, "pvd_factsheet_fund", lambda unique_id: FUNDS[unique_id])
+
+    Fund = PVDCrawler.CrawlPVDFund(MaxWorkers=2)
+    assert sorted(zip(Fund["proj_id"], Fund["amc_id"])) == [("PV001", "C0000000001"), ("PV002", "C0000000002")]
+    assert set(Fund["fund_type"]) == {"PVD"}
+    assert sorted(ReadTable(FUND_TABLE)["proj_id"]) == ["PV001", "PV002"]
+
+def test_crawl_pvd_from_mock(mock_server):
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-06-30", MaxWorkers=4)
+    Funds = MOCK_PVD_AMC * MOCK_PVD_FUND
+    assert len(ReadTable(FUND_TABLE)) == Funds
+    assert ReadTable(PVDCrawler.TABLE_NAME.format("policy"))["proj_id"].nunique() == Funds
+
+    Holding = ReadTable(HOLDING_TABLE)
+    assert Holding.groupby(["proj_id", "period"]).ngroups == Funds * 2
+    assert (Holding.groupby(["proj_id", "period"])["holding_ratio"].sum().round(0) == 100).all()
+
+    # published period is not fetched again
+    Calls = sum(mock_server.Api.Stats["endpoint"]["pvd_factsheet_pvdFullPort"].values())
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-06-30", MaxWorkers=4)
+    assert sum(mock_server.Api.Stats["endpoint"]["pvd_factsheet_pvdFullPort"].values()) == Calls
+
+def test_failed_section_keep_stored_rows(mock_server, monkeypatch):
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-03-31", MaxWorkers=4)
+    Sorted = lambda df: df.sort_values(list(df.columns)).reset_index(drop=True)
+    Fee = Sorted(ReadTable(PVDCrawler.TABLE_NAME.format("fee")))
+    Policy = ReadTable(PVDCrawler.TABLE_NAME.format("policy"))
+    Failed = sorted(Policy["proj_id"])[0]
+
+    # every fee call failed (open circuit), policy of one fund failed and other fund has new policy
+    monkeypatch.setitem(PVDCrawler.SECTIONS, "fee", lambda proj_id: None)
+    monkeypatch.setitem(PVDCrawler.SECTIONS, "policy", lambda proj_id: None if proj_id == Failed else [{"policy_code" : "NEW"}])
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-03-31", MaxWorkers=4)
+    assert Sorted(ReadTable(PVDCrawler.TABLE_NAME.format("fee"))).equals(Fee)
+    Policy = ReadTable(PVDCrawler.TABLE_NAME.format("policy")).set_index("proj_id")["policy_code"]
+    assert Policy[Failed] == "MIX"
+    assert (Policy.drop(Failed) == "NEW").all() and len(Policy) == MOCK_PVD_AMC * MOCK_PVD_FUND
+
+def test_period_without_portfolio_is_not_fetched_again(mock_server, monkeypatch):
+    Called = []
+    Funds = {}
+    def FullPort(proj_id, period):
+        Called.append((proj_id, period))
+        Funds.setdefault(proj_id, len(Funds))
+        # first fund : no portfolio (204), second fund : failed call, other fund : portfolio
+        return [] if Funds[proj_id] == 0 else None if Funds[proj_id] == 1 else [{"secur_name" : "A", "percent_nav" : 100.0}]
+    monkeypatch.setattr(PVDFactSheet, "pvd_factsheet_pvdFullPort", FullPort)
+
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-06-30", MaxWorkers=1)
+    assert len(Called) == MOCK_PVD_AMC * MOCK_PVD_FUND * 2
+    First = {proj_id for proj_id, Index in Funds.items() if Index == 0}
+    Failed = {proj_id for proj_id, Index in Funds.items() if Index == 1}
+
+    Called.clear()
+    PVDCrawler.CrawlPVD(PortStart="2024-01-01", PortEnd="2024-06-30", MaxWorkers=1)
+    assert {proj_id for proj_id, _ in Called} == Failed and len(Called) == 2
+    assert not First & set(ReadTable(HOLDING_TABLE)["proj_id"])
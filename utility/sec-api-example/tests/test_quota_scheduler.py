@@ -0,0 +1,63 @@
+from collections import Counter
+import threading
+
+import pytest
+
+import function.AllFunction as AllFunction
+from function.AllFunction import QuotaScheduler, Priority, PriorityState, RunConcurrent
+
+## Every class wait together (Thread per class), order of granted class
+def Contend(Scheduler, Grants, Threads=4):
+    Order = []
+    Lock = threading.Lock()
+
+    def Worker(Class):
+        while True:
+            with Lock:
+                if len(Order) >= Grants:
+                    return
+            Scheduler.Acquire(Class)
+            with Lock:
+                Order.append(Class)
+
+    Workers = [threading.Thread(target=Worker, args=(Class,)) for Class in AllFunction.PRIORITY_WEIGHT for _ in range(Threads)]
+    for Thread in Workers:
+        Thread.start()
+    for Thread in Workers:
+        Thread.join()
+    return Order
+
+def test_weighted_fair_share_between_class(monkeypatch):
+    monkeypatch.setattr(AllFunction, "PRIORITY_RESERVE", {})
+    Scheduler = QuotaScheduler(1000, 1)
+    Scheduler.Tokens = 0.0
+    Count = Counter(Contend(Scheduler, 360)[:240])
+    Total = sum(AllFunction.PRIORITY_WEIGHT.values())
+    for Class, Weight in AllFunction.PRIORITY_WEIGHT.items():
+        assert Count[Class] == pytest.approx(240 * Weight / Total, abs=6)
+
+def test_reserve_of_interactive(monkeypatch):
+    monkeypatch.setattr(AllFunction, "PRIORITY_RESERVE", {"interactive" : 0.1})
+    Scheduler = QuotaScheduler(100, 100000)
+    Scheduler.Tokens = 10.5
+    Granted = threading.Event()
+    Thread = threading.Thread(target=lambda: Scheduler.Acquire("backfill") or Granted.set(), daemon=True)
+    Thread.start()
+    assert not Granted.wait(0.1)
+
+    Scheduler.Acquire("interactive")
+    assert Scheduler.Granted == {"interactive" : 1, "refresh" : 0, "backfill" : 0}
+    with Scheduler.Condition:
+        Scheduler.Tokens = 20.0
+        Scheduler.Condition.notify_all()
+    assert Granted.wait(1)
+
+def test_priority_class_of_concurrent_call():
+    with pytest.raises(ValueError):
+        Priority("urgent")
+    Class = lambda _: getattr(PriorityState, "Class", None)
+    assert RunConcurrent(Class, [1, 2]) == ["refresh", "refresh"]
+    assert RunConcurrent(Class, [1], PriorityClass="backfill") == ["backfill"]
+    with Priority("interactive"):
+        assert RunConcurrent(Class, [1]) == ["interactive"]
+    assert getattr(PriorityState, "Class", None) is None
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+import function.Reference as Reference
+
+ASSET_TYPE = [{"asset_type_code" : "EQ", "asset_type_desc_th" : "หุ้น"}, {"asset_type_code" : "BD", "asset_type_desc_th" : "ตราสารหนี้"}]
+CURRENCY = [{"currency_code" : "THB", "currency_name" : "Baht"}]
+
+@pytest.fixture
+def ref(monkeypatch):
+    Calls = []
+    Answer = {"fund_portfolio_asset_type" : ASSET_TYPE, "product_currency_code" : CURRENCY}
+
+    def Fetch(Name):
+        def Function():
+            Calls.append(Name)
+            return Answer[Name]
+        return Function
+
+    monkeypatch.setattr(Reference, "Tables", {})
+    monkeypatch.setattr(Reference, "Lookups", {})
+    monkeypatch.setattr(Reference, "RefFunctions", lambda: {Name : Fetch(Name) for Name in Answer})
+    return Calls, Answer
+
+def test_decode_code_column(ref):
+    Reference.PreloadReference()
+    df = pd.DataFrame({"asset_type" : ["BD", "EQ", "XX"]})
+    Reference.decode(df, "asset_type", "ref_fund_portfolio_asset_type")
+    assert list(df["asset_type_desc"][:2]) == ["ตราสารหนี้", "หุ้น"]
+    assert pd.isna(df["asset_type_desc"][2])
+    assert Reference.RefDict("product_currency_code") == {"THB" : "Baht"}
+
+def test_preload_use_file_within_ttl(ref):
+    Calls, _ = ref
+    Reference.PreloadReference()
+    Reference.PreloadReference()
+    assert sorted(Calls) == ["fund_portfolio_asset_type", "product_currency_code"]
+
+    Reference.PreloadReference(Refresh=True)
+    assert len(Calls) == 4
+
+def test_failed_refresh_keep_old_table(ref):
+    _, Answer = ref
+    Reference.PreloadReference()
+    Answer["product_currency_code"] = None
+    Tables = Reference.PreloadReference(Refresh=True)
+    assert Tables["product_currency_code"] == CURRENCY
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+import function.SearchIndex as SearchIndex
+
+FUNDS = [
+    {"proj_id" : "M0001_2565", "proj_name_th" : "กองทุนเปิด ทดสอบ หุ้นไทย", "proj_name_en" : "Test Thai Equity Fund", "proj_abbr_name" : "TTE-RMF"},
+    {"proj_id" : "M0002_2565", "proj_name_th" : "กองทุนเปิด ทดสอบ ตราสารหนี้", "proj_name_en" : "Test Fixed Income Fund", "proj_abbr_name" : "TFI-RMF"},
+]
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(SearchIndex, "Indexes", {})
+    monkeypatch.setattr(SearchIndex, "SaveTimers", {})
+    Index = SearchIndex.NameIndex("fund")
+    Index.AddMany(FUNDS)
+    SearchIndex.Indexes["fund"] = Index
+    return Index
+
+def test_exact_and_prefix_match(index):
+    assert [Row["proj_id"] for Row in index.Lookup("test thai equity fund")] == ["M0001_2565"]
+    assert [Row["proj_id"] for Row in index.Lookup("TFI")] == ["M0002_2565"]
+    assert [Row["proj_id"] for Row in index.Lookup("test")] == ["M0001_2565", "M0002_2565"]
+
+def test_fuzzy_match_is_not_used_by_search_local(index):
+    assert index.Lookup("Test Thai Equty Fund", Fuzzy=False) == []
+    assert SearchIndex.SearchLocal("fund", "Test Thai Equty Fund") is None
+    assert [Row["proj_id"] for Row in SearchIndex.SearchLocal("fund", "Test Thai Equty Fund", Fuzzy=True)] == ["M0001_2565"]
+
+def test_remote_result_is_saved_once_after_delay(index):
+    SearchIndex.RememberRemote("fund", [{"proj_id" : "M0003_2565", "proj_name_en" : "Remote Fund"}])
+    SearchIndex.RememberRemote("fund", {"proj_id" : "M0004_2565", "proj_name_en" : "Other Remote Fund"})
+
+    # one pending write for both search, nothing written yet
+    assert list(SearchIndex.SaveTimers) == ["fund"]
+    assert not os.path.isfile(SearchIndex.INDEX_PATH.format("fund"))
+    assert SearchIndex.SearchLocal("fund", "remote fund")[0]["proj_id"] == "M0003_2565"
+
+    SearchIndex.FlushIndex()
+    with open(SearchIndex.INDEX_PATH.format("fund"), "r", encoding="utf-8") as file:
+        Saved = {Row["proj_id"] for Row in json.load(file)["records"]}
+    assert Saved == {"M0001_2565", "M0002_2565", "M0003_2565", "M0004_2565"}
+    assert SearchIndex.SaveTimers == {}
+
+def test_index_is_loaded_from_file(index):
+    index.Complete = True
+    index.Save()
+    Loaded = SearchIndex.NameIndex("fund").Load()
+    assert sorted(Loaded.Records) == ["M0001_2565", "M0002_2565"] and Loaded.Complete
+
+    # index file of older version
+    with open(SearchIndex.INDEX_PATH.format("fund"), "w", encoding="utf-8") as file:
+        json.dump(FUNDS, file)
+    Loaded = SearchIndex.NameIndex("fund").Load()
+    assert len(Loaded.Records) == 2 and not Loaded.Complete
+
+def test_prefix_match_only_from_complete_index(index):
+    assert SearchIndex.SearchLocal("fund", "test") is None
+    assert [Row["proj_id"] for Row in SearchIndex.SearchLocal("fund", "tfi rmf")] == ["M0002_2565"]
+    index.Complete = True
+    assert [Row["proj_id"] for Row in SearchIndex.SearchLocal("fund", "test")] == ["M0001_2565", "M0002_2565"]
+
+def test_remote_search_is_not_hidden_by_earlier_result(monkeypatch, mock_server):
+    monkeypatch.setattr(SearchIndex, "Indexes", {})
+    monkeypatch.setattr(SearchIndex, "SaveTimers", {})
+    from function.Bond import bond_outs_issuer
+    bond_outs_issuer("PTT GLOBAL")
+    Issue = bond_outs_issuer("PTT")
+    assert mock_server.Api.Stats["endpoint"]["bond_outs_issuer"] == {"200" : 2}
+    assert {Row["issuer_name_en"] for Row in Issue} == {"PTT"}
+    bond_outs_issuer("ptt global")
+    assert mock_server.Api.Stats["endpoint"]["bond_outs_issuer"] == {"200" : 2}
+    SearchIndex.FlushIndex()
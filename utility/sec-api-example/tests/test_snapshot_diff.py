@@ -0,0 +1,63 @@
+import copy
+import json
+import os
+
+import function.SnapshotDiff as SnapshotDiff
+
+FUNDS = [
+    {"symbol" : "AAA-RMF", "fund_id" : "M0001_2565", "fund_name" : "AAA", "fees" : [{"fee_type" : "management", "fee_value" : 1.0}],
+     "latest_nav" : {"nav_date" : "2025-01-01", "last_val" : 10.0}, "data_fetched_at" : "2025-01-01T00:00:00"},
+    {"symbol" : "BBB-RMF", "fund_id" : "M0002_2565", "fund_name" : "BBB", "latest_nav" : {"nav_date" : "2025-01-01", "last_val" : 20.0},
+     "data_fetched_at" : "2025-01-01T00:00:00"},
+]
+
+def WriteSnapshot(Folder, Funds):
+    os.makedirs(Folder, exist_ok=True)
+    for Name in os.listdir(Folder):
+        os.remove(os.path.join(Folder, Name))
+    for Fund in Funds:
+        with open(os.path.join(Folder, "{}.json".format(Fund["symbol"])), "w", encoding="utf-8") as file:
+            json.dump(Fund, file)
+    return Folder
+
+def test_sync_event_of_added_modified_removed():
+    Folder = WriteSnapshot("rmf", FUNDS)
+    First = SnapshotDiff.SyncSnapshot(Folder)
+    assert sorted((Change["event"], Change["key"]) for Change in First) == [("added", "AAA-RMF"), ("added", "BBB-RMF")]
+
+    # fetch time only : no event
+    Funds = copy.deepcopy(FUNDS)
+    for Fund in Funds:
+        Fund["data_fetched_at"] = "2025-01-02T00:00:00"
+    WriteSnapshot(Folder, Funds)
+    assert SnapshotDiff.SyncSnapshot(Folder) == []
+
+    Funds[0]["latest_nav"]["last_val"] = 11.0
+    Funds[0]["latest_nav"]["nav_date"] = "2025-01-02"
+    Funds[0]["fees"][0]["fee_value"] = 0.8
+    WriteSnapshot(Folder, Funds[:1] + [dict(Funds[1], symbol="CCC-RMF", fund_id="M0003_2565")])
+    Events = {Change["key"] : Change for Change in SnapshotDiff.SyncSnapshot(Folder)}
+    assert {Key : Change["event"] for Key, Change in Events.items()} == {"AAA-RMF" : "modified", "CCC-RMF" : "added", "BBB-RMF" : "removed"}
+    assert Events["AAA-RMF"]["sections"] == ["fee", "nav"]
+    assert Events["AAA-RMF"]["fields"] == ["fees", "latest_nav.last_val", "latest_nav.nav_date"]
+    assert Events["AAA-RMF"]["values"]["latest_nav.last_val"] == 11.0
+    assert Events["BBB-RMF"]["proj_id"] == "M0002_2565"
+    assert len(SnapshotDiff.ReadSnapshotChanges()) == 5
+
+def test_apply_changes_rebuild_new_snapshot():
+    Old = {Fund["symbol"] : copy.deepcopy(Fund) for Fund in FUNDS}
+    New = copy.deepcopy(Old)
+    New["AAA-RMF"]["latest_nav"] = {"nav_date" : "2025-01-02"}
+    New["AAA-RMF"]["category"] = "Equity"
+    del New["BBB-RMF"]
+    New["CCC-RMF"] = {"symbol" : "CCC-RMF", "fund_id" : "M0003_2565"}
+
+    Events = SnapshotDiff.DiffSnapshot(SnapshotDiff.IndexSnapshot(Old), SnapshotDiff.IndexSnapshot(New), New)
+    Applied = SnapshotDiff.ApplyChanges(copy.deepcopy(Old), Events)
+    assert SnapshotDiff.IndexSnapshot(Applied) == SnapshotDiff.IndexSnapshot(New)
+
+def test_default_snapshot_path_does_not_depend_on_working_folder():
+    # test run in its own working folder
+    assert os.path.isabs(SnapshotDiff.RMF_FUNDS_PATH)
+    assert os.path.samefile(SnapshotDiff.RMF_FUNDS_PATH, os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "rmf-funds"))
+    assert len(SnapshotDiff.LoadSnapshot()) > 0
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+import function.Tracing as Tracing
+import function.AllFunction as AllFunction
+from function.Settings import Setting
+
+@pytest.fixture
+def trace(monkeypatch):
+    monkeypatch.setattr(Tracing, "TRACE", True)
+    monkeypatch.setattr(Tracing, "TRACE_FILE", "trace/traces.jsonl")
+    monkeypatch.setattr(Tracing, "Finished", [])
+
+def Attribute(Item, Key):
+    Values = {Value["key"] : list(Value["value"].values())[0] for Value in Item["attributes"]}
+    return Values.get(Key)
+
+def test_span_do_nothing_when_trace_is_off(monkeypatch):
+    monkeypatch.setattr(Tracing, "TRACE", False)
+    with Tracing.Span("stage") as Item:
+        assert Tracing.CurrentSpan() is None
+    assert not hasattr(Item, "SpanId")
+
+def test_nested_span_is_exported_with_root(trace):
+    @Tracing.Traced()
+    def Stage():
+        with Tracing.Span("call", Kind="client", status=200, ok=True, ratio=0.5):
+            time.sleep(0.01)
+
+    with Tracing.Span("job", task=2):
+        Stage()
+        with pytest.raises(ValueError):
+            with Tracing.Span("broken"):
+                raise ValueError("bad row")
+
+    Spans = {Item["name"] : Item for Item in Tracing.ReadTrace()}
+    assert set(Spans) == {"job", "Stage", "call", "broken"}
+    assert len({Item["traceId"] for Item in Spans.values()}) == 1
+    assert "parentSpanId" not in Spans["job"]
+    assert Spans["Stage"]["parentSpanId"] == Spans["job"]["spanId"]
+    assert Spans["call"]["parentSpanId"] == Spans["Stage"]["spanId"]
+    assert Spans["call"]["kind"] == 3
+    assert Spans["call"]["attributes"] == [{"key" : "status", "value" : {"intValue" : "200"}},
+                                           {"key" : "ok", "value" : {"boolValue" : True}},
+                                           {"key" : "ratio", "value" : {"doubleValue" : 0.5}}]
+    assert Spans["broken"]["status"] == {"code" : 2, "message" : "ValueError: bad row"}
+    assert Tracing.Finished == []
+
+def test_critical_path_follow_child_that_end_last(trace):
+    with Tracing.Span("job"):
+        with Tracing.Span("fast"):
+            pass
+        with Tracing.Span("slow"):
+            with Tracing.Span("inner"):
+                time.sleep(0.01)
+    assert [Item["name"] for Item in Tracing.CriticalPath()] == ["job", "slow", "inner"]
+
+def test_worker_span_is_child_of_caller(trace, mock_server):
+    Url = Setting.ApiUrl("/FundFactsheet") + "/fund/{}/policy"
+    with Tracing.Span("job"):
+        AllFunction.RunConcurrent(lambda proj_id: AllFunction.RateLimiter.CallGetAPI(self=None, headers={}, url=Url.format(proj_id), TTL=0),
+                                  ["M0001_2565", "M0002_2565"])
+
+    Spans = Tracing.ReadTrace()
+    Parent = {Item["spanId"] : Item["name"] for Item in Spans}
+    Calls = [Item for Item in Spans if Item["kind"] == 3]
+    assert len(Calls) == 2
+    assert {Parent[Item["parentSpanId"]] for Item in Calls} == {"RunConcurrent <lambda>"}
+    # project that is not in the mock seed has no data
+    assert {Attribute(Item, "http.response.status_code") for Item in Calls} == {"204"}
+    assert {Attribute(Item, "sec.endpoint") for Item in Calls} == {"FundFactsheet/fund/{}/policy"}